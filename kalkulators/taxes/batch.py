@@ -0,0 +1,279 @@
+from typing import List
+
+import numpy as np
+
+from kalkulators.taxes.brackets import CompiledBrackets, compile_brackets
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.metrics import METRICS
+
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized equivalent of Python's round(value, 2).
+
+    np.round rounds the already rounded value * 100, so values lying
+    within one ulp of a half-cent may round differently than the builtin.
+    The rounding error of the multiplication is recovered exactly
+    with Dekker's product, which decides those cases and exact ties
+    are rounded half to even, as the builtin does.
+
+    Args:
+        values (np.ndarray): Amounts to round.
+
+    Returns:
+        (np.ndarray): Amounts rounded to cents.
+
+    """
+    scaled = values * 100
+    split = values * 134217729.0
+    high = split - (split - values)
+    error = (high * 100 - scaled) + (values - high) * 100
+
+    floor = np.floor(scaled)
+    distance = (scaled - floor - 0.5) + error
+    cents = floor + (distance > 0) + ((distance == 0) & (floor % 2 == 1))
+    return cents / 100
+
+
+def get_bracket_arrays(compiled: CompiledBrackets) -> tuple:
+    """
+    Get compiled brackets fields as float64 arrays:
+    bounds, starts, offsets, rates and percents as 0 or 1.
+    Memory-mapped tables give read-only views of the mapped file,
+    other tables are converted from their tuples.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+
+    Returns:
+        (tuple): Field arrays, not to be modified.
+
+    """
+    if compiled.arrays is not None:
+        return compiled.arrays
+    return tuple(
+        np.array(values, dtype=np.float64)
+        for values in (
+            compiled.bounds,
+            compiled.starts,
+            compiled.offsets,
+            compiled.rates,
+            compiled.percents,
+        )
+    )
+
+
+def get_amounts_batch(compiled: CompiledBrackets, salaries: np.ndarray) -> np.ndarray:
+    """
+    Calculate amounts of compiled brackets for an array of salaries.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+        salaries (np.ndarray): Salary values.
+
+    Returns:
+        (np.ndarray): Calculated amounts.
+
+    """
+    timer = METRICS.timer("batch.get_amounts")
+    salaries = np.asarray(salaries, dtype=np.float64)
+    bounds, starts, offsets, rates, percents = get_bracket_arrays(compiled)
+
+    index = np.searchsorted(bounds, salaries, side="left")
+    amounts = rates[index]
+    percent = percents[index] != 0
+
+    if percent.any():
+        index = index[percent]
+        remainder = salaries[percent] - starts[index]
+        amounts[percent] = offsets[index] + round_cents(
+            remainder * 100 * amounts[percent] / 100
+        )
+
+    if timer is not None:
+        METRICS.count("batch.get_amounts.rows", salaries.size)
+        timer.stop()
+    return amounts
+
+
+def get_amounts_by_segments(
+    compiled: CompiledBrackets, salaries: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate amounts of compiled brackets for a grid of salaries.
+    Salaries are split into non-decreasing runs, bracket edges are located
+    once per run and every bracket segment is filled as a whole slice.
+    Results are the same as get_amounts_batch gives,
+    but sorted grids avoid a bracket lookup per salary.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+        salaries (np.ndarray): Salary values, preferably sorted.
+
+    Returns:
+        (np.ndarray): Calculated amounts.
+
+    """
+    timer = METRICS.timer("batch.get_amounts_by_segments")
+    salaries = np.asarray(salaries, dtype=np.float64)
+    bounds = get_bracket_arrays(compiled)[0]
+    amounts = np.empty(salaries.shape)
+
+    runs = np.flatnonzero(np.diff(salaries) < 0) + 1
+    for first, last in zip([0, *runs.tolist()], [*runs.tolist(), salaries.size]):
+        edges = first + np.searchsorted(salaries[first:last], bounds, side="right")
+        edges = [first, *edges.tolist(), last]
+
+        for index, (start, stop) in enumerate(zip(edges[:-1], edges[1:])):
+            if start == stop:
+                continue
+            if compiled.percents[index]:
+                remainder = salaries[start:stop] - compiled.starts[index]
+                amounts[start:stop] = compiled.offsets[index] + round_cents(
+                    remainder * 100 * compiled.rates[index] / 100
+                )
+            else:
+                amounts[start:stop] = compiled.rates[index]
+
+    if timer is not None:
+        METRICS.count("batch.get_amounts_by_segments.rows", salaries.size)
+        METRICS.count("batch.get_amounts_by_segments.runs", len(runs) + 1)
+        timer.stop()
+    return amounts
+
+
+def get_rates_batch(
+    brackets: List[dict], salaries: np.ndarray, rate_type: str
+) -> np.ndarray:
+    """
+    Vectorized version of get_rates for an array of salaries.
+
+    Args:
+        brackets (list[dict]): Data brackets by year with min, max and rate values.
+        salaries (np.ndarray): Salary values.
+        rate_type (str): Rate type: "rate", "older", "social".
+
+    Returns:
+        (np.ndarray): Calculated amounts.
+
+    """
+    return get_amounts_batch(compile_brackets(brackets, rate_type), salaries)
+
+
+def get_gross_year_batch(
+    salaries: np.ndarray,
+    periods: np.ndarray,
+    working_hours: np.ndarray,
+    tax_data: dict,
+) -> np.ndarray:
+    """
+    Convert salaries paid per working period to yearly gross salaries,
+    in the same order of operations as the calculators do.
+
+    Args:
+        salaries (np.ndarray): Salary values.
+        periods (np.ndarray): Working periods: "year", "month", "day", "hour".
+        working_hours (np.ndarray): Weekly working hours.
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (np.ndarray): Yearly gross salaries.
+
+    """
+    factors = {
+        "year": 1,
+        "month": 12,
+        "day": tax_data["workingDays"],
+        "hour": tax_data["workingWeeks"],
+    }
+    factors = np.array([factors[period] for period in WORKING_PERIODS])
+    period_index = get_group_index(periods, WORKING_PERIODS)
+
+    gross_year = salaries * factors[period_index]
+    gross_year = np.where(
+        period_index == WORKING_PERIODS.index("hour"),
+        gross_year * working_hours,
+        gross_year,
+    )
+    return np.maximum(gross_year, 0)
+
+
+def get_group_index(values: np.ndarray, keys) -> np.ndarray:
+    """
+    Map every value to the position of its key,
+    e.g. calculation years to the position in tax data years.
+
+    Args:
+        values (np.ndarray): Column values.
+        keys (Sequence): Known keys.
+
+    Returns:
+        (np.ndarray): Key positions.
+
+    Raises:
+        KeyError: If a value is not a known key, with the value repr.
+
+    """
+    values = np.asarray(values)
+
+    # A single value broadcast to all rows is looked up only once
+    if values.size and not any(values.strides):
+        value = get_scalar(values.flat[0])
+        if value not in keys:
+            raise KeyError(repr(value))
+        return np.full(values.shape, list(keys).index(value))
+
+    index = np.full(values.shape, -1)
+    for position, key in enumerate(keys):
+        index[values == key] = position
+
+    unknown = index < 0
+    if unknown.any():
+        raise KeyError(repr(get_scalar(values[unknown][0])))
+
+    return index
+
+
+def get_scalar(value):
+    """
+    Convert a numpy scalar to the Python one,
+    values of object arrays are returned as they are.
+
+    Args:
+        value: Array item.
+
+    Returns:
+        Python value.
+
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def get_group_slices(group_index: np.ndarray, groups: int):
+    """
+    Sort rows by group once, so every group is a contiguous slice
+    and its tables are calculated on views instead of masked copies.
+
+    Args:
+        group_index (np.ndarray): Group position of every row.
+        groups (int): Number of groups.
+
+    Returns:
+        (tuple): Row order sorting the groups, None if rows are already
+            sorted, and (group, slice) pairs of the groups present.
+
+    """
+    counts = np.bincount(group_index.ravel(), minlength=groups)
+    order = None
+    if group_index.size and np.any(group_index[1:] < group_index[:-1]):
+        # Radix sort of small integers is several times faster
+        order = np.argsort(
+            group_index.astype(np.min_scalar_type(groups)), kind="stable"
+        )
+
+    stops = np.cumsum(counts).tolist()
+    return order, [
+        (group, slice(stop - count, stop))
+        for group, (count, stop) in enumerate(zip(counts.tolist(), stops))
+        if count
+    ]
@@ -0,0 +1,438 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from kalkulators.taxes.brackets import compile_tax_data, get_rate_types
+from kalkulators.taxes.cents import CENTS_CALCULATORS, CENTS_MODES
+from kalkulators.taxes.codegen import get_cy_function, get_nl_function
+from kalkulators.taxes.common import WORKING_PERIODS, get_rates
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_data import RULING_TYPES as CY_RULING_TYPES
+from kalkulators.taxes.nl_calc import RULING_TYPES as NL_RULING_TYPES
+
+BATCH_SIZES = (1000, 100000, 10000000)
+BATCH_CHUNK_SIZE = 1000000
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 0.1
+SALARIES = (15000.0, 45000.0, 80000.0, 150000.0)
+RULINGS = {"nl": tuple(NL_RULING_TYPES), "cy": tuple(CY_RULING_TYPES)}
+
+# Name, setup building the inputs and returning the function to time, rows
+Benchmark = Tuple[str, Callable[[], Callable[[], object]], int]
+
+
+def get_calculator(country: str, salary: float, period: str, year: str, ruling: str):
+    """
+    Create a country calculator with default options.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        salary (Number): Salary per period.
+        period (str): Working period: "year", "month", "day", "hour".
+        year (str): Tax year.
+        ruling (str): Ruling type of the country.
+
+    Returns:
+        Country calculator.
+
+    """
+    tax_data = COUNTRIES[country]["tax_data"]
+    options = dict(
+        year=year,
+        ruling=ruling,
+        salary=salary,
+        period=period,
+        working_hours=tax_data["defaultWorkingHours"],
+        tax_data=tax_data,
+        working_periods=WORKING_PERIODS,
+    )
+    if country == "nl":
+        options.update(old_age=False, social_security=True, holiday_allowance=False)
+    return COUNTRIES[country]["calculator"](**options)
+
+
+def get_specialized_function(country: str, year: str, ruling: str) -> Callable:
+    """
+    Get the code generated calculate function of a country
+    with the default options of get_calculator().
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        year (str): Tax year.
+        ruling (str): Ruling type of the country.
+
+    Returns:
+        (Callable): Function of salary, period and working hours.
+
+    """
+    tax_data = COUNTRIES[country]["tax_data"]
+    if country == "nl":
+        return get_nl_function(tax_data, year, ruling, False, True, False)
+    return get_cy_function(tax_data, year, ruling)
+
+
+def get_period_salaries(country: str, period: str) -> List[float]:
+    """
+    Convert benchmark yearly salaries to a working period.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        period (str): Working period: "year", "month", "day", "hour".
+
+    Returns:
+        (list[float]): Salaries per period.
+
+    """
+    tax_data = COUNTRIES[country]["tax_data"]
+    periods = {
+        "year": 1,
+        "month": 12,
+        "day": tax_data["workingDays"],
+        "hour": tax_data["workingWeeks"] * tax_data["defaultWorkingHours"],
+    }
+    return [salary / periods[period] for salary in SALARIES]
+
+
+def calculate_all(calculators: list) -> None:
+    for calculator in calculators:
+        calculator.calculate()
+
+
+def get_rates_benchmarks() -> Iterator[Benchmark]:
+    """
+    get_rates of every current year table and rate type,
+    split into percent only tables and tables with fixed amounts.
+
+    """
+    for country in COUNTRIES:
+        tax_data = COUNTRIES[country]["tax_data"]
+        year = str(tax_data["currentYear"])
+        for name, value in tax_data.items():
+            brackets = value.get(year) if hasattr(value, "get") else None
+            for rate_type in sorted(get_rate_types(brackets)):
+                fixed = any(
+                    not (-1 < bracket[rate_type] < 1 and bracket[rate_type] != 0)
+                    for bracket in brackets
+                )
+                kind = "fixed" if fixed else "percent"
+
+                def run(brackets=brackets, rate_type=rate_type):
+                    for salary in SALARIES:
+                        get_rates(brackets, salary, rate_type)
+
+                label = f"get_rates.{kind}.{country}.{name}.{rate_type}"
+                yield label, lambda run=run: run, len(SALARIES)
+
+
+def calculate_benchmarks() -> Iterator[Benchmark]:
+    """
+    calculate() and its code generated equivalent of every country,
+    year and ruling type, and calculate() of every working period
+    in the current year.
+
+    """
+    for country in COUNTRIES:
+        tax_data = COUNTRIES[country]["tax_data"]
+        compile_tax_data(tax_data)
+
+        for year in tax_data["years"]:
+            for ruling in RULINGS[country]:
+
+                def setup_calculate(country=country, year=year, ruling=ruling):
+                    calculators = [
+                        get_calculator(country, salary, "year", year, ruling)
+                        for salary in SALARIES
+                    ]
+                    return partial(calculate_all, calculators)
+
+                name = f"{country}.calculate.{year}.{ruling}"
+                yield name, setup_calculate, len(SALARIES)
+
+                def setup_codegen(country=country, year=year, ruling=ruling):
+                    function = get_specialized_function(country, year, ruling)
+                    hours = COUNTRIES[country]["tax_data"]["defaultWorkingHours"]
+
+                    def run():
+                        for salary in SALARIES:
+                            function(salary, "year", hours)
+
+                    return run
+
+                name = f"{country}.codegen.{year}.{ruling}"
+                yield name, setup_codegen, len(SALARIES)
+
+        year = str(tax_data["currentYear"])
+        for period in WORKING_PERIODS:
+
+            def setup_period(country=country, period=period, year=year):
+                calculators = [
+                    get_calculator(country, salary, period, year, RULINGS[country][-1])
+                    for salary in get_period_salaries(country, period)
+                ]
+                return partial(calculate_all, calculators)
+
+            name = f"{country}.calculate.period.{period}"
+            yield name, setup_period, len(SALARIES)
+
+
+def batch_benchmarks(sizes: Tuple[int, ...]) -> Iterator[Benchmark]:
+    """
+    calculate_many() and the integer cents engine in every mode
+    of every country over yearly salaries,
+    calculated in chunks of at most BATCH_CHUNK_SIZE rows.
+    Compat mode calculates tied rows with calculate_many again,
+    so it can be slower than calculate_many itself.
+
+    """
+    for country in COUNTRIES:
+        tax_data = COUNTRIES[country]["tax_data"]
+        options = dict(
+            period="year",
+            working_hours=tax_data["defaultWorkingHours"],
+            ruling=RULINGS[country][-1],
+            year=str(tax_data["currentYear"]),
+            tax_data=tax_data,
+        )
+        if country == "nl":
+            options.update(old_age=False, holiday_allowance=False)
+        engines = {"calculate_many": COUNTRIES[country]["calculator"].calculate_many}
+        for mode in CENTS_MODES:
+            engines[f"calculate_cents.{mode}"] = partial(
+                CENTS_CALCULATORS[country], mode=mode
+            )
+
+        for size in sizes:
+            for engine, calculate in engines.items():
+                # Salaries are only allocated for selected benchmarks
+                def setup(size=size, calculate=calculate, options=options):
+                    # Whole cents, as salaries are paid
+                    rng = np.random.default_rng(size)
+                    salaries = np.round(rng.uniform(0, 200000, size), 2)
+
+                    def run():
+                        for start in range(0, size, BATCH_CHUNK_SIZE):
+                            calculate(
+                                salary=salaries[start : start + BATCH_CHUNK_SIZE],
+                                **options,
+                            )
+
+                    return run
+
+                yield f"{country}.{engine}.{size}", setup, size
+
+
+def measure(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    """
+    Time a function, calling it enough times for every sample
+    to take at least min_time, like timeit does.
+
+    Args:
+        fn (Callable): Function without arguments.
+        repeat (int): Number of samples.
+        min_time (float): Minimum sample duration in seconds.
+
+    Returns:
+        (dict): Best and median time per call in seconds, calls per sample.
+
+    """
+    number, times = 1, []
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            times.append(elapsed / number)
+            break
+        number *= 10 if elapsed * 10 < min_time else 2
+
+    while len(times) < repeat:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+
+    return {
+        "best": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": len(times),
+    }
+
+
+def run_benchmarks(
+    sizes: Tuple[int, ...] = BATCH_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+    select: Optional[str] = None,
+    log: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        sizes (tuple[int]): Numbers of rows of batch benchmarks.
+        repeat (int): Number of samples of every benchmark.
+        min_time (float): Minimum sample duration in seconds.
+        select (str): Run only benchmarks with names containing it.
+        log (Callable): Called with a line per finished benchmark.
+
+    Returns:
+        (dict): Environment description and results by benchmark name.
+
+    """
+    benchmarks = {}
+    suites = (get_rates_benchmarks(), calculate_benchmarks(), batch_benchmarks(sizes))
+    for suite in suites:
+        for name, setup, rows in suite:
+            if select and select not in name:
+                continue
+            result = measure(setup(), repeat, min_time)
+            result["rows"] = rows
+            result["rows_per_second"] = rows / result["best"]
+            benchmarks[name] = result
+            if log is not None:
+                log(f"{name}: {format_time(result['best'])} per call")
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare_benchmarks(
+    baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD
+) -> List[dict]:
+    """
+    Compare best times of two benchmark runs.
+
+    Args:
+        baseline (dict): Saved run results.
+        current (dict): New run results.
+        threshold (float): Relative slowdown considered a regression.
+
+    Returns:
+        (list[dict]): Name, times, ratio and status of every benchmark:
+            "regression", "improvement", "same", "new" or "missing".
+
+    """
+    before, after = baseline["benchmarks"], current["benchmarks"]
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        old = before.get(name, {}).get("best")
+        new = after.get(name, {}).get("best")
+        if old is None or new is None:
+            status, ratio = ("new" if old is None else "missing"), None
+        else:
+            ratio = new / old
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "same"
+        rows.append(
+            {
+                "name": name,
+                "baseline": old,
+                "current": new,
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def read_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks of the tax engines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save results as JSON")
+    run.add_argument("output", help="output JSON file, '-' for stdout")
+    run.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=list(BATCH_SIZES),
+        help="numbers of rows of batch benchmarks",
+    )
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    run.add_argument("--select", help="run only benchmarks with names containing it")
+
+    compare = commands.add_parser(
+        "compare", help="compare results with a baseline, exit 1 on regressions"
+    )
+    compare.add_argument("baseline", help="baseline JSON file")
+    compare.add_argument("current", help="current JSON file")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown considered a regression",
+    )
+    args = parser.parse_args(args)
+
+    if args.command == "run":
+        results = run_benchmarks(
+            tuple(args.sizes),
+            args.repeat,
+            args.min_time,
+            args.select,
+            log=lambda line: print(line, file=sys.stderr),
+        )
+        if args.output == "-":
+            json.dump(results, sys.stdout, indent=2)
+        else:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        return
+
+    rows = compare_benchmarks(
+        read_results(args.baseline), read_results(args.current), args.threshold
+    )
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(
+            f"{row['status']:<12} {ratio:>7} {format_time(row['baseline']):>10} "
+            f"-> {format_time(row['current']):>10}  {row['name']}"
+        )
+    regressions = sum(row["status"] == "regression" for row in rows)
+    print(f"{regressions} regressions, threshold {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
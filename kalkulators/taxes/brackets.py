@@ -0,0 +1,269 @@
+import hashlib
+import marshal
+import math
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from kalkulators.taxes.metrics import METRICS
+
+BRACKET_FIELDS = ("bracket", "min", "max")
+
+
+@dataclass(frozen=True)
+class CompiledBrackets:
+    """
+    Bracket table prepared for repeated lookups.
+    Holds everything get_rates recomputes on every call:
+    bracket bounds, amounts accumulated below each bracket and rate kinds.
+
+    The last entry is a fixed amount used for salaries above the last
+    closed bracket, so every salary maps to exactly one entry.
+
+    Arrays are the same fields as float64 arrays for batch lookups,
+    e.g. read-only views of memory-mapped tables, not compared.
+
+    """
+
+    bounds: Tuple[float, ...]
+    starts: Tuple[float, ...]
+    offsets: Tuple[float, ...]
+    rates: Tuple[float, ...]
+    percents: Tuple[bool, ...]
+    arrays: Optional[tuple] = field(default=None, compare=False, repr=False)
+
+    def get_amount(self, salary: float) -> float:
+        """
+        Calculate amount for a salary, same as get_rates does.
+
+        Args:
+            salary (Number): Salary value.
+
+        Returns:
+            (Number): Calculated amount.
+
+        """
+        index = bisect_left(self.bounds, salary)
+
+        if self.percents[index]:
+            return self.offsets[index] + round(
+                ((salary - self.starts[index]) * 100 * self.rates[index]) / 100, 2
+            )
+
+        return self.rates[index]
+
+
+def compile_brackets(brackets: List[dict], rate_type: str) -> CompiledBrackets:
+    """
+    Compile data brackets for one rate type.
+
+    Args:
+        brackets (list[dict]): Data brackets by year with min, max and rate values.
+        rate_type (str): Rate type: "rate", "older", "social".
+
+    Returns:
+        (CompiledBrackets): Compiled brackets.
+
+    """
+    bounds, starts, offsets, rates, percents = [], [], [], [], []
+    start, amount = 0, 0
+
+    for bracket in brackets:
+        delta = bracket["max"] - bracket["min"] if "max" in bracket else math.inf
+        tax = bracket[rate_type]
+        is_percent_valid = -1 < tax < 1 and tax != 0
+
+        bounds.append(start + delta)
+        starts.append(start)
+        offsets.append(amount)
+        rates.append(tax)
+        percents.append(is_percent_valid)
+
+        amount = amount + (delta * tax) if is_percent_valid else tax
+        start += delta
+
+    # Salaries above the last closed bracket keep the accumulated amount
+    starts.append(start)
+    offsets.append(0)
+    rates.append(amount)
+    percents.append(False)
+
+    return CompiledBrackets(
+        bounds=tuple(bounds),
+        starts=tuple(starts),
+        offsets=tuple(offsets),
+        rates=tuple(rates),
+        percents=tuple(percents),
+    )
+
+
+_interned: Dict[bytes, CompiledBrackets] = {}
+
+
+def get_brackets_digest(compiled: CompiledBrackets) -> bytes:
+    """
+    Hash compiled brackets by content.
+    Integer and float values hash differently,
+    as get_amount() returns amounts of their type.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+
+    Returns:
+        (bytes): Content digest.
+
+    """
+    fields = tuple(
+        tuple(field)
+        for field in (
+            compiled.bounds,
+            compiled.starts,
+            compiled.offsets,
+            compiled.rates,
+            compiled.percents,
+        )
+    )
+    # Version 2 has no references to repeated objects,
+    # so the bytes depend on values only, not on their identity
+    return hashlib.blake2b(marshal.dumps(fields, 2), digest_size=16).digest()
+
+
+def intern_brackets(compiled: CompiledBrackets) -> Tuple[bytes, CompiledBrackets]:
+    """
+    Get the shared instance of compiled brackets with the same content,
+    identical tables of different years and countries are kept once.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+
+    Returns:
+        (tuple): Content digest and shared compiled brackets.
+
+    """
+    digest = get_brackets_digest(compiled)
+    return digest, _interned.setdefault(digest, compiled)
+
+
+def get_rate_types(brackets) -> set:
+    """
+    Get rate types every bracket of a table has.
+
+    Args:
+        brackets: Tax data entry of one year.
+
+    Returns:
+        (set): Rate types, empty if the entry is not a bracket table.
+
+    """
+    if not isinstance(brackets, list) or not brackets:
+        return set()
+    rate_types = set.intersection(*(set(bracket) for bracket in brackets))
+    return rate_types.difference(BRACKET_FIELDS)
+
+
+class CompiledTaxData(dict):
+    """
+    Compiled brackets by (table, year, rate type).
+    Tables are compiled on first access, so tax data loaded lazily
+    is only read for the years and tables in use.
+    Precompiled tables by year, e.g. memory-mapped ones, are used first.
+    Identical tables are interned, so they are the same object.
+
+    """
+
+    def __init__(self, tax_data: dict, tables: Optional[Mapping] = None):
+        super().__init__()
+        self._tax_data = tax_data
+        self._tables = tables
+        self._digests: Dict[Tuple[str, str, str], bytes] = {}
+
+    def __missing__(self, key: Tuple[str, str, str]) -> CompiledBrackets:
+        timer = METRICS.timer("brackets.compile")
+        name, year, rate_type = key
+        compiled = None
+        if self._tables is not None and year in self._tables:
+            compiled = self._tables[year].get((name, rate_type))
+
+        if compiled is None:
+            try:
+                brackets = self._tax_data[name][year]
+            except (KeyError, TypeError):
+                raise KeyError(key) from None
+            if rate_type not in get_rate_types(brackets):
+                raise KeyError(key)
+            compiled = compile_brackets(brackets, rate_type)
+
+        self._digests[key], compiled = intern_brackets(compiled)
+        self[key] = compiled
+        if timer is not None:
+            timer.stop()
+        return compiled
+
+    def compile_all(self) -> None:
+        """
+        Compile every table of every year now instead of on first access,
+        e.g. in a worker process before its first task.
+
+        """
+        for name, value in self._tax_data.items():
+            if not isinstance(value, Mapping):
+                continue
+            for year, brackets in value.items():
+                for rate_type in get_rate_types(brackets):
+                    self[name, year, rate_type]
+
+    def get_digest(self, key: Tuple[str, str, str]) -> bytes:
+        """
+        Get the content digest of a table, equal for identical tables
+        of any year and country, to share cache keys between them.
+
+        Args:
+            key (tuple): Table name, year and rate type.
+
+        Returns:
+            (bytes): Content digest.
+
+        """
+        digest = self._digests.get(key)
+        if digest is None:
+            self[key]
+            digest = self._digests[key]
+        return digest
+
+
+_compiled_cache: Dict[int, Tuple[dict, CompiledTaxData]] = {}
+
+
+def compile_tax_data(
+    tax_data: dict, tables: Optional[Mapping] = None
+) -> CompiledTaxData:
+    """
+    Get compiled bracket tables of base government tax data.
+    Tables are the entries holding a list of brackets per year,
+    e.g. "payrollTax", "socialPercent", "generalCredit", "labourCredit",
+    "elderCredit" or "nhs", and are compiled for each rate type they have.
+
+    The result is cached per tax data object,
+    which is expected not to change after the first call.
+
+    Args:
+        tax_data (dict): Base government tax data.
+        tables (Mapping): Precompiled tables of tax data by year, used on the first
+            call only, mappings of compiled brackets by (table, rate type).
+            Tax data can provide them with a get_tables() method.
+
+    Returns:
+        (CompiledTaxData): Compiled brackets by (table, year, rate type).
+
+    """
+    cached = _compiled_cache.get(id(tax_data))
+    if cached is not None and cached[0] is tax_data:
+        return cached[1]
+
+    if tables is None and hasattr(tax_data, "get_tables"):
+        tables = tax_data.get_tables()
+    compiled = CompiledTaxData(tax_data, tables)
+
+    # Keep a reference to tax data, so its id can't be reused by another object
+    _compiled_cache[id(tax_data)] = (tax_data, compiled)
+    return compiled
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+
+from kalkulators.taxes.singleflight import SingleFlight
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class CalculationCache:
+    """
+    Bounded LRU memoization of calculate() results,
+    for DutchTaxCalculator and CyprusTaxCalculator.
+    Results are shared between callers and must not be modified.
+    Concurrent misses of the same key are calculated once.
+
+    """
+
+    __slots__ = (
+        "_maxsize",
+        "_results",
+        "_lock",
+        "_hits",
+        "_misses",
+        "_evictions",
+        "_flight",
+    )
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+
+        self._maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._flight = SingleFlight()
+
+    def calculate(self, calculator):
+        """
+        Get calculation results from the cache,
+        calculate and store them if missing.
+
+        Args:
+            calculator: Calculator with user input data.
+
+        Returns:
+            Calculation results.
+
+        """
+        key = calculator.get_cache_key()
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+
+        result = self._flight.calculate(calculator)
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """
+        Remove all results, metrics are kept.
+
+        """
+        with self._lock:
+            self._results.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            (dict): Hits, misses, evictions, current and maximum size, hit rate
+                and misses coalesced with an identical calculation in flight.
+
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._results),
+                "maxsize": self._maxsize,
+                "hit_rate": self._hits / requests if requests else 0.0,
+                "coalesced": self._flight.get_stats()["coalesced"],
+            }
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -0,0 +1,439 @@
+import linecache
+import math
+from typing import Callable, Dict, List, Tuple
+
+from kalkulators.taxes.brackets import CompiledBrackets, compile_tax_data
+from kalkulators.taxes.cy_calc import CyprusTaxesResult, get_tables_digests
+from kalkulators.taxes.metrics import METRICS
+from kalkulators.taxes.nl_calc import (
+    RULING_TYPES,
+    DutchTaxCalculator,
+    DutchTaxesResult,
+)
+
+CY_RULING_PARTS = {"20%": 0.2, "50%": 0.5}
+INDENT = " " * 4
+
+_function_cache: Dict[tuple, Tuple[dict, Callable]] = {}
+
+
+def to_literal(value) -> str:
+    """
+    Get source code of a number constant.
+
+    Args:
+        value (Number): Python or NumPy number.
+
+    Returns:
+        (str): Literal evaluating to the same value.
+
+    """
+    if isinstance(value, int):
+        return repr(value)
+    value = float(value)
+    if math.isinf(value):
+        return "-math.inf" if value < 0 else "math.inf"
+    return repr(value)
+
+
+def get_amount_lines(
+    compiled: CompiledBrackets, salary: str, target: str, depth: int = 1
+) -> List[str]:
+    """
+    Generate CompiledBrackets.get_amount() of a salary variable
+    as a chain of bracket bound comparisons with constants inlined.
+
+    Args:
+        compiled (CompiledBrackets): Compiled brackets.
+        salary (str): Salary variable name.
+        target (str): Amount variable name.
+        depth (int): Indentation level.
+
+    Returns:
+        (list[str]): Source code lines.
+
+    """
+    lines = []
+    for index, bound in enumerate(compiled.bounds):
+        if compiled.percents[index]:
+            amount = (
+                f"{to_literal(compiled.offsets[index])} + round("
+                f"(({salary} - {to_literal(compiled.starts[index])}) * 100"
+                f" * {to_literal(compiled.rates[index])}) / 100, 2)"
+            )
+        else:
+            amount = to_literal(compiled.rates[index])
+
+        # Entries past an unbounded bracket are never used
+        if math.isinf(bound):
+            condition = "else:" if index else None
+        else:
+            keyword = "elif" if index else "if"
+            condition = f"{keyword} {salary} <= {to_literal(bound)}:"
+
+        if condition is None:
+            lines.append(f"{INDENT * depth}{target} = {amount}")
+            return lines
+        lines.append(f"{INDENT * depth}{condition}")
+        lines.append(f"{INDENT * (depth + 1)}{target} = {amount}")
+        if condition == "else:":
+            return lines
+
+    lines.append(f"{INDENT * depth}else:")
+    lines.append(f"{INDENT * (depth + 1)}{target} = {to_literal(compiled.rates[-1])}")
+    return lines
+
+
+def get_gross_year_lines(tax_data: dict) -> List[str]:
+    """
+    Generate get_gross_year() of the calculators
+    for salary, period and working_hours arguments.
+
+    Args:
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (list[str]): Source code lines.
+
+    """
+    working_days = to_literal(tax_data["workingDays"])
+    working_weeks = to_literal(tax_data["workingWeeks"])
+    return [
+        '    if period == "year":',
+        "        gross_year = salary",
+        '    elif period == "month":',
+        "        gross_year = salary * 12",
+        '    elif period == "day":',
+        f"        gross_year = salary * {working_days}",
+        '    elif period == "hour":',
+        f"        gross_year = salary * {working_weeks} * working_hours",
+        "    else:",
+        "        gross_year = 0",
+        "    gross_year = max(gross_year, 0)",
+    ]
+
+
+def generate_nl_source(
+    tax_data: dict,
+    year: str,
+    ruling: str,
+    old_age: bool,
+    social_security: bool,
+    holiday_allowance: bool,
+) -> str:
+    """
+    Generate DutchTaxCalculator.calculate() specialized for one combination
+    of options, as a calculate(salary, period, working_hours) function.
+
+    Args:
+        tax_data (dict): Base government tax data.
+        year (str): Calculation year.
+        ruling (str): Ruling type, one of RULING_TYPES.
+        old_age (bool): True if user is older 65 years, False otherwise.
+        social_security (bool): True if social security is applied.
+        holiday_allowance (bool): True if holiday allowance is included.
+
+    Returns:
+        (str): Function source code.
+
+    """
+    tables = compile_tax_data(tax_data)
+    calculator = DutchTaxCalculator.for_tax_data(tax_data)
+    social_credit = calculator.get_social_credit(
+        year=year, age=old_age, social_security=social_security
+    )
+
+    lines = ["def calculate(salary, period, working_hours):"]
+    lines += get_gross_year_lines(tax_data)
+    if holiday_allowance:
+        lines.append(
+            f"    taxable_year = gross_year - math.floor("
+            f"gross_year * {to_literal(0.08 / 1.08)})"
+        )
+    else:
+        lines.append("    taxable_year = gross_year")
+
+    lines.append("    tax_free_year = 0")
+    if ruling != "None":
+        threshold = calculator.get_ruling_income(
+            year=year, ruling=RULING_TYPES[ruling]
+        )
+        lines += [
+            f"    if taxable_year > {to_literal(threshold)}:",
+            "        tax_free_year = taxable_year * 0.3",
+            "        taxable_year -= tax_free_year",
+        ]
+    lines.append("    taxable_year = math.floor(taxable_year)")
+
+    lines += get_amount_lines(
+        tables["payrollTax", year, "rate"], "taxable_year", "amount"
+    )
+    lines.append("    payroll_tax = -1 * amount")
+    if social_security:
+        rate_type = "older" if old_age else "social"
+        lines += get_amount_lines(
+            tables["socialPercent", year, rate_type], "taxable_year", "amount"
+        )
+        lines.append("    social_tax = -1 * amount")
+    else:
+        lines.append("    social_tax = 0")
+
+    lines += get_amount_lines(
+        tables["generalCredit", year, "rate"], "taxable_year", "amount"
+    )
+    lines.append(f"    general_credit = {to_literal(social_credit)} * amount")
+    lines += get_amount_lines(
+        tables["labourCredit", year, "rate"], "taxable_year", "amount"
+    )
+    lines.append(f"    labour_credit = {to_literal(social_credit)} * amount")
+    if old_age:
+        lines += get_amount_lines(
+            tables["elderCredit", year, "rate"], "taxable_year", "amount"
+        )
+        if social_security:
+            lines.append("    elder_credit = amount")
+        else:
+            share = calculator.get_elder_credit_share(year)
+            lines.append(f"    elder_credit = amount * {to_literal(share)}")
+    else:
+        lines.append("    elder_credit = 0")
+
+    working_weeks = to_literal(tax_data["workingWeeks"])
+    lines += [
+        "    income_tax = math.floor(",
+        "        payroll_tax + social_tax + general_credit + labour_credit"
+        " + elder_credit",
+        "    )",
+        "    income_tax = income_tax if income_tax < 0 else 0",
+        "    year_net_income = taxable_year + income_tax + tax_free_year",
+        "    return DutchTaxesResult(",
+        "        year_net_income=year_net_income,",
+        "        taxable_income=taxable_year,",
+        "        month_net_income=math.floor(year_net_income / 12),",
+        "        payroll_tax=payroll_tax,",
+        "        social_security_tax=social_tax,",
+        "        general_tax_credit=general_credit,",
+        "        labour_tax_credit=labour_credit,",
+        "        elder_tax_credit=elder_credit,",
+        "        hour_net_income=math.floor(",
+        f"            year_net_income / ({working_weeks} * working_hours)",
+        "        ),",
+        "    )",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_cy_source(tax_data: dict, year: str, ruling: str) -> str:
+    """
+    Generate CyprusTaxCalculator.calculate() specialized for one combination
+    of options, as a calculate(salary, period, working_hours) function.
+
+    Args:
+        tax_data (dict): Base government tax data.
+        year (str): Calculation year.
+        ruling (str): Ruling type: "0%", "20%", "50%".
+
+    Returns:
+        (str): Function source code.
+
+    """
+    tables = compile_tax_data(tax_data)
+
+    lines = ["def calculate(salary, period, working_hours):"]
+    lines += get_gross_year_lines(tax_data)
+    lines.append("    taxable_year = math.floor(gross_year)")
+    lines += get_amount_lines(
+        tables["socialPercent", year, "rate"], "taxable_year", "amount"
+    )
+    lines.append("    social_tax = -1 * amount")
+    lines += get_amount_lines(tables["nhs", year, "rate"], "taxable_year", "amount")
+    lines += [
+        "    nhs_tax = -1 * amount",
+        "    taxable_year += social_tax + nhs_tax",
+        "    tax_free_year = 0",
+    ]
+    if ruling in CY_RULING_PARTS:
+        lines += [
+            f"    tax_free_year = taxable_year * {CY_RULING_PARTS[ruling]!r}",
+            "    taxable_year -= tax_free_year",
+        ]
+
+    working_weeks = to_literal(tax_data["workingWeeks"])
+    lines += get_amount_lines(
+        tables["payrollTax", year, "rate"], "taxable_year", "amount"
+    )
+    lines += [
+        "    income_tax = math.floor(-1 * amount)",
+        "    income_tax = income_tax if income_tax < 0 else 0",
+        "    year_net_income = taxable_year + income_tax + tax_free_year",
+        "    return CyprusTaxesResult(",
+        "        year_net_income=year_net_income,",
+        "        taxable_income=taxable_year,",
+        "        month_net_income=math.floor(year_net_income / 12),",
+        "        payroll_tax=income_tax,",
+        "        hour_net_income=math.floor(",
+        f"            year_net_income / ({working_weeks} * working_hours)",
+        "        ),",
+        "        social_tax=social_tax,",
+        "        nhs_tax=nhs_tax,",
+        "    )",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def compile_function(source: str, key: tuple) -> Callable:
+    """
+    Compile generated source of a calculate() function.
+    The source is registered in linecache, so tracebacks show it.
+
+    Args:
+        source (str): Function source code.
+        key (tuple): Country and options, used in the file name.
+
+    Returns:
+        (Callable): Compiled function.
+
+    """
+    timer = METRICS.timer("codegen.compile")
+    filename = f"<kalkulators.taxes.codegen {key!r}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    namespace = {
+        "math": math,
+        "DutchTaxesResult": DutchTaxesResult,
+        "CyprusTaxesResult": CyprusTaxesResult,
+    }
+    exec(compile(source, filename, "exec"), namespace)
+    function = namespace["calculate"]
+    function.source = source
+    if timer is not None:
+        timer.stop()
+    return function
+
+
+def get_nl_function(
+    tax_data: dict,
+    year: str,
+    ruling: str,
+    old_age: bool,
+    social_security: bool,
+    holiday_allowance: bool,
+) -> Callable:
+    """
+    Get the specialized calculate(salary, period, working_hours) function
+    of one combination of options, generated on first use.
+
+    Args:
+        tax_data (dict): Base government tax data.
+        year (str): Calculation year.
+        ruling (str): Ruling type, one of RULING_TYPES.
+        old_age (bool): True if user is older 65 years, False otherwise.
+        social_security (bool): True if social security is applied.
+        holiday_allowance (bool): True if holiday allowance is included.
+
+    Returns:
+        (Callable): Function returning DutchTaxesResult.
+
+    """
+    options = (year, ruling, bool(old_age), bool(social_security))
+    key = ("nl", id(tax_data), *options, bool(holiday_allowance))
+    cached = _function_cache.get(key)
+    if cached is not None and cached[0] is tax_data:
+        return cached[1]
+
+    source = generate_nl_source(tax_data, *options, bool(holiday_allowance))
+    function = compile_function(source, ("nl", *key[2:]))
+    # Keep a reference to tax data, so its id can't be reused by another object
+    _function_cache[key] = (tax_data, function)
+    return function
+
+
+def get_cy_function(tax_data: dict, year: str, ruling: str) -> Callable:
+    """
+    Get the specialized calculate(salary, period, working_hours) function
+    of one combination of options, generated on first use.
+    Functions are cached by tables content, so years and tax data objects
+    with identical tables share them.
+
+    Args:
+        tax_data (dict): Base government tax data.
+        year (str): Calculation year.
+        ruling (str): Ruling type: "0%", "20%", "50%".
+
+    Returns:
+        (Callable): Function returning CyprusTaxesResult.
+
+    """
+    key = (
+        "cy",
+        get_tables_digests(compile_tax_data(tax_data), year),
+        tax_data["workingDays"],
+        tax_data["workingWeeks"],
+        ruling,
+    )
+    cached = _function_cache.get(key)
+    if cached is not None:
+        return cached[1]
+
+    source = generate_cy_source(tax_data, year, ruling)
+    function = compile_function(source, ("cy", year, ruling))
+    _function_cache[key] = (tax_data, function)
+    return function
+
+
+def calculate_nl(
+    old_age,
+    year,
+    ruling,
+    salary,
+    period,
+    working_hours,
+    social_security,
+    holiday_allowance,
+    tax_data,
+) -> DutchTaxesResult:
+    """
+    Drop-in replacement of DutchTaxCalculator(...).calculate()
+    for the default working periods, with the specialized function.
+
+    Args:
+        old_age (bool): True if user is older 65 years, False otherwise.
+        year (str): Calculation year.
+        ruling (str): Ruling type, one of RULING_TYPES.
+        salary (Number): Salary per working period.
+        period (str): Working period: "year", "month", "day", "hour".
+        working_hours (Number): Weekly working hours.
+        social_security (bool): True if social security is applied.
+        holiday_allowance (bool): True if holiday allowance is included.
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (DutchTaxesResult): Calculation results.
+
+    """
+    function = get_nl_function(
+        tax_data, year, ruling, old_age, social_security, holiday_allowance
+    )
+    return function(salary, period, working_hours)
+
+
+def calculate_cy(
+    year, ruling, salary, period, working_hours, tax_data
+) -> CyprusTaxesResult:
+    """
+    Drop-in replacement of CyprusTaxCalculator(...).calculate()
+    for the default working periods, with the specialized function.
+
+    Args:
+        year (str): Calculation year.
+        ruling (str): Ruling type: "0%", "20%", "50%".
+        salary (Number): Salary per working period.
+        period (str): Working period: "year", "month", "day", "hour".
+        working_hours (Number): Weekly working hours.
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (CyprusTaxesResult): Calculation results.
+
+    """
+    return get_cy_function(tax_data, year, ruling)(salary, period, working_hours)
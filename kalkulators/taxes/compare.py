@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from kalkulators.taxes.batch import (
+    get_amounts_batch,
+    get_amounts_by_segments,
+    get_gross_year_batch,
+)
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_data import RULING_TYPES as CY_RULING_TYPES
+from kalkulators.taxes.nl_calc import RULING_TYPES as NL_RULING_TYPES
+
+RULINGS = {"nl": tuple(NL_RULING_TYPES), "cy": tuple(CY_RULING_TYPES)}
+# Batch result fields every country has
+COMPARED_FIELDS = (
+    "year_net_income",
+    "month_net_income",
+    "hour_net_income",
+    "taxable_income",
+)
+
+
+@dataclass
+class CountriesComparison:
+    """
+    Tidy comparison table: a row per (country, year, ruling, salary).
+    Columns are arrays of the same length,
+    e.g. pd.DataFrame(vars(comparison)) gives a table ready to plot.
+
+    """
+
+    country: np.ndarray
+    year: np.ndarray
+    ruling: np.ndarray
+    salary: np.ndarray
+    gross_year: np.ndarray
+    year_net_income: np.ndarray
+    month_net_income: np.ndarray
+    hour_net_income: np.ndarray
+    taxable_income: np.ndarray
+    net_ratio: np.ndarray
+
+
+def get_shared_years(countries: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Get tax years every country has data for.
+
+    Args:
+        countries (Iterable[str]): Country codes: "nl", "cy".
+
+    Returns:
+        (tuple[str]): Shared years, sorted.
+
+    """
+    years = [
+        {str(year) for year in COUNTRIES[country]["tax_data"]["years"]}
+        for country in countries
+    ]
+    return tuple(sorted(set.intersection(*years)))
+
+
+def compare_countries(
+    salaries,
+    years: Optional[Iterable[str]] = None,
+    countries: Iterable[str] = ("nl", "cy"),
+    rulings: Optional[Dict[str, Iterable[str]]] = None,
+    period: str = "year",
+    working_hours=None,
+    old_age: bool = False,
+    holiday_allowance: bool = False,
+    social_security: bool = True,
+) -> CountriesComparison:
+    """
+    Calculate net income of the same gross salaries
+    for every (country, year, ruling) configuration.
+    Every configuration is calculated over the whole salary array at once,
+    sorted salary grids are filled segment by segment.
+
+    Args:
+        salaries (np.ndarray): Gross salaries per period.
+        years (Iterable[str]): Tax years, years shared by all countries by default.
+        countries (Iterable[str]): Country codes: "nl", "cy".
+        rulings (dict): Ruling types by country, all of them by default.
+        period (str): Working period of salaries.
+        working_hours (Number): Weekly working hours, default from tax data.
+        old_age (bool): True if user is older 65 years, Netherlands only.
+        holiday_allowance (bool): True if holiday allowance is included,
+            Netherlands only.
+        social_security (bool): True if social security is applied,
+            Netherlands only.
+
+    Returns:
+        (CountriesComparison): Tidy comparison table,
+            ordered by country, year, ruling and then salary.
+
+    """
+    countries = tuple(countries)
+    years = tuple(str(year) for year in years or get_shared_years(countries))
+    rulings = {**RULINGS, **(rulings or {})}
+    salaries = np.atleast_1d(np.asarray(salaries, dtype=np.float64))
+    get_amounts = (
+        get_amounts_by_segments
+        if np.all(np.diff(salaries) >= 0)
+        else get_amounts_batch
+    )
+
+    configs = [
+        (country, year, ruling)
+        for country in countries
+        for year, ruling in product(years, rulings[country])
+    ]
+    size = salaries.size
+    columns = {
+        name: np.empty(len(configs) * size)
+        for name in ("gross_year",) + COMPARED_FIELDS
+    }
+
+    for index, (country, year, ruling) in enumerate(configs):
+        tax_data = COUNTRIES[country]["tax_data"]
+        options = dict(
+            salary=salaries,
+            period=period,
+            working_hours=working_hours or tax_data["defaultWorkingHours"],
+            ruling=ruling,
+            year=year,
+            tax_data=tax_data,
+            get_amounts=get_amounts,
+        )
+        if country == "nl":
+            options.update(
+                old_age=old_age,
+                holiday_allowance=holiday_allowance,
+                social_security=social_security,
+            )
+        result = COUNTRIES[country]["calculator"].calculate_many(**options)
+
+        rows = slice(index * size, (index + 1) * size)
+        columns["gross_year"][rows] = get_gross_year_batch(
+            salaries,
+            np.broadcast_to(np.asarray(period), salaries.shape),
+            options["working_hours"],
+            tax_data,
+        )
+        for field in COMPARED_FIELDS:
+            columns[field][rows] = getattr(result, field)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net_ratio = np.where(
+            columns["gross_year"] > 0,
+            columns["year_net_income"] / columns["gross_year"],
+            np.nan,
+        )
+
+    country, year, ruling = (np.array(values) for values in zip(*configs))
+    return CountriesComparison(
+        country=np.repeat(country, size),
+        year=np.repeat(year, size),
+        ruling=np.repeat(ruling, size),
+        salary=np.tile(salaries, len(configs)),
+        net_ratio=net_ratio,
+        **columns,
+    )
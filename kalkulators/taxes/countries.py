@@ -0,0 +1,16 @@
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator, CyprusTaxesBatchResult
+from kalkulators.taxes.datastore import load_tax_data
+from kalkulators.taxes.nl_calc import DutchTaxCalculator, DutchTaxesBatchResult
+
+COUNTRIES = {
+    "nl": {
+        "calculator": DutchTaxCalculator,
+        "result": DutchTaxesBatchResult,
+        "tax_data": load_tax_data("nl"),
+    },
+    "cy": {
+        "calculator": CyprusTaxCalculator,
+        "result": CyprusTaxesBatchResult,
+        "tax_data": load_tax_data("cy"),
+    },
+}
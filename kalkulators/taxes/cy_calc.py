@@ -1,11 +1,37 @@
 import math
 from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
-from kalkulators.taxes.common import get_rates
+import numpy as np
+
+from kalkulators.taxes.batch import (
+    get_amounts_batch,
+    get_amounts_by_segments,
+    get_group_index,
+    get_gross_year_batch,
+)
+from kalkulators.taxes.brackets import CompiledTaxData, compile_tax_data
+from kalkulators.taxes.inverse import get_period_net, solve_gross
+from kalkulators.taxes.metrics import METRICS
+from kalkulators.taxes.piecewise import PiecewiseLinear
+
+
+# Bracket tables a calculation year uses
+TABLES = ("socialPercent", "nhs", "payrollTax")
 
 
 @dataclass
 class CyprusTaxesResult:
+    __slots__ = (
+        "year_net_income",
+        "taxable_income",
+        "month_net_income",
+        "hour_net_income",
+        "payroll_tax",
+        "social_tax",
+        "nhs_tax",
+    )
+
     year_net_income: float
     taxable_income: float
     month_net_income: float
@@ -15,6 +41,59 @@ class CyprusTaxesResult:
     nhs_tax: float
 
 
+@dataclass
+class CyprusTaxesBatchResult:
+    year_net_income: np.ndarray
+    taxable_income: np.ndarray
+    month_net_income: np.ndarray
+    hour_net_income: np.ndarray
+    payroll_tax: np.ndarray
+    social_tax: np.ndarray
+    nhs_tax: np.ndarray
+
+
+def get_tables_digests(tables: CompiledTaxData, year: str) -> Tuple[bytes, ...]:
+    """
+    Get content digests of the bracket tables of a year.
+
+    Args:
+        tables (CompiledTaxData): Compiled tax data.
+        year (str): Calculation year.
+
+    Returns:
+        (tuple[bytes]): Digests in TABLES order.
+
+    """
+    return tuple(tables.get_digest((name, year, "rate")) for name in TABLES)
+
+
+def get_year_groups(
+    tables: CompiledTaxData, years
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Group years with identical bracket tables,
+    so batch rows of those years are calculated together.
+
+    Args:
+        tables (CompiledTaxData): Compiled tax data.
+        years (Sequence[str]): Calculation years.
+
+    Returns:
+        (tuple): First year of every group and group positions by year position.
+
+    """
+    groups: Dict[tuple, int] = {}
+    group_years = []
+    positions = []
+    for year in years:
+        digests = get_tables_digests(tables, year)
+        if digests not in groups:
+            groups[digests] = len(group_years)
+            group_years.append(year)
+        positions.append(groups[digests])
+    return group_years, np.array(positions)
+
+
 class CyprusTaxCalculator:
     """
     Tax calculator.
@@ -30,6 +109,7 @@ class CyprusTaxCalculator:
         "_ruling",
         "_working_hours",
         "_tax_data",
+        "_tables",
         "_working_periods",
     )
 
@@ -49,6 +129,7 @@ class CyprusTaxCalculator:
         self._ruling = ruling
         self._working_hours = working_hours
         self._tax_data = tax_data
+        self._tables = compile_tax_data(tax_data)
         self._working_periods = working_periods
 
     def get_payroll_tax(self, year: str, salary: float) -> float:
@@ -64,9 +145,7 @@ class CyprusTaxCalculator:
             Payroll tax value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["payrollTax"][year], salary=salary, rate_type="rate"
-        )
+        return self._tables["payrollTax", year, "rate"].get_amount(salary)
 
     def get_social_tax(self, year: str, salary: float) -> float:
         """
@@ -81,11 +160,7 @@ class CyprusTaxCalculator:
             (Number): Social tax value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["socialPercent"][year],
-            salary=salary,
-            rate_type="rate",
-        )
+        return self._tables["socialPercent", year, "rate"].get_amount(salary)
 
     def get_nhs_tax(self, year: str, salary: float) -> float:
         """
@@ -100,18 +175,14 @@ class CyprusTaxCalculator:
             (Number): Social tax value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["nhs"][year],
-            salary=salary,
-            rate_type="rate",
-        )
+        return self._tables["nhs", year, "rate"].get_amount(salary)
 
-    def calculate(self) -> CyprusTaxesResult:
+    def get_gross_year(self) -> float:
         """
-        Main calculation method.
+        Convert salary paid per working period to yearly gross salary.
 
         Returns:
-            (DutchTaxesResult): Calculation results.
+            (Number): Yearly gross salary.
 
         """
         salary_by_period = dict.fromkeys(self._working_periods, 0)
@@ -127,12 +198,57 @@ class CyprusTaxCalculator:
         )
         gross_year = max(gross_year, 0)
 
+        return gross_year
+
+    def get_cache_key(self) -> tuple:
+        """
+        Get a key identifying calculation results.
+        Salary is normalized to yearly gross cents,
+        so the same salary paid per different periods has the same key.
+        Tax tables are identified by content, so years with identical tables
+        share keys.
+
+        Returns:
+            (tuple): Hashable key.
+
+        """
+        return (
+            "cy",
+            get_tables_digests(self._tables, self._year),
+            self._tax_data["workingWeeks"],
+            self._ruling,
+            self._working_hours,
+            round(self.get_gross_year() * 100),
+        )
+
+    def calculate(self) -> CyprusTaxesResult:
+        """
+        Main calculation method.
+
+        Returns:
+            (DutchTaxesResult): Calculation results.
+
+        """
+        timer = METRICS.timer("cy.calculate")
+        if timer is not None:
+            METRICS.count(f"cy.calculate.period.{self._period}")
+
+        gross_year = self.get_gross_year()
+        if timer is not None:
+            timer.lap("period")
+
         tax_free_year = 0
         taxable_year = gross_year
 
         taxable_year = math.floor(taxable_year)
         social_tax = -1 * self.get_social_tax(self._year, salary=taxable_year)
+        if timer is not None:
+            timer.lap("social_tax")
+
         nhs_tax = -1 * self.get_nhs_tax(self._year, salary=taxable_year)
+        if timer is not None:
+            timer.lap("nhs_tax")
+
         taxable_year += social_tax + nhs_tax
 
         if self._ruling != "0%":
@@ -141,11 +257,15 @@ class CyprusTaxCalculator:
             elif self._ruling == "50%":
                 tax_free_year = taxable_year * 0.5
             taxable_year -= tax_free_year
+        if timer is not None:
+            timer.lap("ruling")
 
         income_tax = math.floor(
             -1 * self.get_payroll_tax(year=self._year, salary=taxable_year)
         )
         income_tax = income_tax if income_tax < 0 else 0
+        if timer is not None:
+            timer.lap("payroll_tax")
 
         year_net_income = taxable_year + income_tax + tax_free_year
         month_net_income = math.floor(year_net_income / 12)
@@ -153,7 +273,115 @@ class CyprusTaxCalculator:
             year_net_income / (self._tax_data["workingWeeks"] * self._working_hours)
         )
 
-        return CyprusTaxesResult(
+        result = CyprusTaxesResult(
+            year_net_income=year_net_income,
+            taxable_income=taxable_year,
+            month_net_income=month_net_income,
+            payroll_tax=income_tax,
+            hour_net_income=hour_net_income,
+            social_tax=social_tax,
+            nhs_tax=nhs_tax,
+        )
+        if timer is not None:
+            timer.lap("net_income")
+            timer.stop()
+
+        return result
+
+    @staticmethod
+    def calculate_many(
+        salary,
+        period,
+        working_hours,
+        ruling,
+        year,
+        tax_data,
+        get_amounts=get_amounts_batch,
+    ) -> CyprusTaxesBatchResult:
+        """
+        Batch calculation method.
+        Every argument is either a column array with a value per row
+        or a single value shared by all rows.
+        Results are the same as calculate() gives for every row.
+
+        Args:
+            get_amounts (Callable): Function calculating compiled brackets
+                amounts for an array of salaries.
+
+        Returns:
+            (CyprusTaxesBatchResult): Calculation results by column.
+
+        """
+        timer = METRICS.timer("cy.calculate_many")
+        salary, period, working_hours, ruling, year = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(salary, dtype=np.float64)),
+            period,
+            working_hours,
+            ruling,
+            year,
+        )
+        tables = compile_tax_data(tax_data)
+        years = tax_data["years"]
+        group_years, year_groups = get_year_groups(tables, years)
+        group_index = year_groups[get_group_index(year, years)]
+        if timer is not None:
+            METRICS.count("cy.calculate_many.rows", salary.size)
+            timer.lap("options")
+
+        taxable_year = np.floor(
+            get_gross_year_batch(salary, period, working_hours, tax_data)
+        )
+        if timer is not None:
+            timer.lap("period")
+
+        social_tax = np.zeros(taxable_year.shape)
+        nhs_tax = np.zeros(taxable_year.shape)
+        for group, year_ in enumerate(group_years):
+            rows = group_index == group
+            if not rows.any():
+                continue
+
+            social_tax[rows] = -1 * get_amounts(
+                tables["socialPercent", year_, "rate"], taxable_year[rows]
+            )
+            nhs_tax[rows] = -1 * get_amounts(
+                tables["nhs", year_, "rate"], taxable_year[rows]
+            )
+        taxable_year += social_tax + nhs_tax
+        if timer is not None:
+            timer.lap("social_tax")
+
+        tax_free_year = np.zeros(taxable_year.shape)
+        for ruling_, part in (("20%", 0.2), ("50%", 0.5)):
+            rows = ruling == ruling_
+            tax_free_year[rows] = taxable_year[rows] * part
+        taxable_year -= tax_free_year
+        if timer is not None:
+            timer.lap("ruling")
+
+        payroll_tax = np.zeros(taxable_year.shape)
+        for group, year_ in enumerate(group_years):
+            rows = group_index == group
+            if not rows.any():
+                continue
+
+            payroll_tax[rows] = np.floor(
+                -1
+                * get_amounts(
+                    tables["payrollTax", year_, "rate"], taxable_year[rows]
+                )
+            )
+        income_tax = np.where(payroll_tax < 0, payroll_tax, 0)
+        if timer is not None:
+            timer.lap("payroll_tax")
+
+        year_net_income = taxable_year + income_tax + tax_free_year
+        month_net_income = np.floor(year_net_income / 12)
+        hour_net_income = np.floor(
+            year_net_income / (tax_data["workingWeeks"] * working_hours)
+        )
+
+        result = CyprusTaxesBatchResult(
             year_net_income=year_net_income,
             taxable_income=taxable_year,
             month_net_income=month_net_income,
@@ -162,3 +390,145 @@ class CyprusTaxCalculator:
             social_tax=social_tax,
             nhs_tax=nhs_tax,
         )
+        if timer is not None:
+            timer.lap("net_income")
+            timer.stop()
+
+        return result
+
+    @staticmethod
+    def calculate_sweep(
+        salaries,
+        year,
+        ruling,
+        tax_data,
+        period="year",
+        working_hours=None,
+    ) -> CyprusTaxesBatchResult:
+        """
+        Calculate a grid of salaries with the same options,
+        e.g. every euro from 0 to 500,000 for a year.
+
+        All components are piecewise linear between bracket edges,
+        so the grid is filled segment by segment between those points
+        instead of looking up brackets for every salary.
+        Results are the same as calculate() gives for every salary.
+
+        Args:
+            salaries (np.ndarray): Salary grid, preferably sorted.
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            tax_data (dict): Base government tax data.
+            period (str): Working period of salaries.
+            working_hours (Number): Weekly working hours, default from tax data.
+
+        Returns:
+            (CyprusTaxesBatchResult): Calculation results by salary.
+
+        """
+        timer = METRICS.timer("cy.calculate_sweep")
+        result = CyprusTaxCalculator.calculate_many(
+            salary=salaries,
+            period=period,
+            working_hours=working_hours or tax_data["defaultWorkingHours"],
+            ruling=ruling,
+            year=year,
+            tax_data=tax_data,
+            get_amounts=get_amounts_by_segments,
+        )
+        if timer is not None:
+            timer.stop()
+
+        return result
+
+    @staticmethod
+    def get_gross_kinks(year, ruling, tax_data) -> np.ndarray:
+        """
+        Get yearly gross incomes where net income changes its slope:
+        the social insurance cap and payroll tax bracket edges,
+        mapped from taxable income back to gross income.
+
+        Args:
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            tax_data (dict): Base government tax data.
+
+        Returns:
+            (np.ndarray): Yearly gross incomes.
+
+        """
+        tables = compile_tax_data(tax_data)
+        social = tables["socialPercent", year, "rate"]
+        nhs = tables["nhs", year, "rate"]
+        payroll = tables["payrollTax", year, "rate"]
+
+        cap = social.bounds[0]
+        taxable_part = {"20%": 0.8, "50%": 0.5}.get(ruling, 1)
+        bounds = np.array(payroll.bounds) / taxable_part
+
+        # Social insurance and NHS are deducted before the payroll tax
+        below_cap = bounds / (1 - social.rates[0] - nhs.rates[0])
+        above_cap = (bounds + social.rates[0] * cap) / (1 - nhs.rates[0])
+        return np.concatenate(
+            [[cap], np.where(below_cap <= cap, below_cap, above_cap)]
+        )
+
+    @staticmethod
+    def calculate_gross(net, period, working_hours, ruling, year, tax_data):
+        """
+        Inverse calculation method: find the minimal gross salary per period,
+        rounded to cents, for which calculate() gives at least the target
+        net income per period.
+
+        Args:
+            net (Number | np.ndarray): Target net income per period, or an array.
+
+        Returns:
+            (Number | np.ndarray): Gross salary per period, or an array.
+
+        """
+        working_hours = working_hours or tax_data["defaultWorkingHours"]
+
+        def get_net(gross):
+            result = CyprusTaxCalculator.calculate_many(
+                salary=gross,
+                period=period,
+                working_hours=working_hours,
+                ruling=ruling,
+                year=year,
+                tax_data=tax_data,
+            )
+            return get_period_net(result, period, tax_data)
+
+        period_factor = get_gross_year_batch(
+            np.ones(1), np.array([period]), working_hours, tax_data
+        )[0]
+        kinks = CyprusTaxCalculator.get_gross_kinks(year, ruling, tax_data)
+        gross = solve_gross(get_net, np.atleast_1d(net), kinks / period_factor)
+        return gross if np.ndim(net) else gross[0].item()
+
+    @staticmethod
+    def get_tax_function(year, ruling, tax_data) -> PiecewiseLinear:
+        """
+        Get all taxes as a piecewise linear function
+        of taxable income before deductions, negative values are taxes.
+        The result is not floored, as calculate() does with its payroll tax.
+
+        Args:
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            tax_data (dict): Base government tax data.
+
+        Returns:
+            (PiecewiseLinear): Taxes by taxable income.
+
+        """
+        tables = compile_tax_data(tax_data)
+
+        def function(name):
+            return PiecewiseLinear.from_brackets(tables[name, year, "rate"])
+
+        deductions = -function("socialPercent") - function("nhs")
+        taxable_part = {"20%": 0.8, "50%": 0.5}.get(ruling, 1)
+        taxable = (PiecewiseLinear.linear() + deductions) * taxable_part
+        return deductions - function("payrollTax").compose(taxable)
@@ -33,4 +33,12 @@ CY_DATA = {
         "2022": [{"bracket": 1, "min": 0, "rate": 0.0265}],
         "2023": [{"bracket": 1, "min": 0, "rate": 0.0265}],
     },
+    "selfEmployedSocialPercent": {
+        "2022": [{"bracket": 1, "min": 0, "max": 58080, "rate": 0.166}],
+        "2023": [{"bracket": 1, "min": 0, "max": 58080, "rate": 0.166}],
+    },
+    "selfEmployedNhs": {
+        "2022": [{"bracket": 1, "min": 0, "rate": 0.04}],
+        "2023": [{"bracket": 1, "min": 0, "rate": 0.04}],
+    },
 }
@@ -0,0 +1,462 @@
+import importlib
+import importlib.util
+import marshal
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from typing import Dict, Optional, Tuple, Union
+
+DATA_MODULES = {
+    "nl": ("kalkulators.taxes.nl_data", "NL_DATA"),
+    "cy": ("kalkulators.taxes.cy_data", "CY_DATA"),
+}
+ARTIFACT_VERSION = 3
+CACHE_DIR_VARIABLE = "KALKULATORS_CACHE_DIR"
+HEADER = struct.Struct("<II")
+
+
+def get_source_path(country: str) -> str:
+    """
+    Get path of the Python module holding the country tax data.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (str): Source path.
+
+    """
+    module = DATA_MODULES[country][0].rsplit(".", 1)[-1]
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{module}.py")
+
+
+def get_artifact_path(name: str) -> str:
+    """
+    Get path of a prebuilt tax data artifact.
+    Artifacts are stored next to the bytecode cache by default,
+    as their format depends on the Python version the same way.
+
+    Args:
+        name (str): Artifact name, e.g. "nl_data".
+
+    Returns:
+        (str): Artifact path.
+
+    """
+    directory = os.environ.get(CACHE_DIR_VARIABLE) or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "__pycache__"
+    )
+    return os.path.join(directory, f"{name}.{sys.implementation.cache_tag}.bin")
+
+
+def get_source_hash(country: str) -> bytes:
+    """
+    Hash the tax data source, artifacts built from another source are stale.
+    Uses the hash of hash-based bytecode files, which is cheap to import.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (bytes): Source hash.
+
+    """
+    with open(get_source_path(country), "rb") as source:
+        return importlib.util.source_hash(source.read())
+
+
+def get_source_stat(country: str) -> Tuple[int, int]:
+    """
+    Get modification time and size of the tax data source.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (tuple): Modification time in nanoseconds and size in bytes.
+
+    """
+    stat = os.stat(get_source_path(country))
+    return stat.st_mtime_ns, stat.st_size
+
+
+def is_source_current(country: str, source_stat, source_hash: bytes) -> bool:
+    """
+    Check that an artifact was built from the current tax data source.
+    The source stat is compared first, as timestamp-based bytecode files do,
+    the source is only read and hashed if its stat has changed.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        source_stat (tuple): Source stat stored in the artifact.
+        source_hash (bytes): Source hash stored in the artifact.
+
+    Returns:
+        (bool): True if the artifact is up to date, False otherwise.
+
+    """
+    try:
+        if tuple(source_stat) == get_source_stat(country):
+            return True
+        return source_hash == get_source_hash(country)
+    except OSError:
+        return False
+
+
+def get_changed_stat(country: str, source_stat) -> Optional[Tuple[int, int]]:
+    """
+    Get the current stat of the tax data source, if it differs from the stored
+    one of a current artifact, e.g. the source was touched or checked out
+    again without changes. Such an artifact is refreshed with the new stat,
+    otherwise the source would be hashed on every read.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        source_stat (tuple): Source stat stored in the artifact.
+
+    Returns:
+        (tuple | None): Current source stat, None if unchanged or missing.
+
+    """
+    try:
+        stat = get_source_stat(country)
+    except OSError:
+        return None
+    return None if tuple(source_stat) == stat else stat
+
+
+def build_artifact(country: str) -> bytes:
+    """
+    Build the tax data artifact from the Python source.
+    Scalars and lists are stored whole, mappings by year
+    are stored per year, so they can be loaded separately.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (bytes): Artifact content.
+
+    """
+    module, name = DATA_MODULES[country]
+    tax_data = getattr(importlib.import_module(module), name)
+
+    blobs, index, offset = [], {}, 0
+    for component, value in tax_data.items():
+        entries = (
+            {(component, year): data for year, data in value.items()}
+            if isinstance(value, dict)
+            else {(component,): value}
+        )
+        for key, data in entries.items():
+            blob = marshal.dumps(data)
+            index[key] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+
+    header = {
+        "version": ARTIFACT_VERSION,
+        "source_hash": get_source_hash(country),
+        "source_stat": get_source_stat(country),
+        "components": list(tax_data),
+        "index": index,
+    }
+    return pack_artifact(header, b"".join(blobs))
+
+
+def pack_artifact(header: dict, entries: Union[bytes, memoryview]) -> bytes:
+    """
+    Join the artifact header and entries data.
+
+    Args:
+        header (dict): Artifact header.
+        entries (bytes | memoryview): Entries data.
+
+    Returns:
+        (bytes): Artifact content.
+
+    """
+    header = marshal.dumps(header)
+    return HEADER.pack(ARTIFACT_VERSION, len(header)) + header + bytes(entries)
+
+
+def write_artifact(name: str, content: bytes) -> bool:
+    """
+    Write an artifact atomically, ignoring read-only locations.
+
+    Args:
+        name (str): Artifact name, e.g. "nl_data".
+        content (bytes): Artifact content.
+
+    Returns:
+        (bool): True if the artifact was written, False otherwise.
+
+    """
+    path = get_artifact_path(name)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, "wb") as artifact:
+            artifact.write(content)
+        os.replace(temporary, path)
+    except OSError:
+        return False
+    return True
+
+
+def parse_artifact(content: bytes) -> Tuple[dict, memoryview]:
+    """
+    Split the artifact into its header and entries, entries are not loaded.
+
+    Args:
+        content (bytes): Artifact content.
+
+    Returns:
+        (tuple): Header and entries data.
+
+    """
+    version, length = HEADER.unpack_from(content)
+    if version != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported tax data artifact version: {version}")
+    header = marshal.loads(content[HEADER.size : HEADER.size + length])
+    return header, memoryview(content)[HEADER.size + length :]
+
+
+def read_artifact(country: str) -> Optional[Tuple[dict, memoryview]]:
+    """
+    Read the artifact, if it exists and is up to date.
+    An artifact of a source with a new stat and the same content
+    is rewritten with the new stat.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (tuple | None): Header and entries data, None if missing or stale.
+
+    """
+    try:
+        with open(get_artifact_path(f"{country}_data"), "rb") as artifact:
+            header, blobs = parse_artifact(artifact.read())
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+
+    if not is_source_current(country, header["source_stat"], header["source_hash"]):
+        return None
+
+    source_stat = get_changed_stat(country, header["source_stat"])
+    if source_stat is not None:
+        header["source_stat"] = source_stat
+        write_artifact(f"{country}_data", pack_artifact(header, blobs))
+    return header, blobs
+
+
+class LazyYears(Mapping):
+    """
+    Tax data component by year, each year is loaded on first access.
+
+    """
+
+    __slots__ = ("_data", "_component", "_years", "_loaded")
+
+    def __init__(self, data: "LazyTaxData", component: str, years: list):
+        self._data = data
+        self._component = component
+        self._years = years
+        self._loaded = {}
+
+    def __getitem__(self, year):
+        if year not in self._loaded:
+            if year not in self._years:
+                raise KeyError(year)
+            self._loaded[year] = self._data.load((self._component, year))
+        return self._loaded[year]
+
+    def __iter__(self):
+        return iter(self._years)
+
+    def __len__(self) -> int:
+        return len(self._years)
+
+
+class LazyTaxData(Mapping):
+    """
+    Base government tax data loaded from a prebuilt artifact
+    per component and per year, only when accessed.
+    Can be used anywhere NL_DATA or CY_DATA are.
+
+    """
+
+    __slots__ = ("_country", "_index", "_blobs", "_components", "_loaded")
+
+    def __init__(self, country: str, header: dict, blobs: memoryview):
+        self._country = country
+        self._index = header["index"]
+        self._blobs = blobs
+        self._loaded = {}
+
+        years = {}
+        for key in self._index:
+            if len(key) == 2:
+                years.setdefault(key[0], []).append(key[1])
+        self._components = {
+            component: LazyYears(self, component, years[component])
+            if component in years
+            else None
+            for component in header["components"]
+        }
+
+    def load(self, key: Tuple[str, ...]):
+        """
+        Unmarshal one artifact entry.
+
+        Args:
+            key (tuple): Component name, and year for components by year.
+
+        Returns:
+            Entry value.
+
+        """
+        offset, length = self._index[key]
+        return marshal.loads(self._blobs[offset : offset + length])
+
+    def get_tables(self) -> Mapping:
+        """
+        Get compiled bracket tables of the country from the memory-mapped
+        tables file, used by compile_tax_data instead of compiling brackets.
+
+        Returns:
+            (Mapping): Compiled brackets by year, then by (table, rate type).
+
+        """
+        # Imported here, the tables are only needed once calculations start
+        from kalkulators.taxes.tablestore import load_tables
+
+        return load_tables()[self._country]
+
+    def __getitem__(self, component):
+        value = self._components[component]
+        if value is not None:
+            return value
+        if component not in self._loaded:
+            self._loaded[component] = self.load((component,))
+        return self._loaded[component]
+
+    def __iter__(self):
+        return iter(self._components)
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+
+_loaded_data: Dict[str, LazyTaxData] = {}
+
+
+def load_tax_data(country: str) -> LazyTaxData:
+    """
+    Load country tax data lazily from the prebuilt artifact.
+    A missing or stale artifact is rebuilt from the Python source first.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (LazyTaxData): Tax data, shared by all callers.
+
+    """
+    if country not in _loaded_data:
+        artifact = read_artifact(country)
+        if artifact is None:
+            content = build_artifact(country)
+            write_artifact(f"{country}_data", content)
+            artifact = parse_artifact(content)
+        _loaded_data[country] = LazyTaxData(country, *artifact)
+    return _loaded_data[country]
+
+
+def measure_import_time(statement: str, repeat: int = 5) -> float:
+    """
+    Measure in fresh interpreters how long a statement takes,
+    e.g. importing tax data, the median of several runs is returned.
+
+    Args:
+        statement (str): Python statement.
+        repeat (int): Number of interpreters to run.
+
+    Returns:
+        (float): Time in seconds.
+
+    """
+    import subprocess
+
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = sorted(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                check=True,
+                capture_output=True,
+                text=True,
+                cwd=os.path.dirname(package),
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+    return times[repeat // 2]
+
+
+def main(args=None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prebuilt tax data artifacts.")
+    parser.add_argument("command", choices=("build", "check-import"))
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="optional time budget in seconds to import the loader and read tax data",
+    )
+    args = parser.parse_args(args)
+
+    failed = False
+    for country, (module, name) in DATA_MODULES.items():
+        if args.command == "build":
+            written = write_artifact(f"{country}_data", build_artifact(country))
+            print(f"{country}: {'written' if written else 'not writable'}")
+            continue
+
+        # Rebuild a missing or stale artifact and bytecode of the source first
+        load_tax_data(country)
+        measure_import_time(f"from {module} import {name}", repeat=1)
+
+        elapsed = measure_import_time(
+            "from kalkulators.taxes.datastore import load_tax_data\n"
+            f"load_tax_data({country!r})['currentYear']"
+        )
+        source = measure_import_time(f"from {module} import {name}")
+        # The artifact is only worth it if it beats importing the cached source
+        failed |= elapsed >= source
+        if args.budget is not None:
+            failed |= elapsed > args.budget
+        print(
+            f"{country}: {elapsed * 1000:.2f} ms, Python source {source * 1000:.2f} ms,"
+            f" {elapsed / source:.2f}x"
+        )
+
+    if args.command == "build":
+        from kalkulators.taxes.tablestore import TABLES_ARTIFACT, build_tables
+
+        written = write_artifact(TABLES_ARTIFACT, build_tables())
+        print(f"tables: {'written' if written else 'not writable'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.metrics import METRICS
+from kalkulators.taxes.nl_calc import (
+    DutchCacheKey,
+    DutchTaxCalculator,
+    DutchTaxesResult,
+)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Memoized calculation stage: function of named inputs and other stages.
+
+    """
+
+    name: str
+    dependencies: Tuple[str, ...]
+    function: Callable
+
+
+class CalculationGraph:
+    """
+    Dependency graph of memoized calculation stages.
+    A changed input invalidates stages depending on it,
+    and a recalculated stage invalidates its own dependents
+    only if its value has changed, so an evaluation recomputes
+    the smallest set of stages downstream of the changed inputs.
+
+    """
+
+    __slots__ = (
+        "_stages",
+        "_dependents",
+        "_inputs",
+        "_values",
+        "_dirty",
+        "recomputed",
+    )
+
+    def __init__(self, stages: Iterable[Stage], inputs: Iterable[str]):
+        self._stages: List[Stage] = []
+        self._inputs: Dict[str, object] = dict.fromkeys(inputs)
+        self._dependents: Dict[str, List[str]] = {name: [] for name in self._inputs}
+
+        # Stages are given in dependency order, so evaluation is one pass
+        for stage in stages:
+            if stage.name in self._dependents:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            for dependency in stage.dependencies:
+                if dependency not in self._dependents:
+                    raise ValueError(
+                        f"Stage {stage.name!r} depends on unknown {dependency!r}"
+                    )
+                self._dependents[dependency].append(stage.name)
+            self._dependents[stage.name] = []
+            self._stages.append(stage)
+
+        self._values: Dict[str, object] = {}
+        self._dirty = {stage.name for stage in self._stages}
+        self.recomputed: Tuple[str, ...] = ()
+
+    def update(self, **inputs) -> None:
+        """
+        Set input values, stages depending on changed ones
+        are recomputed on the next evaluation.
+
+        Args:
+            **inputs: Input values by name.
+
+        """
+        for name, value in inputs.items():
+            if name not in self._inputs:
+                raise KeyError(f"Unknown input {name!r}")
+            if self._inputs[name] != value:
+                self._inputs[name] = value
+                self._dirty.update(self._dependents[name])
+
+    def evaluate(self) -> Dict[str, object]:
+        """
+        Recompute invalidated stages, names of recomputed stages
+        are kept in recomputed until the next evaluation.
+
+        Returns:
+            (dict): Values of all stages by name.
+
+        """
+        values = self._values
+        recomputed = []
+        for stage in self._stages:
+            if stage.name not in self._dirty:
+                continue
+
+            arguments = {
+                name: values[name] if name in values else self._inputs[name]
+                for name in stage.dependencies
+            }
+            value = stage.function(**arguments)
+            recomputed.append(stage.name)
+            if stage.name not in values or values[stage.name] != value:
+                values[stage.name] = value
+                self._dirty.update(self._dependents[stage.name])
+
+        self._dirty.clear()
+        self.recomputed = tuple(recomputed)
+        return values
+
+
+class DutchCalculationGraph(CalculationGraph):
+    """
+    DutchTaxCalculator.calculate() split into memoized stages,
+    its calculate_* methods, for interactive reruns with one changed input.
+    E.g. changing working hours of a yearly salary
+    only recomputes the gross salary, unchanged, and the hourly net income.
+
+    Has get_cache_key() and calculate() of the calculator,
+    so it can be passed to CalculationCache instead of one.
+
+    """
+
+    __slots__ = ("_tax_data",)
+
+    def __init__(self, tax_data: dict):
+        self._tax_data = tax_data
+        calculator = DutchTaxCalculator.for_tax_data(tax_data)
+        inputs = {
+            "salary": 0,
+            "period": "year",
+            "working_hours": tax_data["defaultWorkingHours"],
+            "ruling": "None",
+            "year": str(tax_data["currentYear"]),
+            "old_age": False,
+            "social_security": True,
+            "holiday_allowance": False,
+        }
+
+        def get_gross_year(salary, period, working_hours):
+            return self.get_calculator(
+                salary=salary, period=period, working_hours=working_hours
+            ).get_gross_year()
+
+        super().__init__(
+            [
+                Stage(
+                    "gross_year", ("salary", "period", "working_hours"), get_gross_year
+                ),
+                Stage(
+                    "gross_allowance",
+                    ("gross_year", "holiday_allowance"),
+                    calculator.calculate_gross_allowance,
+                ),
+                Stage(
+                    "tax_free_income",
+                    ("gross_year", "gross_allowance", "year", "ruling"),
+                    calculator.calculate_tax_free_income,
+                ),
+                Stage(
+                    "taxable_income",
+                    ("gross_year", "gross_allowance", "tax_free_income"),
+                    calculator.calculate_taxable_income,
+                ),
+                Stage(
+                    "payroll_tax",
+                    ("year", "taxable_income"),
+                    calculator.calculate_payroll_tax,
+                ),
+                Stage(
+                    "social_security_tax",
+                    ("year", "taxable_income", "old_age", "social_security"),
+                    calculator.calculate_social_security_tax,
+                ),
+                Stage(
+                    "social_credit",
+                    ("year", "old_age", "social_security"),
+                    calculator.calculate_social_credit,
+                ),
+                Stage(
+                    "general_tax_credit",
+                    ("year", "taxable_income", "social_credit"),
+                    calculator.calculate_general_tax_credit,
+                ),
+                Stage(
+                    "labour_tax_credit",
+                    ("year", "taxable_income", "social_credit"),
+                    calculator.calculate_labour_tax_credit,
+                ),
+                Stage(
+                    "elder_tax_credit",
+                    ("year", "taxable_income", "old_age", "social_security"),
+                    calculator.calculate_elder_tax_credit,
+                ),
+                Stage(
+                    "year_net_income",
+                    (
+                        "taxable_income",
+                        "tax_free_income",
+                        "payroll_tax",
+                        "social_security_tax",
+                        "general_tax_credit",
+                        "labour_tax_credit",
+                        "elder_tax_credit",
+                    ),
+                    calculator.calculate_year_net_income,
+                ),
+                Stage(
+                    "month_net_income",
+                    ("year_net_income",),
+                    calculator.calculate_month_net_income,
+                ),
+                Stage(
+                    "hour_net_income",
+                    ("year_net_income", "working_hours"),
+                    calculator.calculate_hour_net_income,
+                ),
+            ],
+            inputs,
+        )
+        self._inputs.update(inputs)
+
+    def get_calculator(self, **inputs) -> DutchTaxCalculator:
+        """
+        Create a calculator of the current inputs.
+
+        Args:
+            **inputs: Input values overriding the current ones.
+
+        Returns:
+            (DutchTaxCalculator): Calculator.
+
+        """
+        return DutchTaxCalculator(
+            tax_data=self._tax_data,
+            working_periods=WORKING_PERIODS,
+            **{**self._inputs, **inputs},
+        )
+
+    def get_cache_key(self) -> DutchCacheKey:
+        """
+        Get a key identifying calculation results, the one of the calculator.
+
+        Returns:
+            (DutchCacheKey): Hashable key.
+
+        """
+        return self.get_calculator().get_cache_key()
+
+    def calculate(self) -> DutchTaxesResult:
+        """
+        Recompute stages invalidated by changed inputs.
+
+        Returns:
+            (DutchTaxesResult): Calculation results, equal to calculate()
+                of the calculator.
+
+        """
+        values = self.evaluate()
+        if METRICS.enabled:
+            for name in self.recomputed:
+                METRICS.count(f"nl.graph.{name}")
+
+        return DutchTaxesResult(
+            year_net_income=values["year_net_income"],
+            taxable_income=values["taxable_income"],
+            month_net_income=values["month_net_income"],
+            payroll_tax=values["payroll_tax"],
+            social_security_tax=values["social_security_tax"],
+            general_tax_credit=values["general_tax_credit"],
+            labour_tax_credit=values["labour_tax_credit"],
+            elder_tax_credit=values["elder_tax_credit"],
+            hour_net_income=values["hour_net_income"],
+        )
@@ -0,0 +1,81 @@
+from typing import Callable
+
+import numpy as np
+
+# Net incomes are floored in a few places, so within one segment
+# they differ from a straight line by at most a few units
+NET_ROUNDING_MARGIN = 4
+
+
+def get_period_net(result, period: str, tax_data: dict) -> np.ndarray:
+    """
+    Get net income per working period from batch calculation results.
+
+    Args:
+        result: Batch calculation results.
+        period (str): Working period: "year", "month", "day", "hour".
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (np.ndarray): Net income per period.
+
+    """
+    if period == "day":
+        return np.floor(result.year_net_income / tax_data["workingDays"])
+    return getattr(result, f"{period}_net_income")
+
+
+def solve_gross(
+    get_net: Callable[[np.ndarray], np.ndarray],
+    targets: np.ndarray,
+    kinks: np.ndarray,
+) -> np.ndarray:
+    """
+    Find minimal gross incomes, rounded to cents, giving at least target net incomes.
+
+    Net income is a non-decreasing piecewise linear function of gross income
+    with kinks at known points, up to rounding.
+    It is evaluated once at the kinks to find the segment of every target,
+    the target is interpolated inside the segment and the interpolation
+    is refined by bisection within the rounding margin only.
+    Every step evaluates all targets at once.
+
+    Args:
+        get_net (Callable): Vectorized net income by gross income.
+        targets (np.ndarray): Target net incomes.
+        kinks (np.ndarray): Gross incomes where net income changes its slope.
+
+    Returns:
+        (np.ndarray): Minimal gross incomes.
+
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    kinks = np.unique(np.concatenate([[0.0], np.asarray(kinks, dtype=np.float64)]))
+    kinks = kinks[np.isfinite(kinks) & (kinks >= 0)]
+    values = np.maximum.accumulate(get_net(kinks))
+
+    # The last segment is unbounded, extend it until it covers every target
+    while targets.size and values[-1] < targets.max():
+        kinks = np.append(kinks, kinks[-1] * 2 + 1)
+        values = np.append(values, max(values[-1], get_net(kinks[-1:])[0]))
+
+    index = np.clip(np.searchsorted(values, targets, side="left"), 1, kinks.size - 1)
+    low, high = kinks[index - 1], kinks[index]
+    slope = (values[index] - values[index - 1]) / (high - low)
+    guess = low + (targets - values[index - 1]) / np.where(slope > 0, slope, np.inf)
+    margin = NET_ROUNDING_MARGIN / np.where(slope > 0, slope, np.inf)
+
+    # Narrow the segment around the guess, keeping net(low) < target <= net(high)
+    narrow_low = np.clip(guess - margin, low, high)
+    narrow_high = np.clip(guess + margin, low, high)
+    low = np.where(get_net(narrow_low) < targets, narrow_low, low)
+    high = np.where(get_net(narrow_high) >= targets, narrow_high, high)
+
+    low, high = np.floor(low * 100), np.ceil(high * 100)
+    while (high - low > 1).any():
+        middle = np.floor((low + high) / 2)
+        reached = get_net(middle / 100) >= targets
+        high = np.where(reached, middle, high)
+        low = np.where(reached, low, middle)
+
+    return np.where(targets <= values[0], 0.0, high / 100)
@@ -0,0 +1,168 @@
+import os
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+
+METRICS_VARIABLE = "KALKULATORS_METRICS"
+# Values of the variable keeping metrics disabled, case insensitive
+DISABLED_VALUES = ("", "0", "false")
+PROMETHEUS_PREFIX = "kalkulators"
+
+
+class StageTimer:
+    """
+    Timer of one call split into consecutive stages.
+    Every lap records the time since the previous one under the stage name,
+    stop records the time of the whole call.
+
+    """
+
+    __slots__ = ("_metrics", "_name", "_start", "_last")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._metrics.record(f"{self._name}.{stage}", now - self._last)
+        self._last = now
+
+    def stop(self) -> None:
+        self._metrics.record(self._name, time.perf_counter() - self._start)
+
+
+class Metrics:
+    """
+    Stage timers and call counters of the calculators.
+    Disabled metrics don't create timers, so instrumented code
+    only checks for a missing timer.
+
+    """
+
+    __slots__ = ("enabled", "_lock", "_timers", "_counters")
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = Lock()
+        self._timers: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def timer(self, name: str) -> Optional[StageTimer]:
+        """
+        Start timing a call.
+
+        Args:
+            name (str): Call name, prefix of its stage names.
+
+        Returns:
+            (StageTimer | None): Timer, None if metrics are disabled.
+
+        """
+        return StageTimer(self, name) if self.enabled else None
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record a stage or call duration.
+
+        Args:
+            name (str): Stage name.
+            seconds (float): Duration.
+
+        """
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name (str): Counter name.
+            value (int): Increment.
+
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """
+        Get current metrics.
+
+        Returns:
+            (dict): Timers with call count, total, mean and max seconds,
+                and counters, by name.
+
+        """
+        with self._lock:
+            return {
+                "timers": {
+                    name: {
+                        "count": count,
+                        "total": total,
+                        "mean": total / count,
+                        "max": maximum,
+                    }
+                    for name, (count, total, maximum) in sorted(self._timers.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """
+        Export current metrics in the Prometheus text format.
+
+        Args:
+            prefix (str): Metric names prefix.
+
+        Returns:
+            (str): Metrics text.
+
+        """
+        snapshot = self.snapshot()
+        stage, calls = f"{prefix}_stage_seconds", f"{prefix}_calls_total"
+
+        lines = [
+            f"# HELP {stage} Time spent in calculation stages.",
+            f"# TYPE {stage} summary",
+        ]
+        for name, timer in snapshot["timers"].items():
+            lines.append(f'{stage}_count{{stage="{name}"}} {timer["count"]}')
+            lines.append(f'{stage}_sum{{stage="{name}"}} {timer["total"]!r}')
+
+        lines += [
+            f"# HELP {stage}_max Longest time spent in a stage.",
+            f"# TYPE {stage}_max gauge",
+        ]
+        for name, timer in snapshot["timers"].items():
+            lines.append(f'{stage}_max{{stage="{name}"}} {timer["max"]!r}')
+
+        lines += [f"# HELP {calls} Number of calls.", f"# TYPE {calls} counter"]
+        for name, value in snapshot["counters"].items():
+            lines.append(f'{calls}{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared by the calculators, enabled from the environment or at runtime
+METRICS = Metrics(
+    enabled=os.environ.get(METRICS_VARIABLE, "").strip().lower()
+    not in DISABLED_VALUES
+)
@@ -1,7 +1,20 @@
 import math
 from dataclasses import dataclass
+from typing import NamedTuple
 
-from kalkulators.taxes.common import get_rates
+import numpy as np
+
+from kalkulators.taxes.batch import (
+    get_amounts_batch,
+    get_amounts_by_segments,
+    get_group_index,
+    get_gross_year_batch,
+)
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.inverse import get_period_net, solve_gross
+from kalkulators.taxes.metrics import METRICS
+from kalkulators.taxes.piecewise import PiecewiseLinear
 
 RULING_TYPES = {
     "Normal": "normal",
@@ -11,8 +24,38 @@ RULING_TYPES = {
 }
 
 
+class DutchCacheKey(NamedTuple):
+    """
+    Key identifying calculation results, hashed as a plain tuple.
+
+    """
+
+    country: str
+    tax_data_id: int
+    year: str
+    ruling: str
+    old_age: bool
+    social_security: bool
+    holiday_allowance: bool
+    working_hours: float
+    gross_cents: int
+
+
 @dataclass
 class DutchTaxesResult:
+    # No per-instance __dict__, results are kept in bulk for reporting
+    __slots__ = (
+        "year_net_income",
+        "taxable_income",
+        "month_net_income",
+        "payroll_tax",
+        "social_security_tax",
+        "general_tax_credit",
+        "labour_tax_credit",
+        "elder_tax_credit",
+        "hour_net_income",
+    )
+
     year_net_income: float
     taxable_income: float
     month_net_income: float
@@ -20,9 +63,23 @@ class DutchTaxesResult:
     social_security_tax: float
     general_tax_credit: float
     labour_tax_credit: float
+    elder_tax_credit: float
     hour_net_income: float
 
 
+@dataclass
+class DutchTaxesBatchResult:
+    year_net_income: np.ndarray
+    taxable_income: np.ndarray
+    month_net_income: np.ndarray
+    payroll_tax: np.ndarray
+    social_security_tax: np.ndarray
+    general_tax_credit: np.ndarray
+    labour_tax_credit: np.ndarray
+    elder_tax_credit: np.ndarray
+    hour_net_income: np.ndarray
+
+
 class DutchTaxCalculator:
     """
     Tax calculator.
@@ -41,6 +98,7 @@ class DutchTaxCalculator:
         "_social_security",
         "_holiday_allowance",
         "_tax_data",
+        "_tables",
         "_working_periods",
     )
 
@@ -67,8 +125,35 @@ class DutchTaxCalculator:
         self._social_security = social_security
         self._holiday_allowance = holiday_allowance
         self._tax_data = tax_data
+        self._tables = compile_tax_data(tax_data)
         self._working_periods = working_periods
 
+    @classmethod
+    def for_tax_data(cls, tax_data: dict) -> "DutchTaxCalculator":
+        """
+        Create a calculator with default user input,
+        to use the per year get_* methods of the tax data.
+
+        Args:
+            tax_data (dict): Base government tax data.
+
+        Returns:
+            (DutchTaxCalculator): Calculator.
+
+        """
+        return cls(
+            old_age=False,
+            year=str(tax_data["currentYear"]),
+            ruling="None",
+            salary=0,
+            period="year",
+            working_hours=tax_data["defaultWorkingHours"],
+            social_security=True,
+            holiday_allowance=False,
+            tax_data=tax_data,
+            working_periods=WORKING_PERIODS,
+        )
+
     def get_ruling_income(self, year: str, ruling: str) -> int:
         """
         Get ruling threshold from base government tax data
@@ -97,9 +182,7 @@ class DutchTaxCalculator:
             Payroll tax value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["payrollTax"][year], salary=salary, rate_type="rate"
-        )
+        return self._tables["payrollTax", year, "rate"].get_amount(salary)
 
     def get_social_tax(self, year: str, salary: float, age: bool) -> float:
         """
@@ -115,11 +198,8 @@ class DutchTaxCalculator:
             (Number): Social tax value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["socialPercent"][year],
-            salary=salary,
-            rate_type="older" if age else "social",
-        )
+        rate_type = "older" if age else "social"
+        return self._tables["socialPercent", year, rate_type].get_amount(salary)
 
     def get_general_credit(self, year: str, salary: float) -> float:
         """
@@ -134,11 +214,7 @@ class DutchTaxCalculator:
             (Number): General credit value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["generalCredit"][year],
-            salary=salary,
-            rate_type="rate",
-        )
+        return self._tables["generalCredit", year, "rate"].get_amount(salary)
 
     def get_labour_credit(self, year: str, salary: float) -> float:
         """
@@ -153,11 +229,63 @@ class DutchTaxCalculator:
             (Number): Labour credit value.
 
         """
-        return get_rates(
-            brackets=self._tax_data["labourCredit"][year],
-            salary=salary,
-            rate_type="rate",
-        )
+        return self._tables["labourCredit", year, "rate"].get_amount(salary)
+
+    def get_elder_credit(
+        self, year: str, salary: float, social_security: bool = True
+    ) -> float:
+        """
+        Get elder credit min, max and rate from base government tax data
+        and calculate credit value, for users of the state pension age.
+        Credit amounts include the national insurance part,
+        without social security only the tax part is credited.
+
+        Args:
+            year (str): Calculation year.
+            salary (Number): Salary value.
+            social_security (bool): True if social security is applied, False otherwise.
+
+        Returns:
+            (Number): Elder credit value.
+
+        """
+        amount = self._tables["elderCredit", year, "rate"].get_amount(salary)
+        if social_security:
+            return amount
+        return amount * self.get_elder_credit_share(year)
+
+    def get_elder_credit_share(self, year: str) -> float:
+        """
+        Get the tax part of the elder credit, credited without social security:
+        the tax rate share of the first bracket rate for retirement age
+        (tax + Anw + Wlz, no contribution to AOW).
+
+        Args:
+            year (str): Calculation year.
+
+        Returns:
+            (Number): Elder credit percentage.
+
+        """
+        rate = self._tables["socialPercent", year, "rate"].rates[0]
+        social = self._tables["socialPercent", year, "social"].rates[0]
+        older = self._tables["socialPercent", year, "older"].rates[0]
+        return (rate - social) / (rate + older - social)
+
+    def get_low_wage_threshold(self, year: str) -> int:
+        """
+        Get low wage threshold from base government tax data by year.
+        It limits the low income benefit employers get for their employees,
+        so it does not change net income of employees.
+
+        Args:
+            year (str): Calculation year.
+
+        Returns:
+            (int): Low wage threshold, yearly gross salary.
+
+        """
+        return self._tax_data["lowWageThreshold"][year]
 
     def get_social_credit(self, year: str, age: bool, social_security: bool):
         """
@@ -174,27 +302,27 @@ class DutchTaxCalculator:
 
         """
         percentage = 1
-        bracket = self._tax_data["socialPercent"][year][0]
+        rate = self._tables["socialPercent", year, "rate"].rates[0]
+        social = self._tables["socialPercent", year, "social"].rates[0]
+        older = self._tables["socialPercent", year, "older"].rates[0]
 
         if not social_security:
             # Removing AOW + Anw + Wlz from total
             # Percentage of social contributions (AOW + Anw + Wlz)
-            percentage = (bracket["rate"] - bracket["social"]) / bracket["rate"]
+            percentage = (rate - social) / rate
         elif age:
             # Removing only AOW from total
             # Percentage for retirement age (Anw + Wlz, no contribution to AOW)
-            percentage = (
-                bracket["rate"] + bracket["older"] - bracket["social"]
-            ) / bracket["rate"]
+            percentage = (rate + older - social) / rate
 
         return percentage
 
-    def calculate(self) -> DutchTaxesResult:
+    def get_gross_year(self) -> float:
         """
-        Main calculation method.
+        Convert salary paid per working period to yearly gross salary.
 
         Returns:
-            (DutchTaxesResult): Calculation results.
+            (Number): Yearly gross salary.
 
         """
         salary_by_period = dict.fromkeys(self._working_periods, 0)
@@ -210,57 +338,342 @@ class DutchTaxCalculator:
         )
         gross_year = max(gross_year, 0)
 
-        gross_allowance = (
-            math.floor(gross_year * (0.08 / 1.08)) if self._holiday_allowance else 0
+        return gross_year
+
+    def get_cache_key(self) -> DutchCacheKey:
+        """
+        Get a key identifying calculation results.
+        Salary is normalized to yearly gross cents,
+        so the same salary paid per different periods has the same key.
+
+        Returns:
+            (DutchCacheKey): Hashable key.
+
+        """
+        return DutchCacheKey(
+            "nl",
+            id(self._tax_data),
+            self._year,
+            self._ruling,
+            self._old_age,
+            self._social_security,
+            self._holiday_allowance,
+            self._working_hours,
+            round(self.get_gross_year() * 100),
         )
 
-        tax_free_year = 0
-        taxable_year = gross_year - gross_allowance
+    @staticmethod
+    def calculate_gross_allowance(gross_year: float, holiday_allowance: bool) -> int:
+        """
+        Calculate the holiday allowance included in yearly gross salary.
+
+        Args:
+            gross_year (Number): Yearly gross salary.
+            holiday_allowance (bool): True if holiday allowance is included.
+
+        Returns:
+            (int): Holiday allowance.
+
+        """
+        return math.floor(gross_year * (0.08 / 1.08)) if holiday_allowance else 0
+
+    def calculate_tax_free_income(
+        self, gross_year: float, gross_allowance: int, year: str, ruling: str
+    ) -> float:
+        """
+        Calculate the ruling tax free part of yearly gross salary.
+
+        Args:
+            gross_year (Number): Yearly gross salary.
+            gross_allowance (int): Holiday allowance.
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+
+        Returns:
+            (Number): Tax free income.
 
-        if self._ruling != "None":
+        """
+        taxable_year = gross_year - gross_allowance
+        if ruling != "None":
             ruling_income = self.get_ruling_income(
-                year=self._year, ruling=RULING_TYPES[self._ruling]
+                year=year, ruling=RULING_TYPES[ruling]
             )
 
             if taxable_year > ruling_income:
-                tax_free_year = taxable_year * 0.3
-                taxable_year -= tax_free_year
+                return taxable_year * 0.3
+        return 0
 
-        taxable_year = math.floor(taxable_year)
+    @staticmethod
+    def calculate_taxable_income(
+        gross_year: float, gross_allowance: int, tax_free_income: float
+    ) -> int:
+        """
+        Calculate yearly taxable income.
 
-        payroll_tax = -1 * self.get_payroll_tax(year=self._year, salary=taxable_year)
+        Args:
+            gross_year (Number): Yearly gross salary.
+            gross_allowance (int): Holiday allowance.
+            tax_free_income (Number): Ruling tax free income.
 
-        social_tax = (
-            -1
-            * self.get_social_tax(
-                year=self._year,
-                salary=taxable_year,
-                age=self._old_age,
-            )
-            if self._social_security
-            else 0
-        )
+        Returns:
+            (int): Taxable income.
 
-        social_credit = self.get_social_credit(
-            year=self._year,
-            age=self._old_age,
-            social_security=self._social_security,
-        )
+        """
+        taxable_year = gross_year - gross_allowance
+        taxable_year -= tax_free_income
+        return math.floor(taxable_year)
+
+    def calculate_payroll_tax(self, year: str, taxable_income: int) -> float:
+        """
+        Calculate payroll tax of taxable income, as a negative amount.
+
+        Args:
+            year (str): Calculation year.
+            taxable_income (int): Taxable income.
+
+        Returns:
+            (Number): Payroll tax.
+
+        """
+        return -1 * self.get_payroll_tax(year=year, salary=taxable_income)
 
-        general_credit = social_credit * self.get_general_credit(
-            year=self._year, salary=taxable_year
+    def calculate_social_security_tax(
+        self, year: str, taxable_income: int, old_age: bool, social_security: bool
+    ) -> float:
+        """
+        Calculate social security tax of taxable income, as a negative amount.
+
+        Args:
+            year (str): Calculation year.
+            taxable_income (int): Taxable income.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+
+        Returns:
+            (Number): Social security tax.
+
+        """
+        if not social_security:
+            return 0
+        return -1 * self.get_social_tax(year=year, salary=taxable_income, age=old_age)
+
+    def calculate_social_credit(
+        self, year: str, old_age: bool, social_security: bool
+    ) -> float:
+        """
+        Calculate the social credit percentage of the tax credits.
+
+        Args:
+            year (str): Calculation year.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+
+        Returns:
+            (Number): Social credit percentage.
+
+        """
+        return self.get_social_credit(
+            year=year, age=old_age, social_security=social_security
         )
 
-        labour_credit = social_credit * self.get_labour_credit(
-            year=self._year, salary=taxable_year
+    def calculate_general_tax_credit(
+        self, year: str, taxable_income: int, social_credit: float
+    ) -> float:
+        """
+        Calculate general tax credit of taxable income.
+
+        Args:
+            year (str): Calculation year.
+            taxable_income (int): Taxable income.
+            social_credit (Number): Social credit percentage.
+
+        Returns:
+            (Number): General tax credit.
+
+        """
+        return social_credit * self.get_general_credit(year=year, salary=taxable_income)
+
+    def calculate_labour_tax_credit(
+        self, year: str, taxable_income: int, social_credit: float
+    ) -> float:
+        """
+        Calculate labour tax credit of taxable income.
+
+        Args:
+            year (str): Calculation year.
+            taxable_income (int): Taxable income.
+            social_credit (Number): Social credit percentage.
+
+        Returns:
+            (Number): Labour tax credit.
+
+        """
+        return social_credit * self.get_labour_credit(year=year, salary=taxable_income)
+
+    def calculate_elder_tax_credit(
+        self, year: str, taxable_income: int, old_age: bool, social_security: bool
+    ) -> float:
+        """
+        Calculate elder tax credit of taxable income.
+
+        Args:
+            year (str): Calculation year.
+            taxable_income (int): Taxable income.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+
+        Returns:
+            (Number): Elder tax credit.
+
+        """
+        if not old_age:
+            return 0
+        return self.get_elder_credit(
+            year=year, salary=taxable_income, social_security=social_security
         )
 
+    @staticmethod
+    def calculate_year_net_income(
+        taxable_income: int,
+        tax_free_income: float,
+        payroll_tax: float,
+        social_security_tax: float,
+        general_tax_credit: float,
+        labour_tax_credit: float,
+        elder_tax_credit: float,
+    ) -> float:
+        """
+        Calculate yearly net income, taxes minus credits are never refunded.
+
+        Args:
+            taxable_income (int): Taxable income.
+            tax_free_income (Number): Ruling tax free income.
+            payroll_tax (Number): Payroll tax.
+            social_security_tax (Number): Social security tax.
+            general_tax_credit (Number): General tax credit.
+            labour_tax_credit (Number): Labour tax credit.
+            elder_tax_credit (Number): Elder tax credit.
+
+        Returns:
+            (Number): Yearly net income.
+
+        """
         income_tax = math.floor(
-            payroll_tax + social_tax + general_credit + labour_credit
+            payroll_tax
+            + social_security_tax
+            + general_tax_credit
+            + labour_tax_credit
+            + elder_tax_credit
         )
         income_tax = income_tax if income_tax < 0 else 0
+        return taxable_income + income_tax + tax_free_income
 
-        year_net_income = taxable_year + income_tax + tax_free_year
+    @staticmethod
+    def calculate_month_net_income(year_net_income: float) -> int:
+        """
+        Calculate monthly net income.
+
+        Args:
+            year_net_income (Number): Yearly net income.
+
+        Returns:
+            (int): Monthly net income.
+
+        """
+        return math.floor(year_net_income / 12)
+
+    def calculate_hour_net_income(
+        self, year_net_income: float, working_hours: float
+    ) -> int:
+        """
+        Calculate hourly net income.
+
+        Args:
+            year_net_income (Number): Yearly net income.
+            working_hours (Number): Weekly working hours.
+
+        Returns:
+            (int): Hourly net income.
+
+        """
+        return math.floor(
+            year_net_income / (self._tax_data["workingWeeks"] * working_hours)
+        )
+
+    def calculate(self) -> DutchTaxesResult:
+        """
+        Main calculation method, every stage is one of the calculate_* methods.
+
+        Returns:
+            (DutchTaxesResult): Calculation results.
+
+        """
+        timer = METRICS.timer("nl.calculate")
+        if timer is not None:
+            METRICS.count(f"nl.calculate.period.{self._period}")
+
+        gross_year = self.get_gross_year()
+        if timer is not None:
+            timer.lap("period")
+
+        gross_allowance = self.calculate_gross_allowance(
+            gross_year, self._holiday_allowance
+        )
+        if timer is not None:
+            timer.lap("holiday_allowance")
+
+        tax_free_year = self.calculate_tax_free_income(
+            gross_year, gross_allowance, self._year, self._ruling
+        )
+        taxable_year = self.calculate_taxable_income(
+            gross_year, gross_allowance, tax_free_year
+        )
+        if timer is not None:
+            timer.lap("ruling")
+
+        payroll_tax = self.calculate_payroll_tax(self._year, taxable_year)
+        if timer is not None:
+            timer.lap("payroll_tax")
+
+        social_tax = self.calculate_social_security_tax(
+            self._year, taxable_year, self._old_age, self._social_security
+        )
+        if timer is not None:
+            timer.lap("social_tax")
+
+        social_credit = self.calculate_social_credit(
+            self._year, self._old_age, self._social_security
+        )
+        if timer is not None:
+            timer.lap("social_credit")
+
+        general_credit = self.calculate_general_tax_credit(
+            self._year, taxable_year, social_credit
+        )
+        if timer is not None:
+            timer.lap("general_credit")
+
+        labour_credit = self.calculate_labour_tax_credit(
+            self._year, taxable_year, social_credit
+        )
+        if timer is not None:
+            timer.lap("labour_credit")
+
+        elder_credit = self.calculate_elder_tax_credit(
+            self._year, taxable_year, self._old_age, self._social_security
+        )
+        if timer is not None:
+            timer.lap("elder_credit")
+
+        year_net_income = self.calculate_year_net_income(
+            taxable_year,
+            tax_free_year,
+            payroll_tax,
+            social_tax,
+            general_credit,
+            labour_credit,
+            elder_credit,
+        )
 
         # holiday allowance: math.floor(net_year * (0.08 / 1.08)) if self._holiday_allowance else 0
         # day income: math.floor(net_year / NL_DATA["workingDays"])
@@ -275,12 +688,188 @@ class DutchTaxCalculator:
         # result["calculated_ruling_percentage"] = math.floor(tax_free_year / gross_year * 100)
         # result["calculated_taxable_income"] = taxable_year
 
-        month_net_income = math.floor(year_net_income / 12)
-        hour_net_income = math.floor(
-            year_net_income / (self._tax_data["workingWeeks"] * self._working_hours)
+        month_net_income = self.calculate_month_net_income(year_net_income)
+        hour_net_income = self.calculate_hour_net_income(
+            year_net_income, self._working_hours
+        )
+
+        result = DutchTaxesResult(
+            year_net_income=year_net_income,
+            taxable_income=taxable_year,
+            month_net_income=month_net_income,
+            payroll_tax=payroll_tax,
+            social_security_tax=social_tax,
+            general_tax_credit=general_credit,
+            labour_tax_credit=labour_credit,
+            elder_tax_credit=elder_credit,
+            hour_net_income=hour_net_income,
+        )
+        if timer is not None:
+            timer.lap("net_income")
+            timer.stop()
+
+        return result
+
+    @classmethod
+    def calculate_many(
+        cls,
+        salary,
+        period,
+        working_hours,
+        ruling,
+        year,
+        old_age,
+        holiday_allowance,
+        tax_data,
+        social_security=True,
+        get_amounts=get_amounts_batch,
+    ) -> DutchTaxesBatchResult:
+        """
+        Batch calculation method.
+        Every argument is either a column array with a value per row
+        or a single value shared by all rows.
+        Results are the same as calculate() gives for every row.
+
+        Args:
+            get_amounts (Callable): Function calculating compiled brackets
+                amounts for an array of salaries.
+
+        Returns:
+            (DutchTaxesBatchResult): Calculation results by column.
+
+        """
+        timer = METRICS.timer("nl.calculate_many")
+        (
+            salary,
+            period,
+            working_hours,
+            ruling,
+            year,
+            old_age,
+            holiday_allowance,
+            social_security,
+        ) = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(salary, dtype=np.float64)),
+            period,
+            working_hours,
+            ruling,
+            year,
+            np.asarray(old_age, dtype=bool),
+            np.asarray(holiday_allowance, dtype=bool),
+            np.asarray(social_security, dtype=bool),
+        )
+        calculator = cls.for_tax_data(tax_data)
+        tables = calculator._tables
+        years = tax_data["years"]
+        rulings = list(RULING_TYPES)
+
+        year_index = get_group_index(year, years)
+        ruling_index = get_group_index(ruling, rulings)
+        social_index = old_age * 2 + social_security
+        ruling_incomes = np.array(
+            [
+                [
+                    math.inf
+                    if ruling_ == "None"
+                    else calculator.get_ruling_income(
+                        year=year_, ruling=RULING_TYPES[ruling_]
+                    )
+                    for ruling_ in rulings
+                ]
+                for year_ in years
+            ]
+        )
+        social_credits = np.array(
+            [
+                [
+                    calculator.get_social_credit(
+                        year=year_, age=age, social_security=social
+                    )
+                    for age in (False, True)
+                    for social in (False, True)
+                ]
+                for year_ in years
+            ]
+        )
+        elder_shares = np.array(
+            [[calculator.get_elder_credit_share(year_), 1] for year_ in years]
+        )
+        if timer is not None:
+            METRICS.count("nl.calculate_many.rows", salary.size)
+            timer.lap("options")
+
+        gross_year = get_gross_year_batch(salary, period, working_hours, tax_data)
+        if timer is not None:
+            timer.lap("period")
+
+        gross_allowance = np.where(
+            holiday_allowance, np.floor(gross_year * (0.08 / 1.08)), 0
+        )
+        taxable_year = gross_year - gross_allowance
+        if timer is not None:
+            timer.lap("holiday_allowance")
+
+        is_ruling = taxable_year > ruling_incomes[year_index, ruling_index]
+        tax_free_year = np.where(is_ruling, taxable_year * 0.3, 0)
+        taxable_year = np.floor(
+            np.where(is_ruling, taxable_year - tax_free_year, taxable_year)
         )
+        if timer is not None:
+            timer.lap("ruling")
 
-        return DutchTaxesResult(
+        payroll_tax = np.zeros(taxable_year.shape)
+        social_tax = np.zeros(taxable_year.shape)
+        general_credit = np.zeros(taxable_year.shape)
+        labour_credit = np.zeros(taxable_year.shape)
+        elder_credit = np.zeros(taxable_year.shape)
+        for position, year_ in enumerate(years):
+            rows = year_index == position
+            if not rows.any():
+                continue
+
+            salaries = taxable_year[rows]
+            payroll_tax[rows] = -1 * get_amounts(
+                tables["payrollTax", year_, "rate"], salaries
+            )
+            general_credit[rows] = get_amounts(
+                tables["generalCredit", year_, "rate"], salaries
+            )
+            labour_credit[rows] = get_amounts(
+                tables["labourCredit", year_, "rate"], salaries
+            )
+            for age, rate_type in ((False, "social"), (True, "older")):
+                social_rows = rows & social_security & (old_age == age)
+                social_tax[social_rows] = -1 * get_amounts(
+                    tables["socialPercent", year_, rate_type],
+                    taxable_year[social_rows],
+                )
+            elder_rows = rows & old_age
+            if elder_rows.any():
+                elder_credit[elder_rows] = get_amounts(
+                    tables["elderCredit", year_, "rate"], taxable_year[elder_rows]
+                )
+        if timer is not None:
+            timer.lap("brackets")
+
+        social_credit = social_credits[year_index, social_index]
+        general_credit = social_credit * general_credit
+        labour_credit = social_credit * labour_credit
+        elder_credit = elder_shares[year_index, social_security * 1] * elder_credit
+        if timer is not None:
+            timer.lap("social_credit")
+
+        income_tax = np.floor(
+            payroll_tax + social_tax + general_credit + labour_credit + elder_credit
+        )
+        income_tax = np.where(income_tax < 0, income_tax, 0)
+
+        year_net_income = taxable_year + income_tax + tax_free_year
+        month_net_income = np.floor(year_net_income / 12)
+        hour_net_income = np.floor(
+            year_net_income / (tax_data["workingWeeks"] * working_hours)
+        )
+
+        result = DutchTaxesBatchResult(
             year_net_income=year_net_income,
             taxable_income=taxable_year,
             month_net_income=month_net_income,
@@ -288,5 +877,210 @@ class DutchTaxCalculator:
             social_security_tax=social_tax,
             general_tax_credit=general_credit,
             labour_tax_credit=labour_credit,
+            elder_tax_credit=elder_credit,
             hour_net_income=hour_net_income,
         )
+        if timer is not None:
+            timer.lap("net_income")
+            timer.stop()
+
+        return result
+
+    @classmethod
+    def calculate_sweep(
+        cls,
+        salaries,
+        year,
+        ruling,
+        old_age,
+        holiday_allowance,
+        tax_data,
+        social_security=True,
+        period="year",
+        working_hours=None,
+    ) -> DutchTaxesBatchResult:
+        """
+        Calculate a grid of salaries with the same options,
+        e.g. every euro from 0 to 500,000 for a year.
+
+        All components are piecewise linear between bracket edges,
+        the ruling threshold and the holiday allowance split,
+        so the grid is filled segment by segment between those points
+        instead of looking up brackets for every salary.
+        Results are the same as calculate() gives for every salary.
+
+        Args:
+            salaries (np.ndarray): Salary grid, preferably sorted.
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            holiday_allowance (bool): True if holiday allowance is included.
+            tax_data (dict): Base government tax data.
+            social_security (bool): True if social security is applied.
+            period (str): Working period of salaries.
+            working_hours (Number): Weekly working hours, default from tax data.
+
+        Returns:
+            (DutchTaxesBatchResult): Calculation results by salary.
+
+        """
+        timer = METRICS.timer("nl.calculate_sweep")
+        result = cls.calculate_many(
+            salary=salaries,
+            period=period,
+            working_hours=working_hours or tax_data["defaultWorkingHours"],
+            ruling=ruling,
+            year=year,
+            old_age=old_age,
+            holiday_allowance=holiday_allowance,
+            tax_data=tax_data,
+            social_security=social_security,
+            get_amounts=get_amounts_by_segments,
+        )
+        if timer is not None:
+            timer.stop()
+
+        return result
+
+    @staticmethod
+    def get_gross_kinks(
+        year, ruling, old_age, holiday_allowance, tax_data
+    ) -> np.ndarray:
+        """
+        Get yearly gross incomes where net income changes its slope:
+        bracket edges of every component and the ruling threshold,
+        mapped from taxable income back to gross income.
+
+        Args:
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            holiday_allowance (bool): True if holiday allowance is included.
+            tax_data (dict): Base government tax data.
+
+        Returns:
+            (np.ndarray): Yearly gross incomes.
+
+        """
+        tables = compile_tax_data(tax_data)
+        bounds = np.array(
+            [
+                bound
+                for name, rate_type in (
+                    ("payrollTax", "rate"),
+                    ("socialPercent", "older" if old_age else "social"),
+                    ("generalCredit", "rate"),
+                    ("labourCredit", "rate"),
+                )
+                + ((("elderCredit", "rate"),) if old_age else ())
+                for bound in tables[name, year, rate_type].bounds
+            ]
+        )
+        factor = 1.08 if holiday_allowance else 1
+        kinks = [bounds * factor]
+
+        if ruling != "None":
+            threshold = tax_data["rulingThreshold"][year][RULING_TYPES[ruling]]
+            kinks.append([threshold * factor])
+            kinks.append(bounds * factor / 0.7)
+
+        return np.concatenate(kinks)
+
+    @classmethod
+    def calculate_gross(
+        cls,
+        net,
+        period,
+        working_hours,
+        ruling,
+        year,
+        old_age,
+        holiday_allowance,
+        tax_data,
+        social_security=True,
+    ):
+        """
+        Inverse calculation method: find the minimal gross salary per period,
+        rounded to cents, for which calculate() gives at least the target
+        net income per period.
+
+        Args:
+            net (Number | np.ndarray): Target net income per period, or an array.
+
+        Returns:
+            (Number | np.ndarray): Gross salary per period, or an array.
+
+        """
+        working_hours = working_hours or tax_data["defaultWorkingHours"]
+
+        def get_net(gross):
+            result = cls.calculate_many(
+                salary=gross,
+                period=period,
+                working_hours=working_hours,
+                ruling=ruling,
+                year=year,
+                old_age=old_age,
+                holiday_allowance=holiday_allowance,
+                tax_data=tax_data,
+                social_security=social_security,
+            )
+            return get_period_net(result, period, tax_data)
+
+        period_factor = get_gross_year_batch(
+            np.ones(1), np.array([period]), working_hours, tax_data
+        )[0]
+        kinks = cls.get_gross_kinks(
+            year, ruling, old_age, holiday_allowance, tax_data
+        )
+        gross = solve_gross(get_net, np.atleast_1d(net), kinks / period_factor)
+        return gross if np.ndim(net) else gross[0].item()
+
+    @classmethod
+    def get_tax_function(
+        cls, year, ruling, old_age, social_security, tax_data
+    ) -> PiecewiseLinear:
+        """
+        Get income tax with credits as a piecewise linear function
+        of taxable income before the ruling, negative values are taxes.
+        The result is not floored nor limited to taxes,
+        as calculate() does with its income tax.
+
+        Args:
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+            tax_data (dict): Base government tax data.
+
+        Returns:
+            (PiecewiseLinear): Income tax by taxable income.
+
+        """
+        calculator = cls.for_tax_data(tax_data)
+        tables = calculator._tables
+
+        def function(name, rate_type="rate"):
+            return PiecewiseLinear.from_brackets(tables[name, year, rate_type])
+
+        social_credit = calculator.get_social_credit(
+            year=year, age=old_age, social_security=social_security
+        )
+        income_tax = -function("payrollTax") + social_credit * (
+            function("generalCredit") + function("labourCredit")
+        )
+        if social_security:
+            income_tax -= function("socialPercent", "older" if old_age else "social")
+        if old_age:
+            elder_credit = function("elderCredit")
+            if not social_security:
+                elder_credit = elder_credit * calculator.get_elder_credit_share(year)
+            income_tax += elder_credit
+
+        if ruling != "None":
+            threshold = calculator.get_ruling_income(
+                year=year, ruling=RULING_TYPES[ruling]
+            )
+            income_tax = income_tax.compose(PiecewiseLinear.ruling_deduction(threshold))
+
+        return income_tax
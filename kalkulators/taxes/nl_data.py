@@ -1078,5 +1078,123 @@ NL_DATA = {
         "rate":0
       }
     ]
+  },
+  "selfEmployedDeduction":{
+    "2015":7280,
+    "2016":7280,
+    "2017":7280,
+    "2018":7280,
+    "2019":7280,
+    "2020":7030,
+    "2021":6670,
+    "2022":6310,
+    "2023":5030,
+    "2024":3750
+  },
+  "starterDeduction":{
+    "2015":2123,
+    "2016":2123,
+    "2017":2123,
+    "2018":2123,
+    "2019":2123,
+    "2020":2123,
+    "2021":2123,
+    "2022":2123,
+    "2023":2123,
+    "2024":2123
+  },
+  "profitExemption":{
+    "2015":0.14,
+    "2016":0.14,
+    "2017":0.14,
+    "2018":0.14,
+    "2019":0.14,
+    "2020":0.14,
+    "2021":0.14,
+    "2022":0.14,
+    "2023":0.14,
+    "2024":0.1331
+  },
+  "healthContribution":{
+    "2015":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":51976,
+        "rate":0.0485
+      }
+    ],
+    "2016":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":52763,
+        "rate":0.055
+      }
+    ],
+    "2017":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":53701,
+        "rate":0.054
+      }
+    ],
+    "2018":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":54614,
+        "rate":0.0565
+      }
+    ],
+    "2019":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":55927,
+        "rate":0.057
+      }
+    ],
+    "2020":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":57232,
+        "rate":0.0545
+      }
+    ],
+    "2021":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":58311,
+        "rate":0.0575
+      }
+    ],
+    "2022":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":59706,
+        "rate":0.055
+      }
+    ],
+    "2023":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":66956,
+        "rate":0.0543
+      }
+    ],
+    "2024":[
+      {
+        "bracket":1,
+        "min":0,
+        "max":71628,
+        "rate":0.0532
+      }
+    ]
   }
 }
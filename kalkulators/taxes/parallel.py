@@ -0,0 +1,130 @@
+import dataclasses
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.countries import COUNTRIES
+
+DEFAULT_SHARD_SIZE = 100000
+
+
+def init_worker() -> None:
+    """
+    Prepare a worker process: compile tax tables of every country
+    and year once, so tasks only carry their rows
+    and don't compile tables on first use.
+
+    """
+    for country in COUNTRIES.values():
+        compile_tax_data(country["tax_data"]).compile_all()
+
+
+def create_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for batch calculations.
+
+    Args:
+        workers (int): Number of worker processes, CPU count by default.
+
+    Returns:
+        (ProcessPoolExecutor): Process pool with initialized workers.
+
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+
+def imap_ordered(
+    executor: Executor, fn: Callable, items: Iterable, prefetch: int
+) -> Iterator:
+    """
+    Lazy Executor.map: keeps at most prefetch tasks in flight
+    and yields results in input order.
+
+    Args:
+        executor (Executor): Executor to run tasks with.
+        fn (Callable): Function applied to every item.
+        items (Iterable): Function arguments, consumed lazily.
+        prefetch (int): Maximum number of submitted tasks.
+
+    Yields:
+        Function results.
+
+    """
+    futures = deque()
+    for item in items:
+        futures.append(executor.submit(fn, item))
+        if len(futures) >= prefetch:
+            yield futures.popleft().result()
+
+    while futures:
+        yield futures.popleft().result()
+
+
+def calculate_shard(country: str, columns: dict):
+    """
+    Calculate a shard of rows in a worker process.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        columns (dict): Column arrays by calculation argument.
+
+    Returns:
+        Batch calculation results of the country calculator.
+
+    """
+    return COUNTRIES[country]["calculator"].calculate_many(
+        tax_data=COUNTRIES[country]["tax_data"], **columns
+    )
+
+
+def calculate_sharded(
+    country: str,
+    executor: Optional[Executor] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    **columns,
+):
+    """
+    Batch calculation split into shards calculated by worker processes.
+    Columns are the calculate_many arguments of the country calculator,
+    single values are sent as they are, arrays are split into shards.
+
+    Args:
+        country (str): Country code: "nl", "cy".
+        executor (Executor): Pool to use, a new process pool by default.
+        shard_size (int): Number of rows calculated by one task.
+
+    Returns:
+        Batch calculation results of the country calculator, in input order.
+
+    """
+    arrays = {name: np.asarray(value) for name, value in columns.items()}
+    rows = max((len(array) for array in arrays.values() if array.ndim), default=1)
+    bounds = range(0, rows or 1, shard_size)
+    shards = (
+        {
+            name: array[start : start + shard_size] if array.ndim else array
+            for name, array in arrays.items()
+        }
+        for start in bounds
+    )
+
+    with ExitStack() as stack:
+        if executor is None:
+            workers = max(min(len(bounds), os.cpu_count() or 1), 1)
+            executor = stack.enter_context(create_pool(workers))
+        results = list(executor.map(calculate_shard, repeat(country), shards))
+
+    return COUNTRIES[country]["result"](
+        **{
+            field.name: np.concatenate(
+                [getattr(result, field.name) for result in results]
+            )
+            for field in dataclasses.fields(COUNTRIES[country]["result"])
+        }
+    )
@@ -0,0 +1,270 @@
+import argparse
+import csv
+import dataclasses
+import sys
+import time
+from contextlib import ExitStack
+from functools import partial
+from itertools import islice, tee
+from typing import Dict, Iterable, Iterator, List, TextIO
+
+import numpy as np
+
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.datastore import load_tax_data
+from kalkulators.taxes.parallel import calculate_shard, create_pool, imap_ordered
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DEFAULT_CHUNK_SIZE = 10000
+TRUE_VALUES = ("1", "true", "yes", "y", "t")
+
+COLUMNS = {
+    "nl": {
+        "salary": float,
+        "period": str,
+        "working_hours": float,
+        "ruling": str,
+        "year": str,
+        "old_age": bool,
+        "holiday_allowance": bool,
+        "social_security": bool,
+    },
+    "cy": {
+        "salary": float,
+        "period": str,
+        "working_hours": float,
+        "ruling": str,
+        "year": str,
+    },
+}
+DEFAULTS = {
+    "nl": {
+        "period": "year",
+        "working_hours": load_tax_data("nl")["defaultWorkingHours"],
+        "ruling": "None",
+        "year": str(load_tax_data("nl")["currentYear"]),
+        "old_age": False,
+        "holiday_allowance": False,
+        "social_security": True,
+    },
+    "cy": {
+        "period": "year",
+        "working_hours": load_tax_data("cy")["defaultWorkingHours"],
+        "ruling": "0%",
+        "year": str(load_tax_data("cy")["currentYear"]),
+    },
+}
+
+
+def read_chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[List[dict]]:
+    """
+    Split rows into chunks of a fixed size.
+
+    Args:
+        rows (Iterable[dict]): Input rows.
+        chunk_size (int): Maximum number of rows in a chunk.
+
+    Yields:
+        (list[dict]): Chunk of rows.
+
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_columns(chunk: List[dict], country: str) -> Dict[str, np.ndarray]:
+    """
+    Convert a chunk of rows, CSV rows or decoded JSON objects,
+    into calculation column arrays.
+    Missing or empty values are replaced with defaults.
+
+    Args:
+        chunk (list[dict]): Chunk of rows.
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (dict): Column arrays by calculation argument.
+
+    """
+    columns = {}
+    for name, kind in COLUMNS[country].items():
+        default = DEFAULTS[country].get(name)
+        values = [
+            default if row.get(name) in (None, "") else row.get(name) for row in chunk
+        ]
+        if None in values:
+            raise ValueError(f"Column {name!r} is required")
+        if kind is bool:
+            columns[name] = np.array(
+                [str(value).strip().lower() in TRUE_VALUES for value in values]
+            )
+        elif kind is float:
+            columns[name] = np.array(values, dtype=np.float64)
+        else:
+            # JSON rows can have numbers, e.g. an int year
+            columns[name] = np.array([str(value) for value in values])
+    return columns
+
+
+def calculate_chunk(chunk: List[dict], country: str) -> List[list]:
+    """
+    Calculate taxes for a chunk of rows.
+
+    Args:
+        chunk (list[dict]): Chunk of rows.
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (list[list]): Input rows extended with calculation results.
+
+    """
+    return get_rows(chunk, calculate_shard(country, to_columns(chunk, country)))
+
+
+def get_rows(chunk: List[dict], result) -> List[list]:
+    """
+    Join a chunk of rows with its calculation results.
+
+    Args:
+        chunk (list[dict]): Chunk of rows.
+        result: Batch calculation results of the chunk.
+
+    Returns:
+        (list[list]): Input rows extended with calculation results.
+
+    """
+    results = zip(
+        *(getattr(result, field.name).tolist() for field in dataclasses.fields(result))
+    )
+    return [list(row.values()) + list(values) for row, values in zip(chunk, results)]
+
+
+def get_peak_memory() -> int:
+    """
+    Get peak resident set size of the current process.
+
+    Returns:
+        (int): Peak RSS in bytes, 0 if unknown.
+
+    """
+    if resource is None:
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_payroll(
+    source: TextIO,
+    target: TextIO,
+    country: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+) -> int:
+    """
+    Stream payroll rows from a CSV source to a CSV target chunk by chunk,
+    so only a few chunks are kept in memory at a time.
+
+    Args:
+        source (TextIO): Input CSV with a header row.
+        target (TextIO): Output CSV, input columns followed by results.
+        country (str): Country code: "nl", "cy".
+        chunk_size (int): Number of rows calculated at once.
+        workers (int): Number of worker processes, 1 to calculate in place.
+
+    Returns:
+        (int): Number of processed rows.
+
+    """
+    reader = csv.DictReader(source)
+    writer = csv.writer(target)
+    writer.writerow(
+        (reader.fieldnames or [])
+        + [field.name for field in dataclasses.fields(COUNTRIES[country]["result"])]
+    )
+
+    chunks = read_chunks(reader, chunk_size)
+
+    count = 0
+    with ExitStack() as stack:
+        if workers > 1:
+            # Workers get column arrays, cheap to pickle, rows stay here
+            pool = stack.enter_context(create_pool(workers))
+            chunks, pending = tee(chunks)
+            columns = (to_columns(chunk, country) for chunk in pending)
+            results = map(
+                get_rows,
+                chunks,
+                imap_ordered(
+                    pool,
+                    partial(calculate_shard, country),
+                    columns,
+                    prefetch=2 * workers,
+                ),
+            )
+        else:
+            results = map(partial(calculate_chunk, country=country), chunks)
+
+        for rows in results:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Calculate net income for every row of a payroll CSV file."
+    )
+    parser.add_argument("input", help="input CSV file, '-' for stdin")
+    parser.add_argument("output", help="output CSV file, '-' for stdout")
+    parser.add_argument("--country", choices=sorted(COUNTRIES), default="nl")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "number of worker processes, only calculations run in workers, "
+            "reading and writing CSV stay in one process"
+        ),
+    )
+    args = parser.parse_args(args)
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        source = (
+            sys.stdin
+            if args.input == "-"
+            else stack.enter_context(open(args.input, newline="", encoding="utf-8"))
+        )
+        target = (
+            sys.stdout
+            if args.output == "-"
+            else stack.enter_context(
+                open(args.output, "w", newline="", encoding="utf-8")
+            )
+        )
+        count = run_payroll(
+            source, target, args.country, args.chunk_size, args.workers
+        )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{count:,} rows in {elapsed:.2f} s, "
+        f"{count / elapsed if elapsed else 0:,.0f} rows/s, "
+        f"peak RSS {get_peak_memory() / 2**20:,.1f} MiB",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import math
+from dataclasses import dataclass
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from kalkulators.taxes.brackets import CompiledBrackets
+
+
+@dataclass(frozen=True)
+class PiecewiseLinear:
+    """
+    Piecewise linear function of income.
+    Segment i covers incomes up to and including edges[i]
+    (the last one is unbounded) and is equal to
+    intercepts[i] + slopes[i] * income there.
+    Segments don't have to join, fixed amount brackets are jumps.
+
+    Bracket amounts are modelled exactly, except get_rates rounding to cents.
+
+    """
+
+    edges: Tuple[float, ...]
+    slopes: Tuple[float, ...]
+    intercepts: Tuple[float, ...]
+
+    @classmethod
+    def from_brackets(cls, compiled: CompiledBrackets) -> "PiecewiseLinear":
+        """
+        Build the function of compiled brackets amounts.
+
+        Args:
+            compiled (CompiledBrackets): Compiled brackets.
+
+        Returns:
+            (PiecewiseLinear): Amount by salary.
+
+        """
+        edges = [bound for bound in compiled.bounds if bound != math.inf]
+        slopes, intercepts = [], []
+        for index in range(len(edges) + 1):
+            if compiled.percents[index]:
+                rate = compiled.rates[index]
+                slopes.append(rate)
+                intercepts.append(
+                    compiled.offsets[index] - compiled.starts[index] * rate
+                )
+            else:
+                slopes.append(0)
+                intercepts.append(compiled.rates[index])
+        return cls(tuple(edges), tuple(slopes), tuple(intercepts)).simplify()
+
+    @classmethod
+    def linear(cls, slope: float = 1, intercept: float = 0) -> "PiecewiseLinear":
+        """
+        Build a linear function, e.g. the identity.
+
+        Args:
+            slope (Number): Slope.
+            intercept (Number): Value at zero income.
+
+        Returns:
+            (PiecewiseLinear): Linear function.
+
+        """
+        return cls((), (slope,), (intercept,))
+
+    @classmethod
+    def ruling_deduction(
+        cls, threshold: float, part: float = 0.3
+    ) -> "PiecewiseLinear":
+        """
+        Build taxable income after the ruling,
+        which makes a part of income tax free above a threshold.
+
+        Args:
+            threshold (Number): Ruling threshold.
+            part (Number): Tax free part of income.
+
+        Returns:
+            (PiecewiseLinear): Taxable income by income before the ruling.
+
+        """
+        return cls((threshold,), (1, 1 - part), (0, 0))
+
+    @property
+    def segments(self) -> Iterator[Tuple[float, float, float, float]]:
+        """
+        Segments as (start, end, slope, intercept), start excluded.
+
+        """
+        starts = (-math.inf,) + self.edges
+        ends = self.edges + (math.inf,)
+        return zip(starts, ends, self.slopes, self.intercepts)
+
+    def _segment_index(self, income):
+        return np.searchsorted(np.array(self.edges, dtype=np.float64), income)
+
+    def __call__(self, income):
+        index = self._segment_index(income)
+        slopes, intercepts = np.array(self.slopes), np.array(self.intercepts)
+        value = intercepts[index] + slopes[index] * income
+        return value if np.ndim(value) else float(value)
+
+    def marginal_rate(self, income):
+        """
+        Slope of the segment holding income.
+
+        """
+        rate = np.array(self.slopes, dtype=np.float64)[self._segment_index(income)]
+        return rate if np.ndim(rate) else float(rate)
+
+    def effective_rate(self, income):
+        """
+        Function value divided by income.
+
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self(income) / np.asarray(income, dtype=np.float64)
+
+    def integrate(self, start: float, end: float) -> float:
+        """
+        Exact integral over an income interval.
+
+        Args:
+            start (Number): Interval start.
+            end (Number): Interval end.
+
+        Returns:
+            (Number): Integral value.
+
+        """
+        if start > end:
+            return -self.integrate(end, start)
+
+        total = 0.0
+        for low, high, slope, intercept in self.segments:
+            low, high = max(low, start), min(high, end)
+            if low < high:
+                total += intercept * (high - low) + slope * (high**2 - low**2) / 2
+        return total
+
+    def simplify(self) -> "PiecewiseLinear":
+        """
+        Merge neighbouring segments with the same line.
+
+        """
+        edges, slopes, intercepts = [], [self.slopes[0]], [self.intercepts[0]]
+        lines = zip(self.edges, self.slopes[1:], self.intercepts[1:])
+        for edge, slope, intercept in lines:
+            if slope == slopes[-1] and intercept == intercepts[-1]:
+                continue
+            edges.append(edge)
+            slopes.append(slope)
+            intercepts.append(intercept)
+        return PiecewiseLinear(tuple(edges), tuple(slopes), tuple(intercepts))
+
+    def _lines_at(self, edges: Tuple[float, ...]):
+        # Segment index for every segment of a finer partition
+        index = self._segment_index(np.array(edges + (math.inf,)))
+        return np.array(self.slopes)[index], np.array(self.intercepts)[index]
+
+    def __add__(self, other) -> "PiecewiseLinear":
+        if not isinstance(other, PiecewiseLinear):
+            other = PiecewiseLinear.linear(0, other)
+
+        edges = tuple(sorted(set(self.edges) | set(other.edges)))
+        slopes, intercepts = self._lines_at(edges)
+        other_slopes, other_intercepts = other._lines_at(edges)
+        return PiecewiseLinear(
+            edges,
+            tuple((slopes + other_slopes).tolist()),
+            tuple((intercepts + other_intercepts).tolist()),
+        ).simplify()
+
+    __radd__ = __add__
+
+    def __mul__(self, factor: float) -> "PiecewiseLinear":
+        return PiecewiseLinear(
+            self.edges,
+            tuple(slope * factor for slope in self.slopes),
+            tuple(intercept * factor for intercept in self.intercepts),
+        ).simplify()
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "PiecewiseLinear":
+        return self * -1
+
+    def __sub__(self, other) -> "PiecewiseLinear":
+        return self + -other
+
+    def __rsub__(self, other) -> "PiecewiseLinear":
+        return -self + other
+
+    def compose(self, inner: "PiecewiseLinear") -> "PiecewiseLinear":
+        """
+        Function of the inner function value: self(inner(income)),
+        e.g. a tax of taxable income after the ruling deduction.
+        Inner segments are expected to be non-decreasing.
+
+        Args:
+            inner (PiecewiseLinear): Inner function.
+
+        Returns:
+            (PiecewiseLinear): Composition.
+
+        """
+        edges, slopes, intercepts = [], [], []
+        for low, high, slope, intercept in inner.segments:
+            # Incomes where the inner line crosses edges of this function
+            crossings = []
+            if slope > 0:
+                crossings = [
+                    (edge - intercept) / slope
+                    for edge in self.edges
+                    if low < (edge - intercept) / slope < high
+                ]
+
+            for end in crossings + [high]:
+                start = edges[-1] if edges else -math.inf
+                point = _inner_point(start, end)
+                index = self._segment_index(slope * point + intercept)
+                slopes.append(self.slopes[index] * slope)
+                intercepts.append(
+                    self.slopes[index] * intercept + self.intercepts[index]
+                )
+                edges.append(end)
+
+        return PiecewiseLinear(
+            tuple(edges[:-1]), tuple(slopes), tuple(intercepts)
+        ).simplify()
+
+
+def _inner_point(start: float, end: float) -> float:
+    # Any income strictly inside a segment
+    if start == -math.inf:
+        return 0.0 if end == math.inf else end - 1
+    if end == math.inf:
+        return start + 1
+    return (start + end) / 2
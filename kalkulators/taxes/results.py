@@ -0,0 +1,207 @@
+import dataclasses
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from kalkulators.taxes.cy_calc import CyprusTaxesBatchResult, CyprusTaxesResult
+from kalkulators.taxes.nl_calc import DutchTaxesBatchResult, DutchTaxesResult
+
+# Batch result classes by single result class, fields are in the same order
+BATCH_RESULTS = {
+    DutchTaxesResult: DutchTaxesBatchResult,
+    CyprusTaxesResult: CyprusTaxesBatchResult,
+}
+SINGLE_RESULTS = {batch: single for single, batch in BATCH_RESULTS.items()}
+
+
+class ResultRow:
+    """
+    Lightweight view of one row of a ResultTable.
+    Fields are read from the table array on access,
+    so a row only holds its table and position.
+
+    """
+
+    __slots__ = ("_table", "_position")
+
+    def __init__(self, table: "ResultTable", position: int):
+        self._table = table
+        self._position = position
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            column = self._table._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return self._table.values[column, self._position].item()
+
+    def __iter__(self) -> Iterator:
+        return iter(self._table.values[:, self._position].tolist())
+
+    def __len__(self) -> int:
+        return len(self._table.fields)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ResultRow):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self._table.fields, self)
+        )
+        return f"{type(self).__name__}({values})"
+
+    def to_result(self):
+        """
+        Copy the row to a single result object.
+
+        Returns:
+            Calculation results, e.g. DutchTaxesResult.
+
+        """
+        return self._table.result_class(*self)
+
+
+class ResultTable:
+    """
+    Many calculation results of one country in one typed 2-D array,
+    a row per field and a column per result.
+    Field columns, slices and to_numpy() are views of the array,
+    iteration yields ResultRow views, no Python object per result is kept.
+
+    """
+
+    __slots__ = ("result_class", "fields", "values", "_columns")
+
+    def __init__(self, result_class: type, values: np.ndarray):
+        fields = tuple(field.name for field in dataclasses.fields(result_class))
+        if values.ndim != 2 or values.shape[0] != len(fields):
+            raise ValueError(
+                f"Values must have shape ({len(fields)}, rows), got {values.shape}"
+            )
+        self.result_class = result_class
+        self.fields = fields
+        self.values = values
+        self._columns = {name: position for position, name in enumerate(fields)}
+
+    @classmethod
+    def empty(cls, result_class: type, size: int, dtype=np.float64) -> "ResultTable":
+        """
+        Allocate a table to be filled slice by slice, e.g. with set_rows().
+
+        Args:
+            result_class (type): Single result class, e.g. DutchTaxesResult.
+            size (int): Number of rows.
+            dtype (np.dtype): Values type, e.g. np.int64 for cents.
+
+        Returns:
+            (ResultTable): Table of uninitialized values.
+
+        """
+        fields = dataclasses.fields(result_class)
+        return cls(result_class, np.empty((len(fields), size), dtype=dtype))
+
+    @classmethod
+    def from_batch(cls, result) -> "ResultTable":
+        """
+        Copy batch results to a table once.
+
+        Args:
+            result: Batch calculation results, e.g. DutchTaxesBatchResult.
+
+        Returns:
+            (ResultTable): Results table, with the dtype of the batch columns.
+
+        """
+        columns = [
+            np.ravel(getattr(result, field.name))
+            for field in dataclasses.fields(result)
+        ]
+        return cls(SINGLE_RESULTS[type(result)], np.stack(columns))
+
+    @classmethod
+    def from_results(cls, results: Iterable, result_class: type) -> "ResultTable":
+        """
+        Copy single results to a table.
+
+        Args:
+            results (Iterable): Calculation results, e.g. of calculate().
+            result_class (type): Single result class, e.g. DutchTaxesResult.
+
+        Returns:
+            (ResultTable): Results table.
+
+        """
+        names = [field.name for field in dataclasses.fields(result_class)]
+        rows = [[getattr(result, name) for name in names] for result in results]
+        values = np.array(rows, dtype=np.float64).reshape(-1, len(names))
+        return cls(result_class, np.ascontiguousarray(values.T))
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # Unset slots, e.g. while unpickling, must not look up columns
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.values[self._columns[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key) -> Union[ResultRow, "ResultTable", np.ndarray]:
+        if isinstance(key, str):
+            return self.values[self._columns[key]]
+        if isinstance(key, (int, np.integer)):
+            position = range(len(self))[key]
+            return ResultRow(self, position)
+        # Slices are views, index arrays and masks copy the rows
+        return type(self)(self.result_class, self.values[:, key])
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        return (ResultRow(self, position) for position in range(len(self)))
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.result_class.__name__}, "
+            f"rows={len(self)}, dtype={self.values.dtype})"
+        )
+
+    def set_rows(self, start: int, result) -> None:
+        """
+        Copy batch results to rows starting at a position.
+
+        Args:
+            start (int): First row position.
+            result: Batch calculation results, e.g. DutchTaxesBatchResult.
+
+        """
+        for position, field in enumerate(self.fields):
+            column = np.ravel(getattr(result, field))
+            self.values[position, start : start + column.size] = column
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Get the results as an array with a row per result
+        and a column per field, without copying.
+
+        Returns:
+            (np.ndarray): Transposed view of the table values.
+
+        """
+        return self.values.T
+
+    def to_batch(self):
+        """
+        Get the results as a batch result with columns viewing the table.
+
+        Returns:
+            Batch calculation results, e.g. DutchTaxesBatchResult.
+
+        """
+        return BATCH_RESULTS[self.result_class](
+            *(self.values[position] for position in range(len(self.fields)))
+        )
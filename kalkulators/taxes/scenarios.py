@@ -0,0 +1,257 @@
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+from kalkulators.taxes.nl_calc import (
+    RULING_TYPES,
+    DutchTaxCalculator,
+    DutchTaxesBatchResult,
+    DutchTaxesResult,
+)
+
+# Stored per scenario and salary, net incomes per month and hour
+# are derived from the yearly one on lookup, as calculate() does
+STORED_FIELDS = (
+    "year_net_income",
+    "taxable_income",
+    "payroll_tax",
+    "social_security_tax",
+    "general_tax_credit",
+    "labour_tax_credit",
+    "elder_tax_credit",
+)
+DEFAULT_STOP = 200000
+DEFAULT_STEP = 100
+
+
+class DutchScenarioGrid:
+    """
+    Precomputed DutchTaxCalculator results of every discrete scenario:
+    year, ruling type, old age, social security and holiday allowance,
+    over a grid of yearly gross salaries start + step * i.
+
+    Results are stored in one array with a dimension per option,
+    then salary and stored field, so a lookup is plain indexing.
+    Working hours only matter for the hourly net income,
+    which is derived on lookup, so any working hours are served.
+
+    Lookups are exact: results are the ones calculate() gives.
+    Salaries off the grid and unknown options are calculated in full.
+
+    """
+
+    __slots__ = (
+        "_tax_data",
+        "_start",
+        "_step",
+        "_size",
+        "_years",
+        "_rulings",
+        "values",
+    )
+
+    def __init__(
+        self, tax_data: dict, start: float, step: float, values: np.ndarray, years
+    ):
+        self._tax_data = tax_data
+        self._start = float(start)
+        self._step = float(step)
+        self._size = values.shape[-2]
+        self._years = {year: position for position, year in enumerate(years)}
+        self._rulings = {
+            ruling: position for position, ruling in enumerate(RULING_TYPES)
+        }
+        self.values = values
+
+    @classmethod
+    def build(
+        cls,
+        tax_data: dict,
+        stop: float = DEFAULT_STOP,
+        step: float = DEFAULT_STEP,
+        start: float = 0,
+        years: Optional[Iterable[str]] = None,
+    ) -> "DutchScenarioGrid":
+        """
+        Calculate every scenario over the salary grid in one batch.
+        The array takes 56 bytes per salary and scenario,
+        320 scenarios for 10 years.
+
+        Args:
+            tax_data (dict): Base government tax data.
+            stop (Number): Largest yearly gross salary of the grid.
+            step (Number): Salary grid step.
+            start (Number): Smallest yearly gross salary of the grid.
+            years (Iterable[str]): Calculation years, all of tax data by default.
+
+        Returns:
+            (DutchScenarioGrid): Precomputed results.
+
+        """
+        if step <= 0:
+            raise ValueError("Salary grid step must be positive")
+
+        years = tuple(years or tax_data["years"])
+        size = int((stop - start) // step) + 1
+        salaries = start + step * np.arange(size, dtype=np.float64)
+
+        # Every option gets its own axis, broadcast to the full cross product
+        result = DutchTaxCalculator.calculate_many(
+            salary=salaries,
+            period="year",
+            working_hours=tax_data["defaultWorkingHours"],
+            ruling=np.array(list(RULING_TYPES)).reshape(-1, 1, 1, 1, 1),
+            year=np.array(years).reshape(-1, 1, 1, 1, 1, 1),
+            old_age=np.array([False, True]).reshape(-1, 1, 1, 1),
+            social_security=np.array([False, True]).reshape(-1, 1, 1),
+            holiday_allowance=np.array([False, True]).reshape(-1, 1),
+            tax_data=tax_data,
+        )
+        values = np.stack([getattr(result, field) for field in STORED_FIELDS], axis=-1)
+        return cls(tax_data, start, step, values, years)
+
+    @property
+    def salaries(self) -> np.ndarray:
+        return self._start + self._step * np.arange(self._size, dtype=np.float64)
+
+    def get_position(self, gross_year: float) -> Optional[int]:
+        """
+        Get the grid position of a yearly gross salary.
+
+        Args:
+            gross_year (Number): Yearly gross salary.
+
+        Returns:
+            (int | None): Position, None if the salary is not on the grid.
+
+        """
+        position = round((gross_year - self._start) / self._step)
+        if 0 <= position < self._size:
+            if self._start + self._step * position == gross_year:
+                return position
+        return None
+
+    def lookup(
+        self,
+        gross_year: float,
+        year: str,
+        ruling: str,
+        old_age: bool,
+        social_security: bool,
+        holiday_allowance: bool,
+        working_hours,
+    ) -> Optional[DutchTaxesResult]:
+        """
+        Get precomputed results.
+
+        Args:
+            gross_year (Number): Yearly gross salary.
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+            holiday_allowance (bool): True if holiday allowance is included.
+            working_hours (Number): Weekly working hours.
+
+        Returns:
+            (DutchTaxesResult | None): Calculation results,
+                None if the salary is off the grid or the scenario is unknown.
+
+        """
+        position = self.get_position(gross_year)
+        year_index = self._years.get(year)
+        ruling_index = self._rulings.get(ruling)
+        if position is None or year_index is None or ruling_index is None:
+            return None
+
+        values = self.values[
+            year_index,
+            ruling_index,
+            int(bool(old_age)),
+            int(bool(social_security)),
+            int(bool(holiday_allowance)),
+            position,
+        ].tolist()
+        result = dict(zip(STORED_FIELDS, values))
+        year_net_income = result["year_net_income"]
+        return DutchTaxesResult(
+            month_net_income=math.floor(year_net_income / 12),
+            hour_net_income=math.floor(
+                year_net_income / (self._tax_data["workingWeeks"] * working_hours)
+            ),
+            **result,
+        )
+
+    def calculate(self, calculator: DutchTaxCalculator) -> DutchTaxesResult:
+        """
+        Get calculation results of a calculator from the grid,
+        calculate them in full if they are not precomputed.
+
+        Args:
+            calculator (DutchTaxCalculator): Calculator with user input data.
+
+        Returns:
+            (DutchTaxesResult): Calculation results.
+
+        """
+        key = calculator.get_cache_key()
+
+        result = None
+        if key.tax_data_id == id(self._tax_data):
+            result = self.lookup(
+                calculator.get_gross_year(),
+                key.year,
+                key.ruling,
+                key.old_age,
+                key.social_security,
+                key.holiday_allowance,
+                key.working_hours,
+            )
+        return result if result is not None else calculator.calculate()
+
+    def get_sweep(
+        self,
+        year: str,
+        ruling: str,
+        old_age: bool,
+        social_security: bool,
+        holiday_allowance: bool,
+        working_hours=None,
+    ) -> DutchTaxesBatchResult:
+        """
+        Get results of one scenario for the whole salary grid,
+        stored columns are views of the grid array.
+
+        Args:
+            year (str): Calculation year.
+            ruling (str): Ruling type, one of RULING_TYPES.
+            old_age (bool): True if user is older 65 years, False otherwise.
+            social_security (bool): True if social security is applied.
+            holiday_allowance (bool): True if holiday allowance is included.
+            working_hours (Number): Weekly working hours, default from tax data.
+
+        Returns:
+            (DutchTaxesBatchResult): Calculation results by grid salary.
+
+        Raises:
+            KeyError: If the year or ruling type is not precomputed.
+
+        """
+        working_hours = working_hours or self._tax_data["defaultWorkingHours"]
+        values = self.values[
+            self._years[year],
+            self._rulings[ruling],
+            int(bool(old_age)),
+            int(bool(social_security)),
+            int(bool(holiday_allowance)),
+        ]
+        columns = dict(zip(STORED_FIELDS, np.moveaxis(values, -1, 0)))
+        year_net_income = columns["year_net_income"]
+        return DutchTaxesBatchResult(
+            month_net_income=np.floor(year_net_income / 12),
+            hour_net_income=np.floor(
+                year_net_income / (self._tax_data["workingWeeks"] * working_hours)
+            ),
+            **columns,
+        )
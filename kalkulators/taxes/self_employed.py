@@ -0,0 +1,354 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from kalkulators.taxes.batch import get_amounts_batch, get_group_index, round_cents
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator, CyprusTaxesBatchResult
+from kalkulators.taxes.inverse import solve_gross
+from kalkulators.taxes.nl_calc import DutchTaxCalculator
+
+
+@dataclass
+class DutchSelfEmployedBatchResult:
+    year_net_income: np.ndarray
+    taxable_income: np.ndarray
+    month_net_income: np.ndarray
+    hour_net_income: np.ndarray
+    entrepreneur_deduction: np.ndarray
+    profit_exemption: np.ndarray
+    payroll_tax: np.ndarray
+    social_security_tax: np.ndarray
+    health_contribution: np.ndarray
+    general_tax_credit: np.ndarray
+    labour_tax_credit: np.ndarray
+    elder_tax_credit: np.ndarray
+
+
+def calculate_nl_self_employed(
+    profit,
+    year,
+    old_age,
+    starter,
+    tax_data,
+    working_hours=None,
+    get_amounts=get_amounts_batch,
+) -> DutchSelfEmployedBatchResult:
+    """
+    Batch calculation of a self-employed (ZZP) yearly profit.
+    Every argument is either a column array with a value per row
+    or a single value shared by all rows.
+
+    The self-employed and starter deductions, then the SME profit exemption
+    are taken from the profit, the rest is taxed as a salary without ruling
+    and holiday allowance by DutchTaxCalculator.calculate_many().
+    The income-related health insurance contribution,
+    paid by employers for employees, is added.
+
+    Args:
+        profit (Number | np.ndarray): Yearly revenue minus business costs.
+        year (str | np.ndarray): Calculation year.
+        old_age (bool | np.ndarray): True if user is older 65 years.
+        starter (bool | np.ndarray): True if the starter deduction applies.
+        tax_data (dict): Base government tax data.
+        working_hours (Number): Weekly working hours, default from tax data.
+        get_amounts (Callable): Function calculating compiled brackets
+            amounts for an array of salaries.
+
+    Returns:
+        (DutchSelfEmployedBatchResult): Calculation results by column.
+
+    """
+    working_hours = working_hours or tax_data["defaultWorkingHours"]
+    profit, year, old_age, starter = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(profit, dtype=np.float64)),
+        year,
+        np.asarray(old_age, dtype=bool),
+        np.asarray(starter, dtype=bool),
+    )
+    tables = compile_tax_data(tax_data)
+    years = tax_data["years"]
+    year_index = get_group_index(year, years)
+    deductions = np.array(
+        [
+            [
+                tax_data["selfEmployedDeduction"][year_],
+                tax_data["selfEmployedDeduction"][year_]
+                + tax_data["starterDeduction"][year_],
+            ]
+            for year_ in years
+        ]
+    )
+    exemptions = np.array([tax_data["profitExemption"][year_] for year_ in years])
+
+    # Deductions are limited to the profit, losses are not carried over
+    positive_profit = np.maximum(profit, 0)
+    entrepreneur_deduction = np.minimum(
+        deductions[year_index, starter * 1], positive_profit
+    )
+    profit_exemption = (positive_profit - entrepreneur_deduction) * exemptions[
+        year_index
+    ]
+
+    employed = DutchTaxCalculator.calculate_many(
+        salary=positive_profit - entrepreneur_deduction - profit_exemption,
+        period="year",
+        working_hours=working_hours,
+        ruling="None",
+        year=year,
+        old_age=old_age,
+        holiday_allowance=False,
+        tax_data=tax_data,
+        social_security=True,
+        get_amounts=get_amounts,
+    )
+    taxable_year = employed.taxable_income
+
+    health_contribution = np.zeros(taxable_year.shape)
+    for position, year_ in enumerate(years):
+        rows = year_index == position
+        if not rows.any():
+            continue
+
+        health_contribution[rows] = -1 * get_amounts(
+            tables["healthContribution", year_, "rate"], taxable_year[rows]
+        )
+
+    income_tax = employed.year_net_income - taxable_year
+    # Amounts are in cents, the sum is too, without float noise
+    year_net_income = round_cents(profit + income_tax + health_contribution)
+    month_net_income = np.floor(year_net_income / 12)
+    hour_net_income = np.floor(
+        year_net_income / (tax_data["workingWeeks"] * working_hours)
+    )
+
+    return DutchSelfEmployedBatchResult(
+        year_net_income=year_net_income,
+        taxable_income=taxable_year,
+        month_net_income=month_net_income,
+        hour_net_income=hour_net_income,
+        entrepreneur_deduction=entrepreneur_deduction,
+        profit_exemption=profit_exemption,
+        payroll_tax=employed.payroll_tax,
+        social_security_tax=employed.social_security_tax,
+        health_contribution=health_contribution,
+        general_tax_credit=employed.general_tax_credit,
+        labour_tax_credit=employed.labour_tax_credit,
+        elder_tax_credit=employed.elder_tax_credit,
+    )
+
+
+def get_nl_profit_kinks(year, old_age, starter, tax_data) -> np.ndarray:
+    """
+    Get yearly profits where self-employed net income changes its slope:
+    the deductions and bracket edges of every component,
+    mapped from taxable income back to profit.
+
+    Args:
+        year (str): Calculation year.
+        old_age (bool): True if user is older 65 years, False otherwise.
+        starter (bool): True if the starter deduction applies.
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (np.ndarray): Yearly profits.
+
+    """
+    tables = compile_tax_data(tax_data)
+    bounds = np.concatenate(
+        [
+            DutchTaxCalculator.get_gross_kinks(year, "None", old_age, False, tax_data),
+            tables["healthContribution", year, "rate"].bounds,
+        ]
+    )
+    deduction = tax_data["selfEmployedDeduction"][year]
+    if starter:
+        deduction += tax_data["starterDeduction"][year]
+    exemption = tax_data["profitExemption"][year]
+    return np.concatenate([[deduction], bounds / (1 - exemption) + deduction])
+
+
+def get_nl_break_even_revenue(
+    salaries,
+    costs,
+    year,
+    old_age,
+    starter,
+    tax_data,
+    holiday_allowance=False,
+    ruling="None",
+) -> np.ndarray:
+    """
+    Find minimal yearly revenues, rounded to cents,
+    giving a self-employed at least the net income of employed gross salaries.
+
+    Args:
+        salaries (Number | np.ndarray): Yearly gross salaries.
+        costs (Number): Yearly business costs.
+        year (str): Calculation year.
+        old_age (bool): True if user is older 65 years, False otherwise.
+        starter (bool): True if the starter deduction applies.
+        tax_data (dict): Base government tax data.
+        holiday_allowance (bool): True if salaries include holiday allowance.
+        ruling (str): Ruling type of salaries, one of RULING_TYPES.
+
+    Returns:
+        (np.ndarray): Yearly revenues.
+
+    """
+    employed = DutchTaxCalculator.calculate_many(
+        salary=salaries,
+        period="year",
+        working_hours=tax_data["defaultWorkingHours"],
+        ruling=ruling,
+        year=year,
+        old_age=old_age,
+        holiday_allowance=holiday_allowance,
+        tax_data=tax_data,
+    )
+
+    def get_net(revenue):
+        return calculate_nl_self_employed(
+            profit=revenue - costs,
+            year=year,
+            old_age=old_age,
+            starter=starter,
+            tax_data=tax_data,
+        ).year_net_income
+
+    kinks = get_nl_profit_kinks(year, old_age, starter, tax_data) + costs
+    return solve_gross(get_net, employed.year_net_income, np.append(kinks, costs))
+
+
+def calculate_cy_self_employed(
+    profit,
+    year,
+    tax_data,
+    working_hours=None,
+    get_amounts=get_amounts_batch,
+) -> CyprusTaxesBatchResult:
+    """
+    Batch calculation of a self-employed yearly profit.
+    Every argument is either a column array with a value per row
+    or a single value shared by all rows.
+
+    Self-employed social insurance and NHS contributions are deducted
+    from the profit, the rest is taxed by the payroll tax,
+    the employment income exemptions don't apply.
+
+    Args:
+        profit (Number | np.ndarray): Yearly revenue minus business costs.
+        year (str | np.ndarray): Calculation year.
+        tax_data (dict): Base government tax data.
+        working_hours (Number): Weekly working hours, default from tax data.
+        get_amounts (Callable): Function calculating compiled brackets
+            amounts for an array of salaries.
+
+    Returns:
+        (CyprusTaxesBatchResult): Calculation results by column.
+
+    """
+    working_hours = working_hours or tax_data["defaultWorkingHours"]
+    profit, year = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(profit, dtype=np.float64)), year
+    )
+    tables = compile_tax_data(tax_data)
+    years = tax_data["years"]
+    year_index = get_group_index(year, years)
+
+    taxable_year = np.floor(np.maximum(profit, 0))
+    social_tax = np.zeros(taxable_year.shape)
+    nhs_tax = np.zeros(taxable_year.shape)
+    payroll_tax = np.zeros(taxable_year.shape)
+    for position, year_ in enumerate(years):
+        rows = year_index == position
+        if not rows.any():
+            continue
+
+        social_tax[rows] = -1 * get_amounts(
+            tables["selfEmployedSocialPercent", year_, "rate"], taxable_year[rows]
+        )
+        nhs_tax[rows] = -1 * get_amounts(
+            tables["selfEmployedNhs", year_, "rate"], taxable_year[rows]
+        )
+        taxable_year[rows] += social_tax[rows] + nhs_tax[rows]
+        payroll_tax[rows] = np.floor(
+            -1 * get_amounts(tables["payrollTax", year_, "rate"], taxable_year[rows])
+        )
+    income_tax = np.where(payroll_tax < 0, payroll_tax, 0)
+
+    # Amounts are in cents, the sum is too, without float noise
+    year_net_income = round_cents(profit + social_tax + nhs_tax + income_tax)
+    month_net_income = np.floor(year_net_income / 12)
+    hour_net_income = np.floor(
+        year_net_income / (tax_data["workingWeeks"] * working_hours)
+    )
+
+    return CyprusTaxesBatchResult(
+        year_net_income=year_net_income,
+        taxable_income=taxable_year,
+        month_net_income=month_net_income,
+        hour_net_income=hour_net_income,
+        payroll_tax=income_tax,
+        social_tax=social_tax,
+        nhs_tax=nhs_tax,
+    )
+
+
+def get_cy_profit_kinks(year, tax_data) -> np.ndarray:
+    """
+    Get yearly profits where self-employed net income changes its slope:
+    the social insurance cap and payroll tax bracket edges,
+    mapped from taxable income back to profit.
+
+    Args:
+        year (str): Calculation year.
+        tax_data (dict): Base government tax data.
+
+    Returns:
+        (np.ndarray): Yearly profits.
+
+    """
+    tables = compile_tax_data(tax_data)
+    social = tables["selfEmployedSocialPercent", year, "rate"]
+    nhs = tables["selfEmployedNhs", year, "rate"]
+    bounds = np.array(tables["payrollTax", year, "rate"].bounds)
+
+    cap = social.bounds[0]
+    below_cap = bounds / (1 - social.rates[0] - nhs.rates[0])
+    above_cap = (bounds + social.rates[0] * cap) / (1 - nhs.rates[0])
+    return np.concatenate([[cap], np.where(below_cap <= cap, below_cap, above_cap)])
+
+
+def get_cy_break_even_revenue(salaries, costs, year, tax_data, ruling="0%"):
+    """
+    Find minimal yearly revenues, rounded to cents,
+    giving a self-employed at least the net income of employed gross salaries.
+
+    Args:
+        salaries (Number | np.ndarray): Yearly gross salaries.
+        costs (Number): Yearly business costs.
+        year (str): Calculation year.
+        tax_data (dict): Base government tax data.
+        ruling (str): Ruling type of salaries, one of RULING_TYPES.
+
+    Returns:
+        (np.ndarray): Yearly revenues.
+
+    """
+    employed = CyprusTaxCalculator.calculate_many(
+        salary=salaries,
+        period="year",
+        working_hours=tax_data["defaultWorkingHours"],
+        ruling=ruling,
+        year=year,
+        tax_data=tax_data,
+    )
+
+    def get_net(revenue):
+        return calculate_cy_self_employed(
+            profit=revenue - costs, year=year, tax_data=tax_data
+        ).year_net_income
+
+    kinks = get_cy_profit_kinks(year, tax_data) + costs
+    return solve_gross(get_net, employed.year_net_income, np.append(kinks, costs))
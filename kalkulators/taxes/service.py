@@ -0,0 +1,415 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+from collections import deque
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.metrics import METRICS
+from kalkulators.taxes.payroll import to_columns
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 64 * 2**20
+JSON_CONTENT_TYPE = "application/json"
+TEXT_CONTENT_TYPE = "text/plain; version=0.0.4"
+SCALAR_TYPES = (str, int, float, bool)
+
+
+class RequestError(Exception):
+    """
+    Invalid request, reported to the client with an HTTP status.
+
+    """
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def calculate_rows(rows: List[dict], country: str) -> List[dict]:
+    """
+    Calculate taxes for rows of calculation arguments in one batch.
+    Missing arguments get the payroll runner defaults.
+
+    Args:
+        rows (list[dict]): Calculation arguments by name, e.g. {"salary": 60000}.
+        country (str): Country code: "nl", "cy".
+
+    Returns:
+        (list[dict]): Calculation results by field name, in rows order.
+
+    """
+    if not all(isinstance(row, dict) for row in rows):
+        raise RequestError("Every row must be a JSON object")
+    for row in rows:
+        for name, value in row.items():
+            if value is not None and not isinstance(value, SCALAR_TYPES):
+                raise RequestError(f"Argument {name!r} must be a single value")
+
+    try:
+        result = COUNTRIES[country]["calculator"].calculate_many(
+            tax_data=COUNTRIES[country]["tax_data"], **to_columns(rows, country)
+        )
+    except KeyError as error:
+        raise RequestError(f"Unknown argument value {error.args[0]}") from None
+    except (TypeError, ValueError) as error:
+        raise RequestError(f"Invalid calculation arguments: {error}") from None
+
+    names = [field.name for field in dataclasses.fields(result)]
+    columns = [getattr(result, name).tolist() for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def get_error_response(error: RequestError) -> Tuple[HTTPStatus, str, bytes]:
+    return (
+        error.status,
+        JSON_CONTENT_TYPE,
+        json.dumps({"error": str(error)}).encode(),
+    )
+
+
+class MicroBatcher:
+    """
+    Coalesces single calculations submitted within a short window
+    into one batch calculation.
+    A batch is calculated when the window started by its first row ends,
+    or as soon as it has max_batch rows.
+
+    """
+
+    def __init__(
+        self,
+        country: str,
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self._country = country
+        self._window = window
+        self._max_batch = max_batch
+        self._rows: List[dict] = []
+        self._futures: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def calculate(self, row: dict) -> dict:
+        """
+        Calculate one row as a part of the next batch.
+
+        Args:
+            row (dict): Calculation arguments by name.
+
+        Returns:
+            (dict): Calculation results by field name.
+
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._rows.append(row)
+        self._futures.append(future)
+
+        if len(self._rows) >= self._max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """
+        Calculate pending rows now.
+
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, futures = self._rows, self._futures
+        self._rows, self._futures = [], []
+        if not rows:
+            return
+
+        if METRICS.enabled:
+            METRICS.count(f"service.{self._country}.batches")
+            METRICS.count(f"service.{self._country}.rows", len(rows))
+        self._calculate(rows, futures)
+
+    def _calculate(self, rows: List[dict], futures: List[asyncio.Future]) -> None:
+        # Runs in a timer callback, every error must reach the futures
+        try:
+            results = calculate_rows(rows, self._country)
+        except Exception as error:
+            if len(rows) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(error)
+                return
+            # An invalid row fails the whole batch, split it to isolate the row
+            middle = len(rows) // 2
+            self._calculate(rows[:middle], futures[:middle])
+            self._calculate(rows[middle:], futures[middle:])
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class CalculationService:
+    """
+    JSON calculation endpoints:
+
+    - POST /{country}/calculate: one calculation, arguments as a JSON object,
+      coalesced with concurrent requests into batches.
+    - POST /{country}/bulk: {"rows": [...]}, calculated as one batch.
+    - GET /health and GET /metrics, the latter in the Prometheus text format.
+
+    """
+
+    def __init__(
+        self, window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH
+    ):
+        self._batchers = {
+            country: MicroBatcher(country, window, max_batch) for country in COUNTRIES
+        }
+
+    async def handle(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[HTTPStatus, str, bytes]:
+        """
+        Handle one request.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Request path.
+            body (bytes): Request body.
+
+        Returns:
+            (tuple): HTTP status, content type and response body.
+
+        """
+        try:
+            payload = await self._route(method, path.split("?", 1)[0], body)
+        except RequestError as error:
+            return get_error_response(error)
+        except Exception as error:
+            # Unexpected errors must not stop answering the connection
+            if METRICS.enabled:
+                METRICS.count("service.errors")
+            return get_error_response(
+                RequestError(
+                    f"Calculation failed: {type(error).__name__}",
+                    HTTPStatus.INTERNAL_SERVER_ERROR,
+                )
+            )
+
+        if isinstance(payload, str):
+            return HTTPStatus.OK, TEXT_CONTENT_TYPE, payload.encode()
+        return HTTPStatus.OK, JSON_CONTENT_TYPE, json.dumps(payload).encode()
+
+    async def _route(self, method: str, path: str, body: bytes):
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/metrics":
+            return METRICS.to_prometheus()
+
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] not in COUNTRIES:
+            raise RequestError(f"Unknown path {path!r}", HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise RequestError(
+                f"Method {method} is not allowed", HTTPStatus.METHOD_NOT_ALLOWED
+            )
+
+        country, action = parts
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError("Request body must be JSON") from None
+
+        if action == "calculate":
+            if not isinstance(data, dict):
+                raise RequestError("Request body must be a JSON object")
+            return await self._batchers[country].calculate(data)
+        if action == "bulk":
+            rows = data.get("rows") if isinstance(data, dict) else None
+            if not isinstance(rows, list):
+                raise RequestError('Request body must be {"rows": [...]}')
+            return {"results": calculate_rows(rows, country) if rows else []}
+        raise RequestError(f"Unknown path {path!r}", HTTPStatus.NOT_FOUND)
+
+
+class HTTPProtocol(asyncio.Protocol):
+    """
+    Minimal HTTP/1.1 server connection with keep-alive and pipelining.
+    Pipelined requests are handled concurrently, so they can share batches,
+    and answered in order.
+
+    """
+
+    def __init__(self, service: CalculationService):
+        self._service = service
+        self._transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray()
+        self._responses: deque = deque()
+        self._writer: Optional[asyncio.Task] = None
+        self._failed = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self._transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._transport = None
+        for response, _ in self._responses:
+            if isinstance(response, asyncio.Future):
+                response.cancel()
+        if self._writer is not None:
+            self._writer.cancel()
+
+    def data_received(self, data: bytes) -> None:
+        if self._failed:
+            return
+
+        self._buffer += data
+        try:
+            while True:
+                request = self._parse_request()
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                response = asyncio.ensure_future(
+                    self._service.handle(method, path, body)
+                )
+                self._responses.append((response, keep_alive))
+        except RequestError as error:
+            # The connection can't be parsed any further, answer and close it
+            self._failed = True
+            self._buffer.clear()
+            self._responses.append((error, False))
+
+        if self._responses and (self._writer is None or self._writer.done()):
+            self._writer = asyncio.ensure_future(self._write_responses())
+
+    def _parse_request(self) -> Optional[Tuple[str, str, bytes, bool]]:
+        end = self._buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._buffer) > MAX_HEADER_SIZE:
+                raise RequestError("Headers too large")
+            return None
+
+        lines = self._buffer[:end].decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ")
+        except ValueError:
+            raise RequestError("Malformed request line") from None
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise RequestError("Malformed Content-Length header") from None
+        if length < 0 or length > MAX_BODY_SIZE:
+            raise RequestError("Invalid request body size")
+        if len(self._buffer) < end + 4 + length:
+            return None
+
+        body = bytes(self._buffer[end + 4 : end + 4 + length])
+        del self._buffer[: end + 4 + length]
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+        return method, path, body, keep_alive
+
+    async def _write_responses(self) -> None:
+        while self._responses and self._transport is not None:
+            response, keep_alive = self._responses.popleft()
+            if isinstance(response, RequestError):
+                response = get_error_response(response)
+            else:
+                response = await response
+            if self._transport is None:
+                return
+
+            self._write(*response, keep_alive=keep_alive)
+            if not keep_alive:
+                return
+
+    def _write(
+        self, status: HTTPStatus, content_type: str, payload: bytes, keep_alive: bool
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        self._transport.write(head.encode() + payload)
+        if not keep_alive:
+            self._transport.close()
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    window: float = DEFAULT_WINDOW,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> asyncio.AbstractServer:
+    """
+    Start the calculation service.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 for any free port.
+        window (float): Seconds to wait for more requests before a batch.
+        max_batch (int): Maximum number of rows in a batch.
+
+    Returns:
+        (asyncio.AbstractServer): Running server.
+
+    """
+    service = CalculationService(window, max_batch)
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: HTTPProtocol(service), host, port)
+
+
+async def run(host: str, port: int, window: float, max_batch: int) -> None:
+    server = await serve(host, port, window, max_batch)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(description="Tax calculation HTTP service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=DEFAULT_WINDOW,
+        help="seconds to wait for more requests before calculating a batch",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=DEFAULT_MAX_BATCH,
+        help="maximum number of rows calculated in one batch",
+    )
+    args = parser.parse_args(args)
+
+    try:
+        asyncio.run(run(args.host, args.port, args.window, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import Executor
+from threading import Event, Lock
+from typing import Dict, Optional
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calculate() calls
+    of DutchTaxCalculator and CyprusTaxCalculator:
+    while a calculation is in flight, callers with the same cache key
+    wait for it and share its result instead of calculating again.
+    Results are shared between callers and must not be modified.
+
+    Works for threads with calculate() and for asyncio with
+    calculate_async(), which runs calculations in an executor.
+
+    """
+
+    __slots__ = ("_lock", "_flights", "_futures", "_calls", "_coalesced")
+
+    def __init__(self):
+        self._lock = Lock()
+        self._flights: Dict[tuple, _Flight] = {}
+        self._futures: Dict[tuple, asyncio.Future] = {}
+        self._calls = 0
+        self._coalesced = 0
+
+    def calculate(self, calculator):
+        """
+        Calculate results, or wait for an identical calculation in flight.
+
+        Args:
+            calculator: Calculator with user input data.
+
+        Returns:
+            Calculation results.
+
+        """
+        key = calculator.get_cache_key()
+
+        with self._lock:
+            self._calls += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if leader:
+            try:
+                flight.result = calculator.calculate()
+            except BaseException as error:
+                flight.error = error
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.event.set()
+            return flight.result
+
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    async def calculate_async(self, calculator, executor: Optional[Executor] = None):
+        """
+        Calculate results in an executor, or wait for an identical calculation
+        in flight in this event loop or in other threads.
+
+        Args:
+            calculator: Calculator with user input data.
+            executor (Executor): Executor to calculate in, the loop default one
+                if not set.
+
+        Returns:
+            Calculation results.
+
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), calculator.get_cache_key())
+
+        future = self._futures.get(key)
+        if future is None:
+            # Counted by calculate() in the executor
+            future = loop.run_in_executor(executor, self.calculate, calculator)
+            self._futures[key] = future
+            future.add_done_callback(lambda _: self._futures.pop(key, None))
+        else:
+            with self._lock:
+                self._calls += 1
+                self._coalesced += 1
+
+        # One cancelled caller must not cancel the calculation of others
+        return await asyncio.shield(future)
+
+    def get_stats(self) -> dict:
+        """
+        Get coalescing metrics.
+
+        Returns:
+            (dict): Calls, coalesced calls, calculations and calculations in flight.
+
+        """
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "calculated": self._calls - self._coalesced,
+                "in_flight": len(self._flights),
+            }
@@ -0,0 +1,279 @@
+import marshal
+import mmap
+import struct
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from kalkulators.taxes.brackets import (
+    CompiledBrackets,
+    compile_brackets,
+    get_brackets_digest,
+    get_rate_types,
+)
+from kalkulators.taxes.datastore import (
+    ARTIFACT_VERSION,
+    DATA_MODULES,
+    HEADER,
+    get_artifact_path,
+    get_changed_stat,
+    get_source_hash,
+    get_source_stat,
+    is_source_current,
+    load_tax_data,
+    write_artifact,
+)
+
+TABLES_ARTIFACT = "tax_tables"
+
+
+def build_tables() -> bytes:
+    """
+    Build the file of compiled bracket arrays
+    for every table, year and rate type of every country.
+    Each table is stored as float64 arrays: bounds, starts, offsets,
+    rates and percents, the same as CompiledBrackets fields,
+    and its index entry keeps positions of the integer values.
+    Identical tables share one entry.
+
+    Returns:
+        (bytes): Tables file content.
+
+    """
+    values, index, entries = array("d"), {}, {}
+    for country in DATA_MODULES:
+        tax_data = load_tax_data(country)
+        for name, value in tax_data.items():
+            if not isinstance(value, Mapping):
+                continue
+            for year, brackets in value.items():
+                for rate_type in sorted(get_rate_types(brackets)):
+                    compiled = compile_brackets(brackets, rate_type)
+                    # Identical tables of any year and country are stored once
+                    digest = get_brackets_digest(compiled)
+                    if digest in entries:
+                        index[country, year, name, rate_type] = entries[digest]
+                        continue
+
+                    table = (
+                        *compiled.bounds,
+                        *compiled.starts,
+                        *compiled.offsets,
+                        *compiled.rates,
+                        *compiled.percents,
+                    )
+                    # Integer amounts are read back as integers, not floats
+                    integers = tuple(
+                        position
+                        for position, value in enumerate(table)
+                        if type(value) is int
+                    )
+                    entries[digest] = index[country, year, name, rate_type] = (
+                        len(values),
+                        len(compiled.bounds),
+                        integers,
+                    )
+                    values.extend(table)
+
+    header = {
+        "version": ARTIFACT_VERSION,
+        "source_hashes": {
+            country: get_source_hash(country) for country in DATA_MODULES
+        },
+        "source_stats": {
+            country: get_source_stat(country) for country in DATA_MODULES
+        },
+        "index": index,
+    }
+    return pack_tables(header, values)
+
+
+def pack_tables(header: dict, values: Union[array, memoryview]) -> bytes:
+    """
+    Join the tables file header and float64 values.
+
+    Args:
+        header (dict): Tables file header.
+        values (array | memoryview): Float64 values.
+
+    Returns:
+        (bytes): Tables file content.
+
+    """
+    header = marshal.dumps(header)
+    prefix = HEADER.pack(ARTIFACT_VERSION, len(header)) + header
+    # Align arrays to their item size
+    padding = bytes(-len(prefix) % values.itemsize)
+    return prefix + padding + values.tobytes()
+
+
+def parse_tables(content: Union[bytes, mmap.mmap]) -> Tuple[dict, memoryview]:
+    """
+    Split the tables file into its header and float64 values, without copying.
+
+    Args:
+        content (bytes | mmap): Tables file content.
+
+    Returns:
+        (tuple): Header and values.
+
+    """
+    version, length = HEADER.unpack_from(content)
+    if version != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported tax tables version: {version}")
+    start = HEADER.size + length
+    header = marshal.loads(content[HEADER.size : start])
+    start += -start % 8
+    return header, memoryview(content)[start:].cast("d")
+
+
+class YearTables(Mapping):
+    """
+    Compiled brackets of one year by (table, rate type),
+    materialized from the mapped values on first access.
+    Batch lookups read arrays, read-only views of the mapped values
+    shared by every process mapping the file.
+    Only scalar lookups of calculate() get a copy: tuples of the same numbers
+    compile_brackets gives, as they are several times faster on tuples.
+
+    """
+
+    __slots__ = ("_values", "_index", "_loaded")
+
+    def __init__(self, values: np.ndarray, index: Dict[Tuple[str, str], tuple]):
+        self._values = values
+        self._index = index
+        self._loaded = {}
+
+    def __getitem__(self, key: Tuple[str, str]) -> CompiledBrackets:
+        compiled = self._loaded.get(key)
+        if compiled is None:
+            offset, size, integers = self._index[key]
+            table = self._values[offset : offset + 5 * size + 4]
+            values = table.tolist()
+            for position in integers:
+                values[position] = int(values[position])
+
+            fields, arrays, start = [], [], 0
+            for length in (size, size + 1, size + 1, size + 1, size + 1):
+                fields.append(tuple(values[start : start + length]))
+                arrays.append(table[start : start + length])
+                start += length
+            bounds, starts, offsets, rates, percents = fields
+            compiled = self._loaded[key] = CompiledBrackets(
+                bounds=bounds,
+                starts=starts,
+                offsets=offsets,
+                rates=rates,
+                percents=tuple(bool(percent) for percent in percents),
+                arrays=tuple(arrays),
+            )
+        return compiled
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class MappedTables(Mapping):
+    """
+    Compiled bracket tables of every country, by country and then by year,
+    backed by one memory-mapped file, so loading reads only its header
+    and only the tables in use are materialized.
+
+    """
+
+    __slots__ = ("_file", "_values", "_countries", "source_hashes", "source_stats")
+
+    def __init__(self, content: Union[bytes, mmap.mmap]):
+        self._file = content
+        header, values = parse_tables(content)
+        # Read-only, as the file is mapped for reading or is bytes
+        self._values = np.frombuffer(values, dtype=np.float64)
+        self.source_hashes = header["source_hashes"]
+        self.source_stats = header["source_stats"]
+
+        index = {}
+        for (country, year, name, rate_type), entry in header["index"].items():
+            years = index.setdefault(country, {})
+            years.setdefault(year, {})[name, rate_type] = entry
+        self._countries = {
+            country: {
+                year: YearTables(self._values, tables)
+                for year, tables in years.items()
+            }
+            for country, years in index.items()
+        }
+
+    def __getitem__(self, country: str) -> Dict[str, YearTables]:
+        return self._countries[country]
+
+    def __iter__(self):
+        return iter(self._countries)
+
+    def __len__(self) -> int:
+        return len(self._countries)
+
+
+def read_tables() -> Optional[MappedTables]:
+    """
+    Memory-map the tables file, if it exists and is up to date.
+    A file of sources with a new stat and the same content
+    is rewritten with the new stats.
+
+    Returns:
+        (MappedTables | None): Mapped tables, None if missing or stale.
+
+    """
+    try:
+        with open(get_artifact_path(TABLES_ARTIFACT), "rb") as file:
+            tables = MappedTables(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+    except (OSError, ValueError, EOFError, TypeError, KeyError, struct.error):
+        return None
+
+    changed = {}
+    for country in DATA_MODULES:
+        source_stat = tables.source_stats.get(country, ())
+        if not is_source_current(
+            country, source_stat, tables.source_hashes.get(country)
+        ):
+            return None
+        changed_stat = get_changed_stat(country, source_stat)
+        if changed_stat is not None:
+            changed[country] = changed_stat
+
+    if changed:
+        header, values = parse_tables(tables._file)
+        header["source_stats"].update(changed)
+        write_artifact(TABLES_ARTIFACT, pack_tables(header, values))
+    return tables
+
+
+_mapped_tables: Optional[MappedTables] = None
+
+
+def load_tables() -> MappedTables:
+    """
+    Load compiled bracket tables of every country from the shared file.
+    A missing or stale file is rebuilt from the tax data first,
+    it is kept in memory if it can't be written.
+
+    Returns:
+        (MappedTables): Tables by country and year, shared by all callers.
+
+    """
+    global _mapped_tables
+    if _mapped_tables is None:
+        tables = read_tables()
+        if tables is None:
+            content = build_tables()
+            written = write_artifact(TABLES_ARTIFACT, content)
+            tables = (written and read_tables()) or MappedTables(content)
+        _mapped_tables = tables
+    return _mapped_tables
@@ -1,20 +1,38 @@
+from types import SimpleNamespace
+
+import numpy as np
 import pandas as pd  # need this only because of the table shown
 import streamlit as st
 
+from kalkulators.taxes.batch import get_amounts_by_segments
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.cache import CalculationCache
 from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.datastore import load_tax_data
+from kalkulators.taxes.graph import DutchCalculationGraph
 from kalkulators.taxes.nl_calc import (
-    DutchTaxesResult,
     DutchTaxCalculator,
+    DutchTaxesResult,
     RULING_TYPES,
 )
-from kalkulators.taxes.nl_data import NL_DATA
+from kalkulators.taxes.self_employed import (
+    calculate_nl_self_employed,
+    get_nl_break_even_revenue,
+)
 
+NL_DATA = load_tax_data("nl")
 RULING_URL = (
     "https://belastingdienst.nl/wps/wcm/connect/en/individuals/content/"
     "coming-to-work-in-the-netherlands-30-percent-facility"
 )
 DEFAULT_SALARY = 60000.00
 DEFAULT_WORKING_HOURS = 40
+DEFAULT_REVENUE = 80000.00
+DEFAULT_COSTS = 5000.00
+CHART_STOP = 200000
+CHART_STEP = 500
+RESULTS_CACHE_SIZE = 4096
+TABLES_CACHE_SIZE = 1024
 NO_TAXES_MESSAGE = (
     "🎉 You are not paying any taxes because you are not earning any money"
 )
@@ -45,6 +63,9 @@ DISCLAIMER = (
     "Consult a tax advisor for more information."
 )
 RULING_TIP = f"Dutch tax benefit when 30% of your salary is not taxed. [More info about the 30% ruling]({RULING_URL})"
+STARTER_TIP = """Extra deduction in 3 of the first 5 years of your business.
+[More info about the entrepreneur deductions](https://business.gov.nl/regulation/entrepreneurs-deduction/)
+"""
 HOLIDAY_ALLOWANCE_TIP = """Your contract describes whether it's included in the salary. 
 [More info about the holiday allowance](https://business.gov.nl/regulation/holiday-allowance/)
 """
@@ -60,7 +81,7 @@ There are multiple conditions on the tax benefit depending on what type you choo
 """
 
 
-def show_metrics(t: DutchTaxesResult) -> None:
+def show_metrics(t: DutchTaxesResult, key_prefix: str = "") -> None:
     def display_metric(block, title, value, key):
         delta = (value - st.session_state[key]) if key in st.session_state else 0
         display_value = f"{value:,.2f} €"
@@ -75,31 +96,123 @@ def show_metrics(t: DutchTaxesResult) -> None:
 
     st.markdown("#### Total Net Income")
     main_col1, main_col2, main_col3 = st.columns(3)
-    display_metric(main_col1, "Per Year", t.year_net_income, "year_prev_net")
-    display_metric(main_col2, "Per Month", t.month_net_income, "month_prev_net")
-    display_metric(main_col3, "Per Hour", t.hour_net_income, "hour_prev_net")
+    display_metric(
+        main_col1, "Per Year", t.year_net_income, f"{key_prefix}year_prev_net"
+    )
+    display_metric(
+        main_col2, "Per Month", t.month_net_income, f"{key_prefix}month_prev_net"
+    )
+    display_metric(
+        main_col3, "Per Hour", t.hour_net_income, f"{key_prefix}hour_prev_net"
+    )
+
+
+@st.cache_resource
+def get_calculation_cache() -> CalculationCache:
+    # Shared by all sessions: tax data is compiled once per process
+    compile_tax_data(NL_DATA)
+    return CalculationCache(maxsize=RESULTS_CACHE_SIZE)
+
+
+def get_session_graph() -> DutchCalculationGraph:
+    # Per session: a rerun only recomputes stages of the changed widgets
+    if "nl_graph" not in st.session_state:
+        st.session_state["nl_graph"] = DutchCalculationGraph(NL_DATA)
+    return st.session_state["nl_graph"]
+
+
+@st.cache_data(max_entries=TABLES_CACHE_SIZE)
+def get_table(values: tuple) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"EUR / YEAR": [f"{value:,.2f}" for value in values]},
+        index=[
+            "Taxable Income",
+            "Payroll Tax",
+            "Social Security Tax",
+            "General Tax Credit",
+            "Labour Tax Credit",
+            "Elder Tax Credit",
+        ],
+    )
 
 
 def show_table(t: DutchTaxesResult) -> None:
-    data = pd.DataFrame(
-        {
-            "EUR / YEAR": [
+    st.table(
+        get_table(
+            (
                 t.taxable_income,
                 t.payroll_tax,
                 t.social_security_tax,
                 t.general_tax_credit,
                 t.labour_tax_credit,
-            ],
-        },
+                t.elder_tax_credit,
+            )
+        )
+    )
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE)
+def get_self_employed_result(profit, year, old_age, starter, hours) -> SimpleNamespace:
+    result = calculate_nl_self_employed(
+        profit=profit,
+        year=year,
+        old_age=old_age,
+        starter=starter,
+        tax_data=NL_DATA,
+        working_hours=hours,
+    )
+    return SimpleNamespace(
+        **{name: column[0].item() for name, column in vars(result).items()}
+    )
+
+
+@st.cache_data(max_entries=TABLES_CACHE_SIZE)
+def get_self_employed_table(values: tuple) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"EUR / YEAR": [f"{value:,.2f}" for value in values]},
         index=[
+            "Entrepreneur Deduction",
+            "SME Profit Exemption",
             "Taxable Income",
             "Payroll Tax",
             "Social Security Tax",
+            "Health Insurance Contribution",
             "General Tax Credit",
             "Labour Tax Credit",
+            "Elder Tax Credit",
         ],
     )
-    st.table(data.style.format("{:,.2f}"))
+
+
+@st.cache_data(max_entries=TABLES_CACHE_SIZE)
+def get_break_even_chart(
+    costs, year, old_age, starter, holiday_allowance
+) -> pd.DataFrame:
+    # Both incomes of the whole grid are calculated in one batch each
+    amounts = np.arange(0, CHART_STOP + CHART_STEP, CHART_STEP, dtype=np.float64)
+    employed = DutchTaxCalculator.calculate_sweep(
+        salaries=amounts,
+        year=year,
+        ruling="None",
+        old_age=old_age,
+        holiday_allowance=holiday_allowance,
+        tax_data=NL_DATA,
+    )
+    self_employed = calculate_nl_self_employed(
+        profit=amounts - costs,
+        year=year,
+        old_age=old_age,
+        starter=starter,
+        tax_data=NL_DATA,
+        get_amounts=get_amounts_by_segments,
+    )
+    return pd.DataFrame(
+        {
+            "Employed": employed.year_net_income,
+            "Self-employed": self_employed.year_net_income,
+        },
+        index=pd.Index(amounts, name="Gross salary or revenue, EUR / YEAR"),
+    )
 
 
 st.set_page_config(page_title="Netherlands: Salary", page_icon="🇳🇱")
@@ -149,7 +262,8 @@ with tab_employed:
         else:
             ruling_type = "None"
 
-    calc = DutchTaxCalculator(
+    graph = get_session_graph()
+    graph.update(
         salary=salary,
         old_age=old_age,
         year=year,
@@ -158,10 +272,8 @@ with tab_employed:
         working_hours=hours,
         social_security=True,
         holiday_allowance=holiday_allowance_included,
-        tax_data=NL_DATA,
-        working_periods=WORKING_PERIODS,
     )
-    tax_results = calc.calculate()
+    tax_results = get_calculation_cache().calculate(graph)
     show_metrics(tax_results)
     if tax_results.year_net_income > 0:
         show_table(tax_results)
@@ -170,13 +282,92 @@ with tab_employed:
         st.balloons()
 
 with tab_semployed:
-    st.markdown(
-        """
-    ### Coming soon...
-    
-    Meanwhile, you can watch the following relaxing video:"""
+    left_col, right_col = st.columns(2)
+    revenue = left_col.number_input(
+        "Yearly revenue in EUR",
+        value=DEFAULT_REVENUE,
+        min_value=0.0,
+        step=1000.0,
+    )
+    costs = left_col.number_input(
+        "Yearly business costs in EUR",
+        value=DEFAULT_COSTS,
+        min_value=0.0,
+        step=500.0,
+    )
+    starter = right_col.checkbox("Starter deduction", help=STARTER_TIP)
+
+    with st.expander("Advanced options"):
+        first_col, second_col = st.columns(2)
+        se_year = first_col.selectbox(
+            "Year", list(reversed(NL_DATA["years"])), key="se_year"
+        )
+        se_hours = second_col.number_input(
+            "Weekly working hours",
+            value=NL_DATA["defaultWorkingHours"],
+            min_value=1,
+            max_value=168,
+            key="se_hours",
+        )
+        se_old_age = st.checkbox("66 years or older", value=False, key="se_old_age")
+
+    se_results = get_self_employed_result(
+        revenue - costs, se_year, se_old_age, starter, se_hours
+    )
+    show_metrics(se_results, key_prefix="se_")
+    if se_results.year_net_income > 0:
+        st.table(
+            get_self_employed_table(
+                (
+                    se_results.entrepreneur_deduction,
+                    se_results.profit_exemption,
+                    se_results.taxable_income,
+                    se_results.payroll_tax,
+                    se_results.social_security_tax,
+                    se_results.health_contribution,
+                    se_results.general_tax_credit,
+                    se_results.labour_tax_credit,
+                    se_results.elder_tax_credit,
+                )
+            )
+        )
+
+    st.markdown("#### Employed vs Self-employed")
+    left_col, right_col = st.columns(2)
+    offer = left_col.number_input(
+        "Employed salary to compare in EUR",
+        value=DEFAULT_SALARY,
+        min_value=0.0,
+        step=1000.0,
+    )
+    offer_allowance = right_col.checkbox(
+        "Holiday allowance included",
+        value=True,
+        help=HOLIDAY_ALLOWANCE_TIP,
+        key="se_holiday_allowance",
+    )
+    break_even = get_nl_break_even_revenue(
+        salaries=[offer],
+        costs=costs,
+        year=se_year,
+        old_age=se_old_age,
+        starter=starter,
+        tax_data=NL_DATA,
+        holiday_allowance=offer_allowance,
+    )[0]
+    first_col, second_col = st.columns(2)
+    first_col.metric("Break-even Revenue per Year", f"{break_even:,.2f} €")
+    second_col.metric(
+        "Break-even Rate per Hour",
+        f"{break_even / (NL_DATA['workingWeeks'] * se_hours):,.2f} €",
+    )
+    st.line_chart(
+        get_break_even_chart(costs, se_year, se_old_age, starter, offer_allowance)
+    )
+    st.caption(
+        "Net income per year by gross salary or revenue, "
+        "the same net income is earned where the lines cross"
     )
-    st.video("https://www.youtube.com/watch?v=3FMyeGw6Tn0")
 
 with st.expander(EXPLANATIONS_TITLE):
     st.markdown(EXPLANATIONS)
@@ -1,17 +1,35 @@
+from types import SimpleNamespace
+
+import numpy as np
 import pandas as pd  # need this only because of the table shown
 import streamlit as st
 
+from kalkulators.taxes.batch import get_amounts_by_segments
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.cache import CalculationCache
 from kalkulators.taxes.common import WORKING_PERIODS
 from kalkulators.taxes.cy_calc import (
     CyprusTaxesResult,
     CyprusTaxCalculator,
 )
-from kalkulators.taxes.cy_data import CY_DATA, RULING_TYPES
+from kalkulators.taxes.cy_data import RULING_TYPES
+from kalkulators.taxes.datastore import load_tax_data
+from kalkulators.taxes.self_employed import (
+    calculate_cy_self_employed,
+    get_cy_break_even_revenue,
+)
 
+CY_DATA = load_tax_data("cy")
 RULING_URL = "https://www.taxathand.com/article/26684/Cyprus/2022/Enhanced-tax-exemptions-for-employment-income-introduced-to-attract-foreign-talent-"
 DEFAULT_SALARY = 36000.00
 RULING_50_THRESHOLD = 55000.00
 DEFAULT_WORKING_HOURS = 40
+DEFAULT_REVENUE = 50000.00
+DEFAULT_COSTS = 3000.00
+CHART_STOP = 150000
+CHART_STEP = 500
+RESULTS_CACHE_SIZE = 4096
+TABLES_CACHE_SIZE = 1024
 NO_TAXES_MESSAGE = (
     "🎉 You are not paying any taxes because you are not earning any money"
 )
@@ -57,7 +75,7 @@ DISCLAIMER = (
 RULING_TIP = f"Cyprus tax benefit when 20% (or 50%) of your salary is not taxed. [More info about the exemption]({RULING_URL})"
 
 
-def show_metrics(t: CyprusTaxesResult) -> None:
+def show_metrics(t: CyprusTaxesResult, key_prefix: str = "") -> None:
     def display_metric(block, title, value, key):
         delta = (value - st.session_state[key]) if key in st.session_state else 0
         display_value = f"{value:,.2f} €"
@@ -72,16 +90,28 @@ def show_metrics(t: CyprusTaxesResult) -> None:
 
     st.markdown("#### Total Net Income")
     main_col1, main_col2, main_col3 = st.columns(3)
-    display_metric(main_col1, "Per Year", t.year_net_income, "year_prev_net")
-    display_metric(main_col2, "Per Month", t.month_net_income, "month_prev_net")
-    display_metric(main_col3, "Per Hour", t.hour_net_income, "hour_prev_net")
+    display_metric(
+        main_col1, "Per Year", t.year_net_income, f"{key_prefix}year_prev_net"
+    )
+    display_metric(
+        main_col2, "Per Month", t.month_net_income, f"{key_prefix}month_prev_net"
+    )
+    display_metric(
+        main_col3, "Per Hour", t.hour_net_income, f"{key_prefix}hour_prev_net"
+    )
 
 
-def show_table(t: CyprusTaxesResult) -> None:
-    data = pd.DataFrame(
-        {
-            "EUR / YEAR": [t.social_tax, t.nhs_tax, t.taxable_income, t.payroll_tax],
-        },
+@st.cache_resource
+def get_calculation_cache() -> CalculationCache:
+    # Shared by all sessions: tax data is compiled once per process
+    compile_tax_data(CY_DATA)
+    return CalculationCache(maxsize=RESULTS_CACHE_SIZE)
+
+
+@st.cache_data(max_entries=TABLES_CACHE_SIZE)
+def get_table(values: tuple) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"EUR / YEAR": [f"{value:,.2f}" for value in values]},
         index=[
             "Social Insurance Tax",
             "National Health Services Tax",
@@ -89,7 +119,42 @@ def show_table(t: CyprusTaxesResult) -> None:
             "Payroll Tax",
         ],
     )
-    st.table(data.style.format("{:,.2f}"))
+
+
+def show_table(t: CyprusTaxesResult) -> None:
+    st.table(get_table((t.social_tax, t.nhs_tax, t.taxable_income, t.payroll_tax)))
+
+
+@st.cache_data(max_entries=RESULTS_CACHE_SIZE)
+def get_self_employed_result(profit, year, hours) -> SimpleNamespace:
+    result = calculate_cy_self_employed(
+        profit=profit, year=year, tax_data=CY_DATA, working_hours=hours
+    )
+    return SimpleNamespace(
+        **{name: column[0].item() for name, column in vars(result).items()}
+    )
+
+
+@st.cache_data(max_entries=TABLES_CACHE_SIZE)
+def get_break_even_chart(costs, year, ruling) -> pd.DataFrame:
+    # Both incomes of the whole grid are calculated in one batch each
+    amounts = np.arange(0, CHART_STOP + CHART_STEP, CHART_STEP, dtype=np.float64)
+    employed = CyprusTaxCalculator.calculate_sweep(
+        salaries=amounts, year=year, ruling=ruling, tax_data=CY_DATA
+    )
+    self_employed = calculate_cy_self_employed(
+        profit=amounts - costs,
+        year=year,
+        tax_data=CY_DATA,
+        get_amounts=get_amounts_by_segments,
+    )
+    return pd.DataFrame(
+        {
+            "Employed": employed.year_net_income,
+            "Self-employed": self_employed.year_net_income,
+        },
+        index=pd.Index(amounts, name="Gross salary or revenue, EUR / YEAR"),
+    )
 
 
 st.set_page_config(page_title="Cyprus: Salary", page_icon="🇨🇾")
@@ -137,7 +202,7 @@ with tab_employed:
         tax_data=CY_DATA,
         working_periods=WORKING_PERIODS,
     )
-    tax_results = calc.calculate()
+    tax_results = get_calculation_cache().calculate(calc)
     show_metrics(tax_results)
     if tax_results.year_net_income > 0:
         show_table(tax_results)
@@ -146,13 +211,68 @@ with tab_employed:
         st.balloons()
 
 with tab_semployed:
-    st.markdown(
-        """
-    ### Coming soon...
-    
-    Meanwhile, you can watch the following relaxing video:"""
+    left_col, right_col = st.columns(2)
+    revenue = left_col.number_input(
+        "Yearly revenue in EUR",
+        value=DEFAULT_REVENUE,
+        min_value=0.0,
+        step=1000.0,
+    )
+    costs = right_col.number_input(
+        "Yearly business costs in EUR",
+        value=DEFAULT_COSTS,
+        min_value=0.0,
+        step=500.0,
+    )
+
+    with st.expander("Advanced options"):
+        first_col, second_col = st.columns(2)
+        se_year = first_col.selectbox(
+            "Year", list(reversed(CY_DATA["years"])), key="se_year"
+        )
+        se_hours = second_col.number_input(
+            "Weekly working hours",
+            value=CY_DATA["defaultWorkingHours"],
+            min_value=1,
+            max_value=168,
+            key="se_hours",
+        )
+
+    se_results = get_self_employed_result(revenue - costs, se_year, se_hours)
+    show_metrics(se_results, key_prefix="se_")
+    if se_results.year_net_income > 0:
+        show_table(se_results)
+
+    st.markdown("#### Employed vs Self-employed")
+    left_col, right_col = st.columns(2)
+    offer = left_col.number_input(
+        "Employed salary to compare in EUR",
+        value=DEFAULT_SALARY,
+        min_value=0.0,
+        step=1000.0,
+    )
+    offer_types = RULING_TYPES if offer >= RULING_50_THRESHOLD else RULING_TYPES[:-1]
+    offer_ruling = right_col.radio(
+        "Payroll Tax exemption", offer_types, help=RULING_TIP, key="se_ruling"
+    )
+    break_even = get_cy_break_even_revenue(
+        salaries=[offer],
+        costs=costs,
+        year=se_year,
+        tax_data=CY_DATA,
+        ruling=offer_ruling,
+    )[0]
+    first_col, second_col = st.columns(2)
+    first_col.metric("Break-even Revenue per Year", f"{break_even:,.2f} €")
+    second_col.metric(
+        "Break-even Rate per Hour",
+        f"{break_even / (CY_DATA['workingWeeks'] * se_hours):,.2f} €",
+    )
+    st.line_chart(get_break_even_chart(costs, se_year, offer_ruling))
+    st.caption(
+        "Net income per year by gross salary or revenue, "
+        "the same net income is earned where the lines cross"
     )
-    st.video("https://www.youtube.com/watch?v=3FMyeGw6Tn0")
 
 with st.expander(EXPLANATIONS_TITLE):
     st.markdown(EXPLANATIONS)
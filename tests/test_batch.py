@@ -0,0 +1,126 @@
+import random
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.batch import (
+    get_amounts_batch,
+    get_amounts_by_segments,
+    get_group_index,
+    get_group_slices,
+    get_rates_batch,
+)
+from kalkulators.taxes.brackets import compile_brackets, get_rate_types
+from kalkulators.taxes.common import get_rates
+from kalkulators.taxes.countries import COUNTRIES
+
+
+def get_tables():
+    """
+    Every (country, table, year, rate type) of the tax data.
+
+    """
+    for country, config in COUNTRIES.items():
+        tax_data = config["tax_data"]
+        for name, value in tax_data.items():
+            if not isinstance(value, Mapping) or not all(
+                isinstance(brackets, list) for brackets in value.values()
+            ):
+                continue
+            for year, brackets in value.items():
+                for rate_type in sorted(get_rate_types(brackets)):
+                    yield country, name, year, rate_type, brackets
+
+
+TABLES = list(get_tables())
+parametrize_tables = pytest.mark.parametrize(
+    "country, name, year, rate_type, brackets",
+    TABLES,
+    ids=["-".join(table[:4]) for table in TABLES],
+)
+
+
+def get_salaries(brackets, seed):
+    """
+    Random salaries, with salaries on and around every bracket bound.
+
+    """
+    rng = random.Random(seed)
+    salaries = [-100.0, 0.0, 0.005, 0.01]
+    bound = 0
+    for bracket in brackets:
+        if "max" not in bracket:
+            break
+        bound += bracket["max"] - bracket["min"]
+        salaries += [bound + delta for delta in (-1, -0.01, 0, 0.005, 0.01, 1)]
+    for _ in range(300):
+        salaries.append(rng.uniform(0, 300000))
+        salaries.append(rng.randint(0, 30000000) / 100)
+        salaries.append(rng.randint(0, 300000) + 0.005)
+    return salaries
+
+
+def get_expected(brackets, rate_type, year):
+    salaries = get_salaries(brackets, seed=len(brackets) + int(year))
+    return salaries, [get_rates(brackets, salary, rate_type) for salary in salaries]
+
+
+@parametrize_tables
+def test_amounts_batch_match_get_rates(country, name, year, rate_type, brackets):
+    salaries, expected = get_expected(brackets, rate_type, year)
+    compiled = compile_brackets(brackets, rate_type)
+
+    assert get_amounts_batch(compiled, salaries).tolist() == expected
+    assert get_rates_batch(brackets, np.array(salaries), rate_type).tolist() == (
+        expected
+    )
+
+
+@parametrize_tables
+def test_compiled_amount_matches_get_rates(country, name, year, rate_type, brackets):
+    salaries, expected = get_expected(brackets, rate_type, year)
+    compiled = compile_brackets(brackets, rate_type)
+
+    assert [compiled.get_amount(salary) for salary in salaries] == expected
+
+
+def test_group_index_of_unknown_value():
+    with pytest.raises(KeyError, match="'2000'"):
+        get_group_index(np.array(["2023", "2000"]), ["2023", "2024"])
+    with pytest.raises(KeyError, match="'2000'"):
+        get_group_index(np.broadcast_to(np.array("2000"), (3,)), ["2023"])
+    with pytest.raises(KeyError):
+        get_group_index(np.array([{"year": 1}], dtype=object), ["2023"])
+
+
+@parametrize_tables
+def test_amounts_by_segments_match_get_rates(
+    country, name, year, rate_type, brackets
+):
+    salaries, expected = get_expected(brackets, rate_type, year)
+    compiled = compile_brackets(brackets, rate_type)
+
+    # Unsorted salaries are split into sorted runs
+    assert get_amounts_by_segments(compiled, salaries).tolist() == expected
+
+    order = np.argsort(salaries, kind="stable")
+    assert get_amounts_by_segments(compiled, np.array(salaries)[order]).tolist() == (
+        np.array(expected)[order].tolist()
+    )
+
+
+def test_group_slices():
+    group_index = np.array([2, 0, 2, 1, 0, 2])
+    order, slices = get_group_slices(group_index, 4)
+
+    assert order.tolist() == [1, 4, 3, 0, 2, 5]
+    assert [(group, group_index[order][rows].tolist()) for group, rows in slices] == [
+        (0, [0, 0]),
+        (1, [1]),
+        (2, [2, 2, 2]),
+    ]
+    assert get_group_slices(np.array([0, 0, 3]), 4) == (
+        None,
+        [(0, slice(0, 2)), (3, slice(2, 3))],
+    )
@@ -0,0 +1,134 @@
+import pytest
+
+from kalkulators.taxes.cache import CalculationCache
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.nl_calc import DutchTaxCalculator
+
+
+class Calculator:
+    """
+    Calculator stub counting calculations of its key.
+
+    """
+
+    calls = []
+
+    def __init__(self, key):
+        self.key = key
+
+    def get_cache_key(self):
+        return self.key
+
+    def calculate(self):
+        self.calls.append(self.key)
+        return {"key": self.key}
+
+
+@pytest.fixture(autouse=True)
+def calls():
+    Calculator.calls = []
+    return Calculator.calls
+
+
+def calculate_all(cache, keys):
+    return [cache.calculate(Calculator(key)) for key in keys]
+
+
+def test_results_are_shared(calls):
+    cache = CalculationCache()
+    first, second = calculate_all(cache, ["a", "a"])
+
+    assert first is second
+    assert calls == ["a"]
+
+
+def test_least_recently_used_is_evicted(calls):
+    cache = CalculationCache(maxsize=2)
+    calculate_all(cache, ["a", "b", "a", "c"])
+
+    # "b" was used before "a", so it is evicted by "c"
+    assert len(cache) == 2
+    calculate_all(cache, ["a", "c", "b"])
+    assert calls == ["a", "b", "c", "b"]
+
+    # "a" is the least recently used now
+    calculate_all(cache, ["c", "a"])
+    assert calls == ["a", "b", "c", "b", "a"]
+
+
+def test_size_is_bounded(calls):
+    cache = CalculationCache(maxsize=3)
+    calculate_all(cache, range(10))
+
+    assert len(cache) == 3
+    calculate_all(cache, [7, 8, 9])
+    assert calls == list(range(10))
+
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_invalid_size(maxsize):
+    with pytest.raises(ValueError, match="Cache size must be positive"):
+        CalculationCache(maxsize=maxsize)
+
+
+def test_stats():
+    cache = CalculationCache(maxsize=2)
+    assert cache.get_stats() == {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "size": 0,
+        "maxsize": 2,
+        "hit_rate": 0.0,
+        "coalesced": 0,
+    }
+
+    calculate_all(cache, ["a", "b", "a", "c", "a", "b"])
+    assert cache.get_stats() == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 2,
+        "size": 2,
+        "maxsize": 2,
+        "hit_rate": 2 / 6,
+        "coalesced": 0,
+    }
+
+
+def test_clear_keeps_stats(calls):
+    cache = CalculationCache()
+    calculate_all(cache, ["a", "b", "a"])
+    cache.clear()
+
+    assert len(cache) == 0
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 0)
+
+    calculate_all(cache, ["a"])
+    assert calls == ["a", "b", "a"]
+    assert cache.get_stats()["misses"] == 3
+
+
+def test_calculator_results():
+    cache = CalculationCache()
+    options = dict(
+        old_age=False,
+        year="2024",
+        ruling="None",
+        salary=60000,
+        period="year",
+        working_hours=40,
+        social_security=True,
+        holiday_allowance=True,
+        tax_data=COUNTRIES["nl"]["tax_data"],
+        working_periods=WORKING_PERIODS,
+    )
+    expected = DutchTaxCalculator(**options).calculate()
+
+    assert cache.calculate(DutchTaxCalculator(**options)) == expected
+    # Equal input data is a hit, other input data a miss
+    assert cache.calculate(DutchTaxCalculator(**options)) == expected
+    cache.calculate(DutchTaxCalculator(**{**options, "salary": 60001}))
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
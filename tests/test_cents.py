@@ -0,0 +1,271 @@
+import dataclasses
+from decimal import ROUND_FLOOR, ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cents import (
+    CENTS_CALCULATORS,
+    calculate_cy_cents,
+    calculate_nl_cents,
+    float_to_cents,
+)
+from kalkulators.taxes.cy_data import RULING_TYPES as CY_RULING_TYPES
+from kalkulators.taxes.nl_calc import RULING_TYPES
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+CY_DATA = COUNTRIES["cy"]["tax_data"]
+PERIOD_DIVISORS = {"year": 1, "month": 12, "day": 255, "hour": 2080}
+CENT = Decimal("0.01")
+
+
+def get_columns(country, count, seed):
+    """
+    Random calculation arguments, a column array per argument.
+    Half of the salaries are whole euros or cents, as entered by users.
+
+    """
+    rng = np.random.default_rng(seed)
+    tax_data = COUNTRIES[country]["tax_data"]
+    period = rng.choice(WORKING_PERIODS, count)
+    salary = rng.uniform(0, 250000, count) / [PERIOD_DIVISORS[p] for p in period]
+    salary = np.where(rng.random(count) < 0.5, np.round(salary, 2), salary)
+    columns = dict(
+        salary=salary,
+        period=period,
+        working_hours=rng.choice([32.5, 36, 38, 40], count),
+        year=rng.choice(tax_data["years"], count),
+    )
+    if country == "nl":
+        return dict(
+            columns,
+            ruling=rng.choice(list(RULING_TYPES), count),
+            old_age=rng.random(count) < 0.5,
+            holiday_allowance=rng.random(count) < 0.5,
+            social_security=rng.random(count) < 0.5,
+        )
+    return dict(columns, ruling=rng.choice(CY_RULING_TYPES, count))
+
+
+@pytest.mark.parametrize("country", CENTS_CALCULATORS)
+def test_compat_matches_float(country):
+    tax_data = COUNTRIES[country]["tax_data"]
+    columns = get_columns(country, 50000, seed=1)
+    expected = COUNTRIES[country]["calculator"].calculate_many(
+        tax_data=tax_data, **columns
+    )
+    result = CENTS_CALCULATORS[country](tax_data=tax_data, mode="compat", **columns)
+
+    for field in dataclasses.fields(expected):
+        values = getattr(expected, field.name)
+        cents = getattr(result, field.name)
+        assert cents.dtype == np.int64
+        # Float amounts left with a fraction of a half cent are rounded to even
+        ties = np.abs(np.abs(values * 100 - cents) - 0.5) < 1e-6
+        mismatches = (float_to_cents(values) != cents) & ~ties
+        assert not mismatches.any(), (field.name, np.flatnonzero(mismatches)[:5])
+
+
+def round_cents(value):
+    return value.quantize(CENT, ROUND_HALF_EVEN)
+
+
+def floor(value):
+    return value.to_integral_value(ROUND_FLOOR)
+
+
+def get_amount(brackets, salary, rate_type):
+    """
+    get_rates in decimals, every bracket amount is rounded to cents.
+
+    """
+    amount, start = Decimal(0), Decimal(0)
+    for bracket in brackets:
+        rate = Decimal(repr(bracket[rate_type]))
+        is_percent = -1 < bracket[rate_type] < 1 and bracket[rate_type] != 0
+        last = "max" not in bracket
+        delta = None if last else Decimal(bracket["max"] - bracket["min"])
+        if last or salary <= start + delta:
+            return amount + round_cents((salary - start) * rate) if is_percent else rate
+        amount = amount + round_cents(delta * rate) if is_percent else rate
+        start += delta
+    return amount
+
+
+def get_gross_year(tax_data, salary, period, working_hours):
+    salary = round_cents(Decimal(float(salary)))
+    if period == "hour":
+        gross_year = salary * tax_data["workingWeeks"] * Decimal(repr(working_hours))
+    else:
+        factors = {"year": 1, "month": 12, "day": tax_data["workingDays"]}
+        gross_year = salary * factors[period]
+    return round_cents(max(gross_year, Decimal(0)))
+
+
+def get_period_net(tax_data, year_net_income, working_hours):
+    return dict(
+        year_net_income=year_net_income,
+        month_net_income=floor(year_net_income / 12),
+        hour_net_income=floor(
+            year_net_income / (tax_data["workingWeeks"] * Decimal(repr(working_hours)))
+        ),
+    )
+
+
+def calculate_nl_decimal(
+    salary,
+    period,
+    working_hours,
+    ruling,
+    year,
+    old_age,
+    holiday_allowance,
+    social_security,
+):
+    """
+    Exact mode reference: calculate() in decimals, amounts rounded to cents.
+
+    """
+    tax_data = NL_DATA
+    gross_year = get_gross_year(tax_data, salary, period, working_hours)
+    taxable_year = gross_year
+    if holiday_allowance:
+        taxable_year -= floor(gross_year * 2 / Decimal(27))
+
+    tax_free_year = Decimal(0)
+    thresholds = tax_data["rulingThreshold"][year]
+    if ruling != "None" and taxable_year > thresholds[RULING_TYPES[ruling]]:
+        tax_free_year = round_cents(taxable_year * Decimal("0.3"))
+        taxable_year -= tax_free_year
+    taxable_year = floor(taxable_year)
+
+    social = tax_data["socialPercent"][year][0]
+    rate, social_rate, older_rate = (
+        Decimal(repr(social[name])) for name in ("rate", "social", "older")
+    )
+    if not social_security:
+        social_credit = rate - social_rate
+    elif old_age:
+        social_credit = rate + older_rate - social_rate
+    else:
+        social_credit = rate
+
+    payroll_tax = -get_amount(tax_data["payrollTax"][year], taxable_year, "rate")
+    social_security_tax = Decimal(0)
+    if social_security:
+        social_security_tax = -get_amount(
+            tax_data["socialPercent"][year],
+            taxable_year,
+            "older" if old_age else "social",
+        )
+    general_tax_credit, labour_tax_credit = (
+        round_cents(
+            get_amount(tax_data[name][year], taxable_year, "rate")
+            * social_credit
+            / rate
+        )
+        for name in ("generalCredit", "labourCredit")
+    )
+    elder_tax_credit = Decimal(0)
+    if old_age:
+        elder_tax_credit = get_amount(
+            tax_data["elderCredit"][year], taxable_year, "rate"
+        )
+        if not social_security:
+            elder_tax_credit = round_cents(
+                elder_tax_credit
+                * (rate - social_rate)
+                / (rate + older_rate - social_rate)
+            )
+
+    income_tax = min(
+        floor(
+            payroll_tax
+            + social_security_tax
+            + general_tax_credit
+            + labour_tax_credit
+            + elder_tax_credit
+        ),
+        0,
+    )
+    return dict(
+        taxable_income=taxable_year,
+        payroll_tax=payroll_tax,
+        social_security_tax=social_security_tax,
+        general_tax_credit=general_tax_credit,
+        labour_tax_credit=labour_tax_credit,
+        elder_tax_credit=elder_tax_credit,
+        **get_period_net(
+            tax_data, taxable_year + income_tax + tax_free_year, working_hours
+        ),
+    )
+
+
+def calculate_cy_decimal(salary, period, working_hours, ruling, year):
+    """
+    Exact mode reference: calculate() in decimals, amounts rounded to cents.
+
+    """
+    tax_data = CY_DATA
+    taxable_year = floor(get_gross_year(tax_data, salary, period, working_hours))
+    social_tax = -get_amount(tax_data["socialPercent"][year], taxable_year, "rate")
+    nhs_tax = -get_amount(tax_data["nhs"][year], taxable_year, "rate")
+    taxable_year += social_tax + nhs_tax
+
+    tax_free_year = Decimal(0)
+    if ruling in ("20%", "50%"):
+        tax_free_year = round_cents(taxable_year * Decimal(ruling[:-1]) / 100)
+        taxable_year -= tax_free_year
+
+    payroll_tax = min(
+        floor(-get_amount(tax_data["payrollTax"][year], taxable_year, "rate")), 0
+    )
+    return dict(
+        taxable_income=taxable_year,
+        payroll_tax=payroll_tax,
+        social_tax=social_tax,
+        nhs_tax=nhs_tax,
+        **get_period_net(
+            tax_data, taxable_year + payroll_tax + tax_free_year, working_hours
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "country, reference",
+    [("nl", calculate_nl_decimal), ("cy", calculate_cy_decimal)],
+)
+def test_exact_matches_decimal(country, reference):
+    tax_data = COUNTRIES[country]["tax_data"]
+    columns = get_columns(country, 2000, seed=2)
+    result = CENTS_CALCULATORS[country](tax_data=tax_data, mode="exact", **columns)
+
+    for position in range(columns["salary"].size):
+        row = {name: values[position].item() for name, values in columns.items()}
+        for name, value in reference(**row).items():
+            cents = int(getattr(result, name)[position])
+            assert Decimal(cents) / 100 == round_cents(value), (name, row)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown mode"):
+        calculate_cy_cents(1000, "year", 40, "0%", "2023", CY_DATA, mode="float")
+    with pytest.raises(ValueError, match="Unknown mode"):
+        calculate_nl_cents(
+            1000, "year", 40, "None", "2023", False, False, NL_DATA, mode="float"
+        )
+
+
+@pytest.mark.parametrize("country", CENTS_CALCULATORS)
+def test_exact_is_default(country):
+    tax_data = COUNTRIES[country]["tax_data"]
+    columns = get_columns(country, 2000, seed=3)
+    result = CENTS_CALCULATORS[country](tax_data=tax_data, **columns)
+    exact = CENTS_CALCULATORS[country](tax_data=tax_data, mode="exact", **columns)
+
+    for field in dataclasses.fields(result):
+        np.testing.assert_array_equal(
+            getattr(result, field.name), getattr(exact, field.name)
+        )
@@ -0,0 +1,85 @@
+import itertools
+import random
+
+import pytest
+
+from kalkulators.taxes.brackets import compile_tax_data
+from kalkulators.taxes.codegen import calculate_cy, calculate_nl
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator
+from kalkulators.taxes.cy_data import RULING_TYPES as CY_RULING_TYPES
+from kalkulators.taxes.nl_calc import RULING_TYPES, DutchTaxCalculator
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+CY_DATA = COUNTRIES["cy"]["tax_data"]
+
+
+def get_salaries(tax_data, year, names, seed):
+    """
+    Random salaries per working period, with yearly salaries
+    on and around every bracket bound of the year tables.
+
+    """
+    rng = random.Random(seed)
+    tables = compile_tax_data(tax_data)
+    salaries = [(0, "year"), (-5, "month")]
+    for name in names:
+        for bound in tables[name, year, "rate"].bounds[:-1]:
+            salaries += [(bound + delta, "year") for delta in (-0.01, 0, 0.01, 1)]
+    for _ in range(50):
+        salaries.append((rng.uniform(0, 300000), "year"))
+        salaries.append((round(rng.uniform(0, 20000), 2), "month"))
+        salaries.append((rng.randint(0, 1000), "day"))
+        salaries.append((rng.uniform(0, 150), "hour"))
+    return salaries
+
+
+@pytest.mark.parametrize("year", [str(year) for year in NL_DATA["years"]])
+def test_nl_matches_calculator(year):
+    salaries = get_salaries(
+        NL_DATA,
+        year,
+        ("payrollTax", "generalCredit", "labourCredit", "elderCredit"),
+        seed=int(year),
+    )
+    for ruling, old_age, social_security, holiday_allowance in itertools.product(
+        RULING_TYPES, (False, True), (False, True), (False, True)
+    ):
+        for salary, period in salaries:
+            options = dict(
+                old_age=old_age,
+                year=year,
+                ruling=ruling,
+                salary=salary,
+                period=period,
+                working_hours=36,
+                social_security=social_security,
+                holiday_allowance=holiday_allowance,
+                tax_data=NL_DATA,
+            )
+            expected = DutchTaxCalculator(
+                **options, working_periods=WORKING_PERIODS
+            ).calculate()
+            assert calculate_nl(**options) == expected, options
+
+
+@pytest.mark.parametrize("year", [str(year) for year in CY_DATA["years"]])
+def test_cy_matches_calculator(year):
+    salaries = get_salaries(
+        CY_DATA, year, ("socialPercent", "nhs", "payrollTax"), seed=int(year)
+    )
+    for ruling in CY_RULING_TYPES:
+        for salary, period in salaries:
+            options = dict(
+                year=year,
+                ruling=ruling,
+                salary=salary,
+                period=period,
+                working_hours=38.5,
+                tax_data=CY_DATA,
+            )
+            expected = CyprusTaxCalculator(
+                **options, working_periods=WORKING_PERIODS
+            ).calculate()
+            assert calculate_cy(**options) == expected, options
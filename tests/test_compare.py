@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.compare import (
+    COMPARED_FIELDS,
+    RULINGS,
+    compare_countries,
+    get_shared_years,
+)
+from kalkulators.taxes.countries import COUNTRIES
+
+
+def calculate(country, salary, period, year, ruling, **options):
+    tax_data = COUNTRIES[country]["tax_data"]
+    if country != "nl":
+        options = {}
+    return COUNTRIES[country]["calculator"](
+        year=year,
+        ruling=ruling,
+        salary=salary,
+        period=period,
+        working_hours=tax_data["defaultWorkingHours"],
+        tax_data=tax_data,
+        working_periods=WORKING_PERIODS,
+        **options,
+    ).calculate()
+
+
+@pytest.mark.parametrize(
+    "salaries, period",
+    [
+        (np.arange(0, 250001, 100.0), "year"),
+        (np.random.default_rng(1).uniform(0, 20000, 500), "month"),
+    ],
+    ids=["sorted", "unsorted"],
+)
+def test_compare_matches_calculate(salaries, period):
+    options = dict(old_age=True, holiday_allowance=True, social_security=False)
+    comparison = compare_countries(salaries, period=period, **options)
+
+    years = get_shared_years(COUNTRIES)
+    configs = sum(len(RULINGS[country]) for country in COUNTRIES) * len(years)
+    assert comparison.salary.size == configs * salaries.size
+
+    rng = np.random.default_rng(2)
+    for position in rng.integers(0, comparison.salary.size, 500):
+        expected = calculate(
+            str(comparison.country[position]),
+            float(comparison.salary[position]),
+            period,
+            str(comparison.year[position]),
+            str(comparison.ruling[position]),
+            **options,
+        )
+        for field in COMPARED_FIELDS:
+            assert getattr(comparison, field)[position] == getattr(expected, field)
+
+
+def test_compare_order_and_ratio():
+    comparison = compare_countries(
+        [0, 60000], years=["2023"], rulings={"nl": ["None"], "cy": ["0%"]}
+    )
+
+    assert comparison.country.tolist() == ["nl", "nl", "cy", "cy"]
+    assert comparison.salary.tolist() == [0, 60000, 0, 60000]
+    assert np.isnan(comparison.net_ratio[0])
+    assert comparison.net_ratio[1] == comparison.year_net_income[1] / 60000
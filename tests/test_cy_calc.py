@@ -0,0 +1,126 @@
+import dataclasses
+import random
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator
+from kalkulators.taxes.cy_data import RULING_TYPES
+from kalkulators.taxes.inverse import get_period_net
+
+CY_DATA = COUNTRIES["cy"]["tax_data"]
+YEARS = [str(year) for year in CY_DATA["years"]]
+PERIOD_SALARIES = {"year": 300000, "month": 25000, "day": 1000, "hour": 150}
+
+
+def get_rows(count, seed):
+    """
+    Random calculation arguments, a dict per row.
+
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        period = rng.choice(WORKING_PERIODS)
+        salary = rng.uniform(0, PERIOD_SALARIES[period])
+        rows.append(
+            dict(
+                salary=rng.choice([salary, round(salary), round(salary, 2)]),
+                period=period,
+                working_hours=rng.choice([20, 32.5, 38.5, 40]),
+                ruling=rng.choice(RULING_TYPES),
+                year=rng.choice(YEARS),
+            )
+        )
+    return rows
+
+
+def calculate(row):
+    return CyprusTaxCalculator(
+        **row, tax_data=CY_DATA, working_periods=WORKING_PERIODS
+    ).calculate()
+
+
+def assert_row_equal(result, position, expected):
+    for field in dataclasses.fields(result):
+        assert getattr(result, field.name)[position] == (
+            getattr(expected, field.name)
+        ), (field.name, position)
+
+
+def test_calculate_many_matches_calculate():
+    rows = get_rows(3000, seed=2)
+    columns = {name: np.array([row[name] for row in rows]) for name in rows[0]}
+    result = CyprusTaxCalculator.calculate_many(tax_data=CY_DATA, **columns)
+
+    for position, row in enumerate(rows):
+        assert_row_equal(result, position, calculate(row))
+
+
+def test_calculate_many_unknown_period():
+    with pytest.raises(KeyError):
+        CyprusTaxCalculator.calculate_many(
+            salary=[60000],
+            period="week",
+            working_hours=40,
+            ruling="0%",
+            year=YEARS[-1],
+            tax_data=CY_DATA,
+        )
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_calculate_sweep_matches_calculate(year):
+    rng = random.Random(int(year))
+    grid = np.arange(0, 200001, 50.0) / 12
+    for ruling in RULING_TYPES:
+        result = CyprusTaxCalculator.calculate_sweep(
+            grid, year, ruling, CY_DATA, period="month", working_hours=40
+        )
+        many = CyprusTaxCalculator.calculate_many(
+            grid, "month", 40, ruling, year, CY_DATA
+        )
+        for field in dataclasses.fields(result):
+            np.testing.assert_array_equal(
+                getattr(result, field.name), getattr(many, field.name)
+            )
+
+        for position in rng.sample(range(grid.size), 40):
+            expected = calculate(
+                dict(
+                    salary=grid[position],
+                    period="month",
+                    working_hours=40,
+                    ruling=ruling,
+                    year=year,
+                )
+            )
+            assert_row_equal(result, position, expected)
+
+
+@pytest.mark.parametrize("period", WORKING_PERIODS)
+def test_calculate_gross_is_minimal(period):
+    rng = random.Random(period)
+    targets = np.array(
+        [round(rng.uniform(0, PERIOD_SALARIES[period] * 0.7)) for _ in range(100)]
+    )
+    for year in YEARS:
+        for ruling in RULING_TYPES:
+            options = dict(
+                period=period,
+                working_hours=40,
+                ruling=ruling,
+                year=year,
+                tax_data=CY_DATA,
+            )
+            gross = CyprusTaxCalculator.calculate_gross(targets, **options)
+
+            def get_net(salary):
+                result = CyprusTaxCalculator.calculate_many(salary=salary, **options)
+                return get_period_net(result, period, CY_DATA)
+
+            assert np.all(get_net(gross) >= targets)
+            below = get_net(np.maximum(gross - 0.01, 0))
+            assert np.all((below < targets) | (gross == 0))
@@ -0,0 +1,118 @@
+import importlib
+from collections.abc import Mapping
+
+import pytest
+
+from kalkulators.taxes import datastore
+from kalkulators.taxes.datastore import (
+    CACHE_DIR_VARIABLE,
+    DATA_MODULES,
+    HEADER,
+    LazyTaxData,
+    build_artifact,
+    get_source_stat,
+    is_source_current,
+    parse_artifact,
+    read_artifact,
+    write_artifact,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("country", DATA_MODULES)
+def test_artifact_matches_source(country):
+    module, name = DATA_MODULES[country]
+    expected = getattr(importlib.import_module(module), name)
+    tax_data = LazyTaxData(country, *parse_artifact(build_artifact(country)))
+
+    assert list(tax_data) == list(expected)
+    for component, value in tax_data.items():
+        if isinstance(value, Mapping):
+            assert list(value) == list(expected[component])
+            value = dict(value)
+        assert value == expected[component], component
+
+
+def test_read_artifact(cache_dir):
+    assert read_artifact("nl") is None
+
+    assert write_artifact("nl_data", build_artifact("nl"))
+    header, _ = read_artifact("nl")
+    assert header["source_stat"] == get_source_stat("nl")
+
+
+def test_write_artifact_to_read_only_location(tmp_path, monkeypatch):
+    # A directory can't be created under a file
+    (tmp_path / "file").write_bytes(b"")
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path / "file" / "cache"))
+
+    assert not write_artifact("nl_data", b"content")
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda content: b"",
+        lambda content: content[: HEADER.size + 10],
+        lambda content: HEADER.pack(0, 0) + content[HEADER.size :],
+        lambda content: content[: HEADER.size] + bytes(len(content) - HEADER.size),
+    ],
+    ids=["empty", "truncated", "version", "header"],
+)
+def test_read_corrupt_artifact(cache_dir, corrupt):
+    write_artifact("cy_data", corrupt(build_artifact("cy")))
+
+    assert read_artifact("cy") is None
+
+
+def test_source_stat_is_checked_before_hash(monkeypatch):
+    def get_source_hash(country):
+        raise AssertionError("Source must not be hashed")
+
+    monkeypatch.setattr(datastore, "get_source_hash", get_source_hash)
+
+    assert is_source_current("nl", list(get_source_stat("nl")), b"")
+
+
+def test_source_hash_decides_changed_stat():
+    source_hash = datastore.get_source_hash("nl")
+
+    assert is_source_current("nl", (0, 0), source_hash)
+    assert not is_source_current("nl", (0, 0), b"stale")
+
+
+def test_missing_source_is_not_current(monkeypatch):
+    monkeypatch.setattr(datastore, "get_source_path", lambda country: "/missing.py")
+
+    assert not is_source_current("nl", (0, 0), b"")
+
+
+def test_stale_artifact_is_not_read(cache_dir, monkeypatch):
+    write_artifact("nl_data", build_artifact("nl"))
+    monkeypatch.setattr(datastore, "get_source_stat", lambda country: (0, 0))
+    monkeypatch.setattr(datastore, "get_source_hash", lambda country: b"changed")
+
+    assert read_artifact("nl") is None
+
+
+def test_artifact_of_touched_source_is_refreshed(cache_dir, monkeypatch):
+    write_artifact("nl_data", build_artifact("nl"))
+    # Same content with a new stat, e.g. a touched source
+    monkeypatch.setattr(datastore, "get_source_stat", lambda country: (1, 2))
+
+    header, _ = read_artifact("nl")
+    assert tuple(header["source_stat"]) == (1, 2)
+    stored = parse_artifact(next(cache_dir.glob("nl_data.*")).read_bytes())[0]
+    assert tuple(stored["source_stat"]) == (1, 2)
+
+    # The refreshed artifact is current without hashing the source
+    def get_source_hash(country):
+        raise AssertionError("Source must not be hashed")
+
+    monkeypatch.setattr(datastore, "get_source_hash", get_source_hash)
+    assert read_artifact("nl") is not None
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from kalkulators.taxes.cache import CalculationCache
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.graph import CalculationGraph, DutchCalculationGraph, Stage
+from kalkulators.taxes.nl_calc import RULING_TYPES
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+
+
+def get_changes(rng):
+    return dict(
+        salary=rng.choice([0, 25.5, 500, 3000, 40000, 60000, 123456.78]),
+        period=rng.choice(["year", "month", "day", "hour"]),
+        working_hours=rng.choice([20, 36, 40]),
+        ruling=rng.choice(list(RULING_TYPES)),
+        year=rng.choice([str(year) for year in NL_DATA["years"]]),
+        old_age=rng.random() < 0.3,
+        social_security=rng.random() < 0.8,
+        holiday_allowance=rng.random() < 0.5,
+    )
+
+
+def test_graph_matches_calculate():
+    rng = random.Random(1)
+    graph = DutchCalculationGraph(NL_DATA)
+    for _ in range(3000):
+        changes = get_changes(rng)
+        names = rng.sample(list(changes), rng.randint(1, 3))
+        graph.update(**{name: changes[name] for name in names})
+
+        assert graph.calculate() == graph.get_calculator().calculate()
+
+
+def test_graph_recomputes_changed_stages():
+    graph = DutchCalculationGraph(NL_DATA)
+    graph.update(salary=60000, ruling="Normal", year="2023")
+    graph.calculate()
+
+    graph.update(working_hours=36)
+    graph.calculate()
+    assert graph.recomputed == ("gross_year", "hour_net_income")
+
+    graph.calculate()
+    assert graph.recomputed == ()
+
+
+def test_graph_in_cache():
+    cache = CalculationCache()
+    graph = DutchCalculationGraph(NL_DATA)
+    graph.update(salary=45000, holiday_allowance=True)
+
+    assert cache.calculate(graph) == graph.get_calculator().calculate()
+    assert graph.get_cache_key() == graph.get_calculator().get_cache_key()
+
+
+def test_graph_errors():
+    with pytest.raises(ValueError, match="unknown 'b'"):
+        CalculationGraph([Stage("a", ("b",), abs)], ["c"])
+    with pytest.raises(ValueError, match="Duplicate stage 'c'"):
+        CalculationGraph([Stage("c", (), int)], ["c"])
+    with pytest.raises(KeyError, match="Unknown input 'wage'"):
+        DutchCalculationGraph(NL_DATA).update(wage=1)
@@ -0,0 +1,117 @@
+import importlib.util
+from itertools import count
+
+import pytest
+
+from kalkulators.taxes import metrics
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.metrics import METRICS, METRICS_VARIABLE, Metrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Every call is one second later
+    ticks = count()
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: float(next(ticks)))
+
+
+def test_disabled_metrics_have_no_timer():
+    collected = Metrics()
+
+    assert collected.timer("call") is None
+    collected.enable()
+    assert collected.timer("call") is not None
+    collected.disable()
+    assert collected.timer("call") is None
+
+
+def test_snapshot(clock):
+    collected = Metrics(enabled=True)
+    timer = collected.timer("call")
+    timer.lap("first")
+    timer.lap("second")
+    timer.stop()
+    collected.record("call", 4.0)
+    collected.count("rows", 10)
+    collected.count("rows")
+
+    assert collected.snapshot() == {
+        "timers": {
+            "call": {"count": 2, "total": 7.0, "mean": 3.5, "max": 4.0},
+            "call.first": {"count": 1, "total": 1.0, "mean": 1.0, "max": 1.0},
+            "call.second": {"count": 1, "total": 1.0, "mean": 1.0, "max": 1.0},
+        },
+        "counters": {"rows": 11},
+    }
+
+    collected.reset()
+    assert collected.snapshot() == {"timers": {}, "counters": {}}
+
+
+def test_prometheus_format():
+    collected = Metrics(enabled=True)
+    collected.record("nl.calculate", 0.5)
+    collected.record("nl.calculate", 0.25)
+    collected.count("nl.calculate.period.year", 2)
+
+    assert collected.to_prometheus(prefix="test") == (
+        "# HELP test_stage_seconds Time spent in calculation stages.\n"
+        "# TYPE test_stage_seconds summary\n"
+        'test_stage_seconds_count{stage="nl.calculate"} 2\n'
+        'test_stage_seconds_sum{stage="nl.calculate"} 0.75\n'
+        "# HELP test_stage_seconds_max Longest time spent in a stage.\n"
+        "# TYPE test_stage_seconds_max gauge\n"
+        'test_stage_seconds_max{stage="nl.calculate"} 0.5\n'
+        "# HELP test_calls_total Number of calls.\n"
+        "# TYPE test_calls_total counter\n"
+        'test_calls_total{name="nl.calculate.period.year"} 2\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "value, enabled",
+    [
+        (None, False),
+        ("", False),
+        ("0", False),
+        ("false", False),
+        (" FALSE ", False),
+        ("1", True),
+        ("true", True),
+        ("yes", True),
+    ],
+)
+def test_environment_flag(monkeypatch, value, enabled):
+    if value is None:
+        monkeypatch.delenv(METRICS_VARIABLE, raising=False)
+    else:
+        monkeypatch.setenv(METRICS_VARIABLE, value)
+
+    # A separate copy of the module, the shared metrics stay as they are
+    spec = importlib.util.spec_from_file_location("metrics_copy", metrics.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module.METRICS.enabled is enabled
+
+
+@pytest.fixture
+def shared_metrics():
+    enabled = METRICS.enabled
+    METRICS.enable()
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+    METRICS.enabled = enabled
+
+
+def test_calculators_are_timed(shared_metrics):
+    tax_data = COUNTRIES["cy"]["tax_data"]
+    COUNTRIES["cy"]["calculator"].calculate_many(
+        [20000, 60000], "year", 40, "0%", str(tax_data["currentYear"]), tax_data
+    )
+
+    snapshot = shared_metrics.snapshot()
+    assert snapshot["timers"]["cy.calculate_many"]["count"] == 1
+    assert "cy.calculate_many.payroll_tax" in snapshot["timers"]
+    assert snapshot["counters"]["cy.calculate_many.rows"] == 2
@@ -0,0 +1,229 @@
+import dataclasses
+import random
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.inverse import get_period_net
+from kalkulators.taxes.nl_calc import RULING_TYPES, DutchTaxCalculator
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+YEARS = [str(year) for year in NL_DATA["years"]]
+PERIOD_SALARIES = {"year": 300000, "month": 25000, "day": 1000, "hour": 150}
+
+
+def get_rows(count, seed):
+    """
+    Random calculation arguments, a dict per row.
+
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        period = rng.choice(WORKING_PERIODS)
+        salary = rng.uniform(0, PERIOD_SALARIES[period])
+        rows.append(
+            dict(
+                salary=rng.choice([salary, round(salary), round(salary, 2)]),
+                period=period,
+                working_hours=rng.choice([20, 32.5, 36, 40]),
+                ruling=rng.choice(list(RULING_TYPES)),
+                year=rng.choice(YEARS),
+                old_age=rng.random() < 0.3,
+                holiday_allowance=rng.random() < 0.5,
+                social_security=rng.random() < 0.8,
+            )
+        )
+    return rows
+
+
+def calculate(row):
+    return DutchTaxCalculator(
+        **row, tax_data=NL_DATA, working_periods=WORKING_PERIODS
+    ).calculate()
+
+
+def assert_row_equal(result, position, expected):
+    for field in dataclasses.fields(result):
+        assert getattr(result, field.name)[position] == (
+            getattr(expected, field.name)
+        ), (field.name, position)
+
+
+def test_calculate_many_matches_calculate():
+    rows = get_rows(3000, seed=1)
+    columns = {name: np.array([row[name] for row in rows]) for name in rows[0]}
+    result = DutchTaxCalculator.calculate_many(tax_data=NL_DATA, **columns)
+
+    for position, row in enumerate(rows):
+        assert_row_equal(result, position, calculate(row))
+
+
+def test_calculate_many_broadcasts_single_values():
+    salaries = np.array([0, 15000.5, 60000, 250000])
+    result = DutchTaxCalculator.calculate_many(
+        salary=salaries.reshape(-1, 1),
+        period="year",
+        working_hours=40,
+        ruling=np.array(list(RULING_TYPES)),
+        year=YEARS[-1],
+        old_age=False,
+        holiday_allowance=True,
+        tax_data=NL_DATA,
+    )
+
+    assert result.year_net_income.shape == (salaries.size, len(RULING_TYPES))
+    for (position, ruling), value in np.ndenumerate(result.year_net_income):
+        expected = calculate(
+            dict(
+                salary=salaries[position],
+                period="year",
+                working_hours=40,
+                ruling=list(RULING_TYPES)[ruling],
+                year=YEARS[-1],
+                old_age=False,
+                holiday_allowance=True,
+                social_security=True,
+            )
+        )
+        assert value == expected.year_net_income
+
+
+def test_calculate_many_unknown_year():
+    with pytest.raises(KeyError):
+        DutchTaxCalculator.calculate_many(
+            salary=[60000],
+            period="year",
+            working_hours=40,
+            ruling="None",
+            year="1900",
+            old_age=False,
+            holiday_allowance=False,
+            tax_data=NL_DATA,
+        )
+
+
+# Tax share of the first bracket rate for retirement age: tax + Anw + Wlz
+ELDER_CREDIT_SHARES = {
+    "2023": (0.3693 - 0.2765) / (0.3693 + 0.0975 - 0.2765),
+    "2024": (0.3697 - 0.2765) / (0.3697 + 0.0975 - 0.2765),
+}
+
+
+@pytest.mark.parametrize(
+    "year, salary, credit",
+    [
+        # Full credit, phased out by 15% above 40,889 and 44,770
+        ("2023", 30000, 1835),
+        ("2023", 45000, 1835 - 0.15 * (45000 - 40889)),
+        ("2023", 53123, 1835 - 0.15 * (53123 - 40889)),
+        ("2023", 55000, 0),
+        ("2024", 30000, 2010),
+        ("2024", 50000, 2010 - 0.15 * (50000 - 44770)),
+        ("2024", 60000, 0),
+    ],
+)
+def test_elder_tax_credit(year, salary, credit):
+    row = dict(
+        salary=salary,
+        period="year",
+        working_hours=40,
+        ruling="None",
+        year=year,
+        old_age=True,
+        holiday_allowance=False,
+    )
+    with_social = calculate(dict(row, social_security=True))
+    without_social = calculate(dict(row, social_security=False))
+    younger = calculate(dict(row, old_age=False, social_security=True))
+
+    assert with_social.elder_tax_credit == pytest.approx(credit)
+    # Only the tax part is credited without social security
+    assert without_social.elder_tax_credit == pytest.approx(
+        credit * ELDER_CREDIT_SHARES[year]
+    )
+    assert younger.elder_tax_credit == 0
+
+    result = DutchTaxCalculator.calculate_many(
+        salary=[salary] * 3,
+        period="year",
+        working_hours=40,
+        ruling="None",
+        year=year,
+        old_age=[True, True, False],
+        holiday_allowance=False,
+        tax_data=NL_DATA,
+        social_security=[True, False, True],
+    )
+    assert result.elder_tax_credit.tolist() == [
+        with_social.elder_tax_credit,
+        without_social.elder_tax_credit,
+        0,
+    ]
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_calculate_sweep_matches_calculate(year):
+    rng = random.Random(int(year))
+    kinks = DutchTaxCalculator.get_gross_kinks(year, "Normal", False, True, NL_DATA)
+    kinks = kinks[np.isfinite(kinks)]
+    grid = np.concatenate(
+        [np.arange(0, 200001, 250.0), kinks - 0.01, kinks, kinks + 0.01]
+    )
+    for ruling in RULING_TYPES:
+        for old_age, holiday_allowance in ((False, False), (True, True)):
+            result = DutchTaxCalculator.calculate_sweep(
+                grid, year, ruling, old_age, holiday_allowance, NL_DATA
+            )
+            many = DutchTaxCalculator.calculate_many(
+                grid, "year", 40, ruling, year, old_age, holiday_allowance, NL_DATA
+            )
+            for field in dataclasses.fields(result):
+                np.testing.assert_array_equal(
+                    getattr(result, field.name), getattr(many, field.name)
+                )
+
+            for position in rng.sample(range(grid.size), 40):
+                expected = calculate(
+                    dict(
+                        salary=grid[position],
+                        period="year",
+                        working_hours=40,
+                        ruling=ruling,
+                        year=year,
+                        old_age=old_age,
+                        holiday_allowance=holiday_allowance,
+                        social_security=True,
+                    )
+                )
+                assert_row_equal(result, position, expected)
+
+
+@pytest.mark.parametrize("period", WORKING_PERIODS)
+def test_calculate_gross_is_minimal(period):
+    rng = random.Random(period)
+    targets = np.array(
+        [round(rng.uniform(0, PERIOD_SALARIES[period] * 0.7)) for _ in range(100)]
+    )
+    for year in (YEARS[0], YEARS[-1]):
+        for ruling in RULING_TYPES:
+            options = dict(
+                period=period,
+                working_hours=40,
+                ruling=ruling,
+                year=year,
+                old_age=False,
+                holiday_allowance=True,
+                tax_data=NL_DATA,
+            )
+            gross = DutchTaxCalculator.calculate_gross(targets, **options)
+
+            def get_net(salary):
+                result = DutchTaxCalculator.calculate_many(salary=salary, **options)
+                return get_period_net(result, period, NL_DATA)
+
+            assert np.all(get_net(gross) >= targets)
+            below = get_net(np.maximum(gross - 0.01, 0))
+            assert np.all((below < targets) | (gross == 0))
@@ -0,0 +1,109 @@
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.parallel import calculate_sharded, imap_ordered
+
+
+def get_columns(country, count):
+    rng = np.random.default_rng(count)
+    tax_data = COUNTRIES[country]["tax_data"]
+    columns = dict(
+        salary=np.round(rng.uniform(0, 20000, count), 2),
+        period=rng.choice(WORKING_PERIODS[:2], count),
+        working_hours=40,
+        year=str(tax_data["currentYear"]),
+    )
+    if country == "nl":
+        return dict(
+            columns,
+            ruling=rng.choice(["None", "Normal"], count),
+            old_age=rng.random(count) < 0.5,
+            holiday_allowance=True,
+        )
+    return dict(columns, ruling="20%")
+
+
+def assert_result_equal(result, expected):
+    assert type(result) is type(expected)
+    for field in dataclasses.fields(expected):
+        np.testing.assert_array_equal(
+            getattr(result, field.name), getattr(expected, field.name)
+        )
+
+
+def calculate_many(country, **columns):
+    return COUNTRIES[country]["calculator"].calculate_many(
+        tax_data=COUNTRIES[country]["tax_data"], **columns
+    )
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """
+    Thread pool recording the shards it calculates.
+
+    """
+
+    def __init__(self, workers):
+        super().__init__(workers)
+        self.shards = []
+
+    def map(self, fn, countries, shards):
+        shards = list(shards)
+        self.shards.extend(shards)
+        return super().map(fn, countries, shards)
+
+
+@pytest.mark.parametrize("country", COUNTRIES)
+def test_sharded_matches_calculate_many(country):
+    columns = get_columns(country, 103)
+    with RecordingExecutor(2) as executor:
+        result = calculate_sharded(country, executor, shard_size=10, **columns)
+
+    assert_result_equal(result, calculate_many(country, **columns))
+    # The last shard is shorter, single values are sent to every shard
+    assert [shard["salary"].size for shard in executor.shards] == [10] * 10 + [3]
+    for shard in executor.shards:
+        assert shard["working_hours"] == 40
+        assert shard["year"] == columns["year"]
+
+
+def test_sharded_in_worker_processes():
+    columns = get_columns("nl", 25)
+    result = calculate_sharded("nl", shard_size=10, **columns)
+
+    assert_result_equal(result, calculate_many("nl", **columns))
+
+
+def test_sharded_single_values():
+    columns = dict(
+        salary=60000, period="year", working_hours=40, ruling="0%", year="2023"
+    )
+    with ThreadPoolExecutor(2) as executor:
+        result = calculate_sharded("cy", executor, shard_size=10, **columns)
+
+    assert result.year_net_income.shape == (1,)
+    assert_result_equal(result, calculate_many("cy", **columns))
+
+
+def test_imap_ordered():
+    submitted = []
+
+    def square(value):
+        return value * value
+
+    def items():
+        for value in range(20):
+            submitted.append(value)
+            yield value
+
+    with ThreadPoolExecutor(2) as executor:
+        results = imap_ordered(executor, square, items(), prefetch=3)
+        # Items are consumed lazily, a prefetch at a time
+        assert next(results) == 0
+        assert submitted == [0, 1, 2]
+        assert list(results) == [value * value for value in range(1, 20)]
@@ -0,0 +1,95 @@
+import csv
+import dataclasses
+import io
+
+import pytest
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.payroll import DEFAULTS, TRUE_VALUES, run_payroll, to_columns
+
+# Empty and missing columns get defaults, e.g. the current year
+NL_CSV = """\
+employee,salary,period,working_hours,ruling,old_age,holiday_allowance
+1,60000,year,40,None,false,true
+2,4500.50,month,36,Normal,0,yes
+3,250,day,,"Young & Master's",1,
+4,32.75,hour,32.5,,true,false
+5,0,,,,,
+6,120000,year,40,Research,no,1
+7,3000,month,20,None,t,f
+"""
+CY_CSV = """\
+salary,year,ruling
+60000,2022,20%
+3000,2023,
+150000,,50%
+80000,2023,0%
+"""
+
+
+def calculate(row, country):
+    arguments = {**DEFAULTS[country]}
+    for name, value in row.items():
+        if name in arguments and value != "":
+            arguments[name] = value
+    for name, value in arguments.items():
+        if name in ("old_age", "holiday_allowance", "social_security"):
+            arguments[name] = str(value).lower() in TRUE_VALUES
+    return COUNTRIES[country]["calculator"](
+        salary=float(row["salary"]),
+        working_hours=float(arguments.pop("working_hours")),
+        tax_data=COUNTRIES[country]["tax_data"],
+        working_periods=WORKING_PERIODS,
+        **arguments,
+    ).calculate()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize(
+    "country, content", [("nl", NL_CSV), ("cy", CY_CSV)], ids=["nl", "cy"]
+)
+def test_run_payroll_matches_calculate(country, content, workers):
+    target = io.StringIO()
+    count = run_payroll(
+        io.StringIO(content), target, country, chunk_size=2, workers=workers
+    )
+
+    rows = list(csv.DictReader(io.StringIO(content)))
+    fields = [field.name for field in dataclasses.fields(COUNTRIES[country]["result"])]
+    header, *output = csv.reader(io.StringIO(target.getvalue()))
+    assert count == len(rows) == len(output)
+    assert header == list(rows[0]) + fields
+
+    for row, values in zip(rows, output):
+        # Input columns are written as they were read
+        assert values[: len(row)] == list(row.values())
+        expected = calculate(row, country)
+        for field, value in zip(fields, values[len(row) :]):
+            assert float(value) == getattr(expected, field), (row, field)
+
+
+def test_missing_values_get_defaults():
+    tax_data = COUNTRIES["nl"]["tax_data"]
+    columns = to_columns([{"salary": "100"}, {"salary": 200, "year": 2023}], "nl")
+
+    assert columns["salary"].tolist() == [100, 200]
+    assert columns["period"].tolist() == ["year", "year"]
+    assert columns["working_hours"].tolist() == [tax_data["defaultWorkingHours"]] * 2
+    assert columns["ruling"].tolist() == ["None", "None"]
+    assert columns["year"].tolist() == [str(tax_data["currentYear"]), "2023"]
+    assert columns["old_age"].tolist() == [False, False]
+    assert columns["holiday_allowance"].tolist() == [False, False]
+    assert columns["social_security"].tolist() == [True, True]
+
+
+def test_run_payroll_without_rows():
+    target = io.StringIO()
+
+    assert run_payroll(io.StringIO("salary\n"), target, "nl", chunk_size=2) == 0
+    assert target.getvalue().splitlines()[0].startswith("salary,year_net_income")
+
+
+def test_run_payroll_requires_salary():
+    with pytest.raises(ValueError, match="Column 'salary' is required"):
+        run_payroll(io.StringIO("year\n2024\n"), io.StringIO(), "nl", chunk_size=2)
@@ -0,0 +1,206 @@
+import math
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.brackets import compile_brackets
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator
+from kalkulators.taxes.cy_data import RULING_TYPES as CY_RULING_TYPES
+from kalkulators.taxes.nl_calc import RULING_TYPES, DutchTaxCalculator
+from kalkulators.taxes.piecewise import PiecewiseLinear, _inner_point
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+CY_DATA = COUNTRIES["cy"]["tax_data"]
+
+# 10% up to 10,000, 30% up to 20,000, then 50%
+TAX = PiecewiseLinear.from_brackets(
+    compile_brackets(
+        [
+            {"min": 0, "max": 10000, "rate": 0.1},
+            {"min": 10000, "max": 20000, "rate": 0.3},
+            {"min": 20000, "rate": 0.5},
+        ],
+        "rate",
+    )
+)
+# A fixed 1,000 up to 10,000, phased out by 10% up to 20,000
+CREDIT = PiecewiseLinear.from_brackets(
+    compile_brackets(
+        [
+            {"min": 0, "max": 10000, "rate": 1000},
+            {"min": 10000, "max": 20000, "rate": -0.1},
+            {"min": 20000, "rate": 0},
+        ],
+        "rate",
+    )
+)
+INCOMES = np.arange(-1000, 40001, 250.0)
+
+
+def get_tax(income):
+    return (
+        0.1 * np.clip(income, 0, 10000)
+        + 0.3 * np.clip(income - 10000, 0, 10000)
+        + 0.5 * np.clip(income - 20000, 0, None)
+    )
+
+
+def get_credit(income):
+    phase_out = 0.1 * np.clip(income - 10000, 0, 10000)
+    return np.where(income <= 10000, 1000, 1000 - phase_out)
+
+
+def test_from_brackets():
+    assert TAX.edges == (10000, 20000)
+    assert TAX.slopes == (0.1, 0.3, 0.5)
+    incomes = INCOMES[INCOMES >= 0]
+    np.testing.assert_allclose(TAX(incomes), get_tax(incomes))
+    # Phased out to zero, the constant tail merges with the last segment
+    assert CREDIT.edges == (10000, 20000)
+    np.testing.assert_allclose(CREDIT(INCOMES), get_credit(INCOMES), atol=1e-9)
+    # Scalars give floats
+    assert TAX(15000) == pytest.approx(2500)
+    assert isinstance(TAX(15000), float)
+
+
+def test_add_and_scale():
+    function = 2 * TAX - CREDIT + 100
+
+    assert function.edges == (10000, 20000)
+    np.testing.assert_allclose(
+        function(INCOMES), 2 * TAX(INCOMES) - get_credit(INCOMES) + 100
+    )
+    assert (TAX - TAX).edges == ()
+    assert (TAX - TAX)(12345) == 0
+    np.testing.assert_allclose((100 - TAX)(INCOMES), 100 - TAX(INCOMES))
+
+
+def test_add_merges_breakpoints():
+    kink = PiecewiseLinear((15000,), (0, 1), (0, -15000))
+    function = TAX + kink
+
+    assert function.edges == (10000, 15000, 20000)
+    np.testing.assert_allclose(
+        function(INCOMES), TAX(INCOMES) + np.maximum(INCOMES - 15000, 0)
+    )
+
+
+def test_simplify_merges_equal_lines():
+    function = PiecewiseLinear((0, 10, 20), (1, 1, 2, 2), (0, 0, -20, -20))
+
+    assert function.simplify() == PiecewiseLinear((10,), (1, 2), (0, -20))
+
+
+def test_marginal_and_effective_rates():
+    assert TAX.marginal_rate(5000) == 0.1
+    # Edges belong to the segment below them
+    assert TAX.marginal_rate(10000) == 0.1
+    assert TAX.marginal_rate(10000.01) == 0.3
+    np.testing.assert_array_equal(
+        TAX.marginal_rate(np.array([0, 15000, 50000])), [0.1, 0.3, 0.5]
+    )
+    np.testing.assert_allclose(TAX.effective_rate(np.array([10000, 20000])), [0.1, 0.2])
+    assert np.isnan(TAX.effective_rate(np.array([0]))[0])
+
+
+def test_integrate():
+    # 10,000 * 1,000 / 2 + 10,000 * (1,000 + 4,000) / 2
+    assert TAX.integrate(0, 20000) == pytest.approx(30_000_000)
+    assert TAX.integrate(5000, 15000) == pytest.approx(
+        5000 * (500 + 1000) / 2 + 5000 * (1000 + 2500) / 2
+    )
+    assert TAX.integrate(15000, 5000) == pytest.approx(-TAX.integrate(5000, 15000))
+    assert CREDIT.integrate(0, 30000) == pytest.approx(10_000_000 + 5_000_000)
+    assert TAX.integrate(7, 7) == 0
+
+
+def test_compose_across_breakpoints():
+    # The ruling makes 30% of income above 12,000 tax free, taxable income
+    # drops below 10,000 there and crosses the edges again at edge / 0.7
+    ruling = PiecewiseLinear.ruling_deduction(12000)
+    function = TAX.compose(ruling)
+
+    assert function.edges == pytest.approx((10000, 12000, 10000 / 0.7, 20000 / 0.7))
+    assert function.slopes == pytest.approx((0.1, 0.3, 0.07, 0.21, 0.35))
+    taxable = np.where(INCOMES > 12000, INCOMES * 0.7, INCOMES)
+    np.testing.assert_allclose(function(INCOMES), TAX(taxable), atol=1e-9)
+
+
+def test_compose_with_constant_inner_segments():
+    # Capped income, then constant segments don't cross any edge
+    capped = PiecewiseLinear((15000,), (1, 0), (0, 15000))
+    function = CREDIT.compose(capped)
+
+    assert function.edges == (10000, 15000)
+    np.testing.assert_allclose(
+        function(INCOMES), get_credit(np.minimum(INCOMES, 15000)), atol=1e-9
+    )
+    assert TAX.compose(PiecewiseLinear.linear()) == TAX
+
+
+@pytest.mark.parametrize(
+    "start, end, point",
+    [
+        (-math.inf, math.inf, 0),
+        (-math.inf, 100, 99),
+        (100, math.inf, 101),
+        (100, 200, 150),
+    ],
+)
+def test_inner_point(start, end, point):
+    assert _inner_point(start, end) == point
+
+
+# Bracket amounts are rounded to cents by get_rates, a few cents at most
+AMOUNTS_TOLERANCE = 0.03
+
+
+def test_nl_tax_function_matches_calculate_many():
+    # Multiples of 10 keep taxable income after the ruling whole,
+    # calculate_many floors it
+    salaries = np.arange(0, 300001, 10.0)
+    for year in NL_DATA["years"]:
+        for ruling in RULING_TYPES:
+            for old_age in (False, True):
+                for social_security in (False, True):
+                    function = DutchTaxCalculator.get_tax_function(
+                        str(year), ruling, old_age, social_security, NL_DATA
+                    )
+                    result = DutchTaxCalculator.calculate_many(
+                        salaries,
+                        "year",
+                        40,
+                        ruling,
+                        str(year),
+                        old_age,
+                        False,
+                        NL_DATA,
+                        social_security=social_security,
+                    )
+                    income_tax = (
+                        result.payroll_tax
+                        + result.social_security_tax
+                        + result.general_tax_credit
+                        + result.labour_tax_credit
+                        + result.elder_tax_credit
+                    )
+                    np.testing.assert_allclose(
+                        function(salaries), income_tax, atol=AMOUNTS_TOLERANCE
+                    )
+
+
+def test_cy_tax_function_matches_calculate_many():
+    salaries = np.arange(0, 300001, 10.0)
+    for year in CY_DATA["years"]:
+        for ruling in CY_RULING_TYPES:
+            function = CyprusTaxCalculator.get_tax_function(str(year), ruling, CY_DATA)
+            result = CyprusTaxCalculator.calculate_many(
+                salaries, "year", 40, ruling, str(year), CY_DATA
+            )
+            taxes = result.payroll_tax + result.social_tax + result.nhs_tax
+
+            # calculate_many floors the payroll tax, less than a euro more
+            difference = function(salaries) - taxes
+            assert difference.min() >= -AMOUNTS_TOLERANCE
+            assert difference.max() < 1 + AMOUNTS_TOLERANCE
@@ -0,0 +1,146 @@
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.cents import calculate_nl_cents
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_calc import CyprusTaxesResult
+from kalkulators.taxes.nl_calc import DutchTaxCalculator, DutchTaxesResult
+from kalkulators.taxes.results import BATCH_RESULTS, ResultRow, ResultTable
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+SALARIES = [0, 20000, 45000.5, 80000, 250000]
+OPTIONS = dict(
+    period="year",
+    working_hours=40,
+    ruling="Normal",
+    year="2024",
+    old_age=False,
+    holiday_allowance=True,
+)
+
+
+def calculate(salary):
+    return DutchTaxCalculator(
+        salary=salary,
+        social_security=True,
+        tax_data=NL_DATA,
+        working_periods=WORKING_PERIODS,
+        **OPTIONS,
+    ).calculate()
+
+
+@pytest.fixture
+def table():
+    batch = DutchTaxCalculator.calculate_many(SALARIES, tax_data=NL_DATA, **OPTIONS)
+    return ResultTable.from_batch(batch)
+
+
+@pytest.mark.parametrize("single, batch", BATCH_RESULTS.items())
+def test_batch_fields_are_in_single_order(single, batch):
+    assert [field.name for field in dataclasses.fields(single)] == [
+        field.name for field in dataclasses.fields(batch)
+    ]
+
+
+def test_fields(table):
+    assert table.result_class is DutchTaxesResult
+    assert table.fields == tuple(
+        field.name for field in dataclasses.fields(DutchTaxesResult)
+    )
+    assert table.values.shape == (len(table.fields), len(SALARIES))
+    assert len(table) == len(SALARIES)
+    for position, name in enumerate(table.fields):
+        assert np.shares_memory(table[name], table.values)
+        np.testing.assert_array_equal(getattr(table, name), table.values[position])
+
+
+def test_rows_equal_calculate(table):
+    for row, salary in zip(table, SALARIES):
+        expected = calculate(salary)
+        assert row.to_result() == expected
+        assert list(row) == list(dataclasses.astuple(expected))
+        assert row.year_net_income == expected.year_net_income
+        assert len(row) == len(table.fields)
+
+    assert table[-1].to_result() == calculate(SALARIES[-1])
+    assert table[1] == table[1]
+    assert table[1] != table[2]
+    with pytest.raises(IndexError):
+        table[len(SALARIES)]
+    with pytest.raises(AttributeError):
+        table[0].salary
+    with pytest.raises(AttributeError):
+        table.salary
+
+
+def test_batch_round_trip(table):
+    batch = table.to_batch()
+    again = ResultTable.from_batch(batch)
+
+    # Batch columns view the table values
+    assert np.shares_memory(batch.year_net_income, table.values)
+    np.testing.assert_array_equal(again.values, table.values)
+    assert again.values.dtype == np.float64
+
+
+def test_cents_round_trip():
+    batch = calculate_nl_cents(SALARIES, tax_data=NL_DATA, **OPTIONS)
+    table = ResultTable.from_batch(batch)
+
+    assert table.values.dtype == np.int64
+    for field in table.fields:
+        np.testing.assert_array_equal(
+            getattr(table.to_batch(), field), getattr(batch, field)
+        )
+    assert isinstance(table[0].year_net_income, int)
+
+
+def test_from_results(table):
+    results = [calculate(salary) for salary in SALARIES]
+    from_results = ResultTable.from_results(results, DutchTaxesResult)
+
+    np.testing.assert_array_equal(from_results.values, table.values)
+    assert [row.to_result() for row in from_results] == results
+    empty = ResultTable.from_results([], CyprusTaxesResult)
+    assert len(empty) == 0
+    assert list(empty) == []
+
+
+def test_slices_and_masks(table):
+    view = table[1:4]
+    assert len(view) == 3
+    assert np.shares_memory(view.values, table.values)
+    assert view[0] == table[1]
+
+    selected = table[table.year_net_income > 30000]
+    assert not np.shares_memory(selected.values, table.values)
+    assert [row.to_result() for row in selected] == [
+        calculate(salary) for salary in SALARIES[2:]
+    ]
+    assert np.shares_memory(table.to_numpy(), table.values)
+    assert table.to_numpy()[2].tolist() == list(table[2])
+
+
+def test_set_rows(table):
+    filled = ResultTable.empty(DutchTaxesResult, len(SALARIES), dtype=np.float64)
+    filled.set_rows(0, table[:2].to_batch())
+    filled.set_rows(2, table[2:].to_batch())
+
+    np.testing.assert_array_equal(filled.values, table.values)
+
+
+def test_invalid_shape():
+    with pytest.raises(ValueError, match="Values must have shape"):
+        ResultTable(DutchTaxesResult, np.zeros((3, 2)))
+
+
+def test_pickle(table):
+    copy = pickle.loads(pickle.dumps(table))
+
+    np.testing.assert_array_equal(copy.values, table.values)
+    assert isinstance(copy[0], ResultRow)
+    assert copy[0] == table[0]
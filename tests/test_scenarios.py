@@ -0,0 +1,65 @@
+import dataclasses
+import random
+
+import numpy as np
+
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.nl_calc import RULING_TYPES, DutchTaxCalculator
+from kalkulators.taxes.scenarios import DutchScenarioGrid
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+YEARS = ("2022", "2024")
+
+
+def test_grid_matches_calculate():
+    grid = DutchScenarioGrid.build(NL_DATA, stop=150000, step=50, years=YEARS)
+    rng = random.Random(1)
+    for _ in range(2000):
+        # Most salaries are on the grid, others are calculated in full
+        period = rng.choice(WORKING_PERIODS[:2] * 3 + WORKING_PERIODS)
+        salary = rng.randrange(0, 200000, 50) / (12 if period == "month" else 1)
+        calculator = DutchTaxCalculator(
+            old_age=rng.random() < 0.5,
+            year=rng.choice(YEARS * 4 + ("2023",)),
+            ruling=rng.choice(list(RULING_TYPES)),
+            salary=salary if period != "hour" else salary / 2080,
+            period=period,
+            working_hours=rng.choice([32, 36, 40]),
+            social_security=rng.random() < 0.5,
+            holiday_allowance=rng.random() < 0.5,
+            tax_data=NL_DATA,
+            working_periods=WORKING_PERIODS,
+        )
+
+        assert grid.calculate(calculator) == calculator.calculate()
+
+
+def test_grid_sweep_matches_calculate_many():
+    grid = DutchScenarioGrid.build(NL_DATA, stop=100000, step=100, years=YEARS)
+    for ruling in RULING_TYPES:
+        sweep = grid.get_sweep("2024", ruling, True, False, True, working_hours=36)
+        expected = DutchTaxCalculator.calculate_many(
+            salary=grid.salaries,
+            period="year",
+            working_hours=36,
+            ruling=ruling,
+            year="2024",
+            old_age=True,
+            holiday_allowance=True,
+            tax_data=NL_DATA,
+            social_security=False,
+        )
+        for field in dataclasses.fields(expected):
+            np.testing.assert_array_equal(
+                getattr(sweep, field.name), getattr(expected, field.name)
+            )
+
+
+def test_grid_lookup_off_grid():
+    grid = DutchScenarioGrid.build(NL_DATA, stop=1000, step=100, years=YEARS)
+
+    assert grid.lookup(150, "2024", "None", False, True, False, 40) is None
+    assert grid.lookup(1100, "2024", "None", False, True, False, 40) is None
+    assert grid.lookup(100, "2015", "None", False, True, False, 40) is None
+    assert grid.lookup(100, "2024", "None", False, True, False, 40) is not None
@@ -0,0 +1,174 @@
+import math
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.cy_calc import CyprusTaxCalculator
+from kalkulators.taxes.nl_calc import DutchTaxCalculator
+from kalkulators.taxes.self_employed import (
+    calculate_cy_self_employed,
+    calculate_nl_self_employed,
+    get_cy_break_even_revenue,
+    get_cy_profit_kinks,
+    get_nl_break_even_revenue,
+    get_nl_profit_kinks,
+)
+
+NL_DATA = COUNTRIES["nl"]["tax_data"]
+CY_DATA = COUNTRIES["cy"]["tax_data"]
+
+
+def test_nl_2024_profit():
+    result = calculate_nl_self_employed(60000, "2024", False, False, NL_DATA)
+
+    # Self-employed deduction 3,750, then the 13.31% SME profit exemption
+    assert result.entrepreneur_deduction[0] == 3750
+    assert result.profit_exemption[0] == pytest.approx((60000 - 3750) * 0.1331)
+    # 56,250 - 7,486.875
+    assert result.taxable_income[0] == 48763
+
+    payroll_tax = 38097 * 0.0932 + round((48763 - 38097) * 0.3697, 2)
+    social_security_tax = 38097 * 0.2765
+    general_tax_credit = 3362 - (48763 - 24813) * 0.0663
+    labour_tax_credit = (
+        11490 * 0.08425
+        + 13330 * 0.31433
+        + 15137 * 0.02471
+        - (48763 - 11490 - 13330 - 15137) * 0.0651
+    )
+    assert result.payroll_tax[0] == pytest.approx(-payroll_tax)
+    assert result.social_security_tax[0] == pytest.approx(-social_security_tax)
+    assert result.general_tax_credit[0] == pytest.approx(general_tax_credit, abs=0.01)
+    assert result.labour_tax_credit[0] == pytest.approx(labour_tax_credit, abs=0.01)
+    assert result.elder_tax_credit[0] == 0
+    # Income-related health insurance contribution of 5.32%
+    assert result.health_contribution[0] == pytest.approx(-2594.19)
+
+    # -7,493.86 - 10,533.82 + 1,774.11 + 4,958.82 = -11,294.75, floored
+    income_tax = -11295
+    assert result.year_net_income[0] == pytest.approx(60000 + income_tax - 2594.19)
+    assert result.month_net_income[0] == 3842
+    assert result.hour_net_income[0] == 22
+
+
+def test_nl_2023_starter_old_age_profit():
+    result = calculate_nl_self_employed(30000, "2023", True, True, NL_DATA)
+
+    # Self-employed deduction 5,030 and starter deduction 2,123,
+    # then the 14% SME profit exemption of 22,847
+    assert result.entrepreneur_deduction[0] == 5030 + 2123
+    assert result.profit_exemption[0] == pytest.approx(22847 * 0.14)
+    assert result.taxable_income[0] == 19648
+
+    # No AOW contribution above the state pension age, credits are reduced
+    # to the share of the tax and Anw + Wlz contributions
+    share = (0.3693 + 0.0975 - 0.2765) / 0.3693
+    payroll_tax = 1823.33
+    social_security_tax = 1915.68
+    general_tax_credit = 3070 * share
+    labour_tax_credit = (10741 * 0.08231 + round(8907 * 0.29861, 2)) * share
+    elder_tax_credit = 1835
+    assert result.payroll_tax[0] == pytest.approx(-payroll_tax)
+    assert result.social_security_tax[0] == pytest.approx(-social_security_tax)
+    assert result.general_tax_credit[0] == pytest.approx(general_tax_credit)
+    assert result.labour_tax_credit[0] == pytest.approx(labour_tax_credit)
+    assert result.elder_tax_credit[0] == elder_tax_credit
+    assert result.health_contribution[0] == pytest.approx(-19648 * 0.0543, abs=0.01)
+
+    # Credits exceed taxes, the difference is not refunded
+    credits = general_tax_credit + labour_tax_credit + elder_tax_credit
+    assert credits > payroll_tax + social_security_tax
+    assert result.year_net_income[0] == pytest.approx(30000 - 1066.89)
+
+
+def test_nl_loss_and_small_profit():
+    result = calculate_nl_self_employed([-5000, 3000], "2024", False, True, NL_DATA)
+
+    # Deductions are limited to the profit, a loss is not carried over
+    assert result.entrepreneur_deduction.tolist() == [0, 3000]
+    assert result.profit_exemption.tolist() == [0, 0]
+    assert result.taxable_income.tolist() == [0, 0]
+    assert result.year_net_income.tolist() == [-5000, 3000]
+
+
+@pytest.mark.parametrize("year", CY_DATA["years"])
+def test_cy_profit(year):
+    result = calculate_cy_self_employed([20000, 70000], year, CY_DATA)
+
+    # 16.6% social insurance, capped at 58,080 of insurable income, and 4% GHS
+    assert result.social_tax.tolist() == pytest.approx([-3320, -58080 * 0.166])
+    assert result.nhs_tax.tolist() == pytest.approx([-800, -2800])
+    assert result.taxable_income.tolist() == pytest.approx([15880, 57558.72])
+    # Tax free up to 19,500, then 20%, 25% and 30% brackets
+    payroll_tax = 8499 * 0.2 + 8299 * 0.25 + round(21260.72 * 0.3, 2)
+    assert result.payroll_tax.tolist() == [0, -math.ceil(payroll_tax)]
+    assert result.year_net_income.tolist() == pytest.approx(
+        [15880, 70000 - 9641.28 - 2800 - 10153]
+    )
+
+
+def assert_break_even(get_net, employed_net, revenues):
+    assert np.all(get_net(revenues) >= employed_net)
+    # One cent less is not enough
+    below = get_net(np.round(revenues * 100 - 1) / 100)
+    assert np.all((below < employed_net) | (revenues <= 0))
+
+
+@pytest.mark.parametrize("year", ["2015", "2023", "2024"])
+@pytest.mark.parametrize("starter", [False, True])
+def test_nl_break_even_revenue(year, starter):
+    costs = 5000
+
+    def get_net(revenues):
+        return calculate_nl_self_employed(
+            revenues - costs, year, False, starter, NL_DATA
+        ).year_net_income
+
+    # Salaries with the net income of self-employed profits at the kinks
+    kinks = get_nl_profit_kinks(year, False, starter, NL_DATA)
+    kinks = kinks[np.isfinite(kinks)]
+    kink_nets = get_net(kinks + costs)
+    salaries = np.concatenate(
+        [
+            np.arange(0, 150001, 2500.0),
+            DutchTaxCalculator.calculate_gross(
+                kink_nets, "year", None, "None", year, False, False, NL_DATA
+            ),
+        ]
+    )
+    revenues = get_nl_break_even_revenue(
+        salaries, costs, year, False, starter, NL_DATA
+    )
+    employed = DutchTaxCalculator.calculate_many(
+        salaries, "year", 40, "None", year, False, False, NL_DATA
+    )
+
+    assert_break_even(get_net, employed.year_net_income, revenues)
+
+
+@pytest.mark.parametrize("year", CY_DATA["years"])
+def test_cy_break_even_revenue(year):
+    costs = 2000
+
+    def get_net(revenues):
+        return calculate_cy_self_employed(
+            revenues - costs, year, CY_DATA
+        ).year_net_income
+
+    kinks = get_cy_profit_kinks(year, CY_DATA)
+    kinks = kinks[np.isfinite(kinks)]
+    salaries = np.concatenate(
+        [
+            np.arange(0, 150001, 2500.0),
+            CyprusTaxCalculator.calculate_gross(
+                get_net(kinks + costs), "year", None, "0%", year, CY_DATA
+            ),
+        ]
+    )
+    revenues = get_cy_break_even_revenue(salaries, costs, year, CY_DATA)
+    employed = CyprusTaxCalculator.calculate_many(
+        salaries, "year", 40, "0%", year, CY_DATA
+    )
+
+    assert_break_even(get_net, employed.year_net_income, revenues)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from kalkulators.taxes import service
+from kalkulators.taxes.common import WORKING_PERIODS
+from kalkulators.taxes.countries import COUNTRIES
+from kalkulators.taxes.service import CalculationService, serve
+
+
+def handle_all(requests, **options):
+    """
+    Handle requests concurrently, so calculations share batches.
+
+    """
+
+    async def handle():
+        calculation = CalculationService(**options)
+        responses = await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    calculation.handle(method, path, json.dumps(body).encode())
+                    for method, path, body in requests
+                )
+            ),
+            timeout=10,
+        )
+        return [(status.value, json.loads(payload)) for status, _, payload in responses]
+
+    return asyncio.run(handle())
+
+
+def test_calculate_matches_calculator():
+    tax_data = COUNTRIES["nl"]["tax_data"]
+    expected = COUNTRIES["nl"]["calculator"](
+        old_age=False,
+        year="2023",
+        ruling="Normal",
+        salary=5000,
+        period="month",
+        working_hours=36,
+        social_security=True,
+        holiday_allowance=False,
+        tax_data=tax_data,
+        working_periods=WORKING_PERIODS,
+    ).calculate()
+    body = dict(
+        salary=5000, period="month", working_hours=36, ruling="Normal", year=2023
+    )
+
+    [(status, result)] = handle_all([("POST", "/nl/calculate", body)])
+    assert status == 200
+    assert result["year_net_income"] == expected.year_net_income
+    assert result["hour_net_income"] == expected.hour_net_income
+
+
+def test_invalid_rows_fail_alone():
+    bodies = [
+        {"salary": 60000, "period": {"name": "year"}},
+        {"salary": 60000},
+        {"salary": [1, 2]},
+        {"salary": 60000, "year": 2023},
+        {"salary": 60000, "year": "1900"},
+        {"salary": 1, "ruling": None},
+        {"salary": "a lot"},
+    ]
+    responses = handle_all([("POST", "/cy/calculate", body) for body in bodies])
+
+    assert [status for status, _ in responses] == [400, 200, 400, 200, 400, 200, 400]
+    assert responses[0][1] == {"error": "Argument 'period' must be a single value"}
+    assert responses[4][1] == {"error": "Unknown argument value '1900'"}
+
+
+@pytest.mark.parametrize(
+    "method, path, body, status",
+    [
+        ("POST", "/nl/bulk", {"rows": [{"salary": 1}, {"salary": 2}]}, 200),
+        ("POST", "/nl/bulk", {"rows": []}, 200),
+        ("POST", "/nl/bulk", {"rows": {"salary": 1}}, 400),
+        ("POST", "/nl/bulk", {"rows": [[60000]]}, 400),
+        ("POST", "/nl/bulk", {"rows": [{"salary": {"value": 1}}]}, 400),
+        ("POST", "/nl/calculate", [60000], 400),
+        ("GET", "/nl/calculate", {}, 405),
+        ("POST", "/de/calculate", {}, 404),
+        ("POST", "/nl/convert", {}, 404),
+        ("GET", "/health", None, 200),
+    ],
+)
+def test_request_status(method, path, body, status):
+    [(response_status, _)] = handle_all([(method, path, body)])
+
+    assert response_status == status
+
+
+def test_unexpected_error_answers_every_request(monkeypatch):
+    def calculate_rows(rows, country):
+        raise AttributeError("calculate_rows")
+
+    monkeypatch.setattr(service, "calculate_rows", calculate_rows)
+    requests = [("POST", "/nl/calculate", {"salary": salary}) for salary in range(3)]
+    responses = handle_all(requests + [("POST", "/nl/bulk", {"rows": [{}]})])
+
+    assert responses == [
+        (500, {"error": "Calculation failed: AttributeError"})
+    ] * len(responses)
+
+
+def test_http_connection():
+    async def request(data):
+        server = await serve(port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(data)
+            response = await asyncio.wait_for(reader.read(), timeout=10)
+            writer.close()
+        return response
+
+    body = b'{"salary": 60000}'
+    pipelined = (
+        b"POST /nl/calculate HTTP/1.1\r\n"
+        b"Content-Length: %d\r\n\r\n%s"
+        b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n" % (len(body), body)
+    )
+    responses = asyncio.run(request(pipelined)).split(b"HTTP/1.1 ")
+    assert [response[:3] for response in responses[1:]] == [b"200", b"200"]
+    assert responses[2].endswith(b'{"status": "ok"}')
+
+    response = asyncio.run(request(b"NONSENSE\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert response.endswith(b'{"error": "Malformed request line"}')
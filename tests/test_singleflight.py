@@ -0,0 +1,157 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from kalkulators.taxes.singleflight import SingleFlight
+
+TIMEOUT = 10
+
+
+class Calculator:
+    """
+    Calculator stub, calculations wait until released.
+
+    """
+
+    def __init__(self, key, release, error=None):
+        self.key = key
+        self.release = release
+        self.error = error
+        self.calls = 0
+
+    def get_cache_key(self):
+        return self.key
+
+    def calculate(self):
+        self.calls += 1
+        assert self.release.wait(TIMEOUT)
+        if self.error is not None:
+            raise self.error
+        return {"key": self.key}
+
+
+def wait_for_coalesced(flight, count):
+    deadline = time.monotonic() + TIMEOUT
+    while flight.get_stats()["coalesced"] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def calculate_in_threads(flight, calculators):
+    """
+    Calculate concurrently, release calculations when all callers wait.
+
+    """
+    release = calculators[0].release
+    with ThreadPoolExecutor(len(calculators)) as executor:
+        futures = [executor.submit(flight.calculate, item) for item in calculators]
+        wait_for_coalesced(flight, len(calculators) - 1)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_threads_calculate_once():
+    flight = SingleFlight()
+    release = Event()
+    calculators = [Calculator("a", release) for _ in range(8)]
+    results = calculate_in_threads(flight, calculators)
+
+    assert sum(calculator.calls for calculator in calculators) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == {"key": "a"}
+    assert flight.get_stats() == {
+        "calls": 8,
+        "coalesced": 7,
+        "calculated": 1,
+        "in_flight": 0,
+    }
+
+
+def test_threads_share_error():
+    flight = SingleFlight()
+    release = Event()
+    error = ValueError("calculation")
+    calculators = [Calculator("a", release, error) for _ in range(4)]
+    results = calculate_in_threads(flight, calculators)
+
+    assert sum(calculator.calls for calculator in calculators) == 1
+    assert all(result is error for result in results)
+
+
+def test_key_is_released():
+    flight = SingleFlight()
+    release = Event()
+    release.set()
+    calculator = Calculator("a", release, ValueError("calculation"))
+
+    with pytest.raises(ValueError):
+        flight.calculate(calculator)
+    calculator.error = None
+    assert flight.calculate(calculator) == {"key": "a"}
+    assert flight.calculate(calculator) == {"key": "a"}
+
+    assert calculator.calls == 3
+    assert flight.get_stats()["in_flight"] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    release = Event()
+    release.set()
+    calculators = [Calculator(key, release) for key in "abc"]
+    results = [flight.calculate(calculator) for calculator in calculators]
+
+    assert [result["key"] for result in results] == ["a", "b", "c"]
+    assert flight.get_stats()["calculated"] == 3
+
+
+def calculate_async(flight, calculators):
+    async def calculate():
+        tasks = [
+            asyncio.ensure_future(flight.calculate_async(calculator))
+            for calculator in calculators
+        ]
+        # Let every caller join the calculation in flight before it ends
+        await asyncio.sleep(0)
+        calculators[0].release.set()
+        return await asyncio.wait_for(
+            asyncio.gather(*tasks, return_exceptions=True), timeout=TIMEOUT
+        )
+
+    return asyncio.run(calculate())
+
+
+def test_asyncio_calculates_once():
+    flight = SingleFlight()
+    release = Event()
+    calculators = [Calculator("a", release) for _ in range(8)]
+    results = calculate_async(flight, calculators)
+
+    assert sum(calculator.calls for calculator in calculators) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == {"key": "a"}
+    assert flight.get_stats() == {
+        "calls": 8,
+        "coalesced": 7,
+        "calculated": 1,
+        "in_flight": 0,
+    }
+
+    # The key is released, a later call calculates again
+    assert calculate_async(flight, calculators[:1]) == [{"key": "a"}]
+    assert calculators[0].calls == 2
+
+
+def test_asyncio_shares_error():
+    flight = SingleFlight()
+    release = Event()
+    error = ValueError("calculation")
+    calculators = [Calculator("a", release, error) for _ in range(4)]
+    results = calculate_async(flight, calculators)
+
+    assert sum(calculator.calls for calculator in calculators) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.get_stats()["in_flight"] == 0
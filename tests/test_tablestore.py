@@ -0,0 +1,148 @@
+import dataclasses
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+
+from kalkulators.taxes import datastore, tablestore
+from kalkulators.taxes.batch import get_amounts_batch, get_amounts_by_segments
+from kalkulators.taxes.brackets import (
+    compile_brackets,
+    get_brackets_digest,
+    get_rate_types,
+)
+from kalkulators.taxes.datastore import (
+    CACHE_DIR_VARIABLE,
+    DATA_MODULES,
+    HEADER,
+    load_tax_data,
+    write_artifact,
+)
+from kalkulators.taxes.tablestore import (
+    TABLES_ARTIFACT,
+    MappedTables,
+    build_tables,
+    parse_tables,
+    read_tables,
+)
+
+FIELDS = ("bounds", "starts", "offsets", "rates", "percents")
+
+
+def test_mapped_tables_match_compiled():
+    tables = MappedTables(build_tables())
+    count = 0
+    for country in DATA_MODULES:
+        for name, value in load_tax_data(country).items():
+            if not isinstance(value, Mapping):
+                continue
+            for year, brackets in value.items():
+                for rate_type in get_rate_types(brackets):
+                    mapped = tables[country][year][name, rate_type]
+                    expected = compile_brackets(brackets, rate_type)
+
+                    assert mapped == expected
+                    # Integer amounts stay integers, as get_rates returns them
+                    for field in FIELDS:
+                        assert [type(item) for item in getattr(mapped, field)] == [
+                            type(item) for item in getattr(expected, field)
+                        ], (country, year, name, rate_type, field)
+                    assert get_brackets_digest(mapped) == (
+                        get_brackets_digest(expected)
+                    )
+                    count += 1
+
+    assert count == sum(
+        len(year_tables) for years in tables.values() for year_tables in years.values()
+    )
+
+
+def test_mapped_arrays_are_read_only_views():
+    tables = MappedTables(build_tables())
+    salaries = np.arange(-100, 200001, 7.5)
+    for country in DATA_MODULES:
+        for year_tables in tables[country].values():
+            for mapped in year_tables.values():
+                for field, values in zip(FIELDS, mapped.arrays):
+                    assert not values.flags.writeable
+                    assert np.shares_memory(values, tables._values)
+                    assert values.tolist() == list(getattr(mapped, field))
+
+                # Batch lookups on the views match the ones on the tuples
+                copied = dataclasses.replace(mapped, arrays=None)
+                np.testing.assert_array_equal(
+                    get_amounts_batch(mapped, salaries),
+                    get_amounts_batch(copied, salaries),
+                )
+                np.testing.assert_array_equal(
+                    get_amounts_by_segments(mapped, salaries),
+                    get_amounts_by_segments(copied, salaries),
+                )
+
+
+def test_identical_tables_are_stored_once():
+    index = parse_tables(build_tables())[0]["index"]
+
+    assert len(set(index.values())) < len(index)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path))
+    return tmp_path
+
+
+def test_read_tables(cache_dir):
+    assert read_tables() is None
+
+    content = build_tables()
+    assert write_artifact(TABLES_ARTIFACT, content)
+    tables = read_tables()
+    assert tables is not None
+    assert tables["nl"]["2024"]["payrollTax", "rate"] == (
+        MappedTables(content)["nl"]["2024"]["payrollTax", "rate"]
+    )
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda content: b"",
+        lambda content: content[: HEADER.size + 10],
+        lambda content: HEADER.pack(0, 0) + content[HEADER.size :],
+        lambda content: content[: HEADER.size] + bytes(len(content) - HEADER.size),
+    ],
+    ids=["empty", "truncated", "version", "header"],
+)
+def test_read_corrupt_tables(cache_dir, corrupt):
+    write_artifact(TABLES_ARTIFACT, corrupt(build_tables()))
+
+    assert read_tables() is None
+
+
+def test_read_stale_tables(cache_dir, monkeypatch):
+    write_artifact(TABLES_ARTIFACT, build_tables())
+    monkeypatch.setattr(tablestore, "is_source_current", lambda *args: False)
+
+    assert read_tables() is None
+
+
+def test_tables_of_touched_source_are_refreshed(cache_dir, monkeypatch):
+    write_artifact(TABLES_ARTIFACT, build_tables())
+    stats = {"nl": (1, 2), "cy": datastore.get_source_stat("cy")}
+    monkeypatch.setattr(datastore, "get_source_stat", stats.get)
+
+    assert read_tables() is not None
+    path = next(cache_dir.glob(f"{TABLES_ARTIFACT}.*"))
+    header, values = parse_tables(path.read_bytes())
+    assert {
+        country: tuple(stat) for country, stat in header["source_stats"].items()
+    } == stats
+    assert values.tolist() == parse_tables(build_tables())[1].tolist()
+
+    # The refreshed file is current without hashing the sources
+    def get_source_hash(country):
+        raise AssertionError("Source must not be hashed")
+
+    monkeypatch.setattr(datastore, "get_source_hash", get_source_hash)
+    assert read_tables() is not None